@@ -5,7 +5,7 @@ Main API router that includes all endpoint modules
 
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import auth, users, organizations, ai_models, requirements, admin, evidence_review, certificates
+from app.api.api_v1.endpoints import auth, users, organizations, ai_models, requirements, assessments, admin, evidence_review, certificates, evidence
 
 api_router = APIRouter()
 
@@ -15,6 +15,9 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(organizations.router, prefix="/organizations", tags=["organizations"])
 api_router.include_router(ai_models.router, prefix="/ai-models", tags=["ai-models"])
 api_router.include_router(requirements.router, prefix="/requirements", tags=["requirements"])
+api_router.include_router(assessments.router, prefix="/assessments", tags=["assessments"])
+api_router.include_router(evidence.router, prefix="/evidence", tags=["evidence"])
+api_router.include_router(certificates.public_router, prefix="/certificates", tags=["certificate-verification"])
 
 # Admin endpoints
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
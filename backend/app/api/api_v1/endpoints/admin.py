@@ -3,22 +3,45 @@ Admin API endpoints for user and project management
 Handles admin operations for client management and compliance oversight
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime, date
 
+from app.core.audit import audit_user_action
 from app.core.database import get_db
 from app.core.deps import get_current_admin_user
-from app.models import User, UserRole, Project, Assessment, Score
+from app.core.export import ExportFormatError, check_export_format, export_response
+from app.core.pagination import paginate, estimate_total
+from app.models import User, UserRole, Project
+from app.models.audit_log import AuditActions, AuditEntityTypes
+from app.services.admin_dashboard_service import AdminDashboardService
+from app.services.ai_inventory_service import AIInventoryService
+from app.services.export_service import audit_log_export
+from app.services.search_service import SearchService
 from app.schemas.admin import (
     UserCreate, UserUpdate, UserResponse,
     ProjectCreate, ProjectUpdate, ProjectResponse,
-    AdminDashboardResponse, ClientProgressResponse
+    AdminDashboardResponse, ClientProgressResponse, AIRiskRescoreResult
 )
 
 router = APIRouter()
 
+# Sortable columns for keyset pagination
+USER_SORTS = {"id": User.id, "created_at": User.created_at, "name": User.name, "email": User.email}
+PROJECT_SORTS = {"id": Project.id, "created_at": Project.created_at, "project_name": Project.project_name}
+
+
+def _audit_snapshot(user: User) -> dict:
+    """Audited client user fields (never credentials)"""
+    return {
+        "email": user.email,
+        "name": user.name,
+        "organization": user.organization,
+        "department": user.department,
+        "is_active": user.is_active
+    }
+
 # User Management Endpoints
 @router.post("/users", response_model=UserResponse)
 def create_client_user(
@@ -50,33 +73,45 @@ def create_client_user(
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    audit_user_action(current_admin, AuditActions.USER_CREATED, AuditEntityTypes.USER,
+                      entity_id=new_user.id, new_values=_audit_snapshot(new_user))
     
     return new_user.to_dict()
 
 @router.get("/users", response_model=List[UserResponse])
 def list_client_users(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Offset compatibility mode; ignored when cursor is given"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("id"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_total: bool = False,
     search: Optional[str] = None,
     organization: Optional[str] = None,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """List all client users with optional filtering"""
+    """List all client users with optional filtering (keyset paginated)"""
     
     query = db.query(User).filter(User.role == UserRole.CLIENT)
     
+    search_service = SearchService(db)
+    if organization:
+        query, _ = search_service.filter(query, "users", organization, columns=["organization"], fuzzy=False)
+    
     if search:
-        query = query.filter(
-            (User.name.ilike(f"%{search}%")) |
-            (User.email.ilike(f"%{search}%"))
-        )
+        # Relevance-ranked results (prefix, substring, then typo-tolerant matches)
+        users = search_service.search(query, "users", search, limit=limit, offset=skip)
+        return [user.to_dict() for user in users]
     
-    if organization:
-        query = query.filter(User.organization.ilike(f"%{organization}%"))
+    page = paginate(query, USER_SORTS, User.id, limit, sort=sort, descending=order == "desc",
+                    cursor=cursor, skip=skip)
+    if include_total:
+        page.total, page.total_estimated = estimate_total(db, query)
+    page.apply_headers(response)
     
-    users = query.offset(skip).limit(limit).all()
-    return [user.to_dict() for user in users]
+    return [user.to_dict() for user in page.items]
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 def get_client_user(
@@ -119,6 +154,8 @@ def update_client_user(
             detail="Client user not found"
         )
     
+    old_values = _audit_snapshot(user)
+    
     # Update user fields
     if user_data.name is not None:
         user.name = user_data.name
@@ -135,6 +172,9 @@ def update_client_user(
     
     db.commit()
     db.refresh(user)
+    audit_user_action(current_admin, AuditActions.USER_UPDATED, AuditEntityTypes.USER,
+                      entity_id=user.id, old_values=old_values, new_values=_audit_snapshot(user),
+                      description="Password changed" if user_data.password is not None else None)
     
     return user.to_dict()
 
@@ -162,6 +202,8 @@ def delete_client_user(
     user.updated_at = datetime.utcnow()
     
     db.commit()
+    audit_user_action(current_admin, AuditActions.USER_DEACTIVATED, AuditEntityTypes.USER,
+                      entity_id=user.id, old_values={"is_active": True}, new_values={"is_active": False})
     
     return {"message": "Client user deactivated successfully"}
 
@@ -220,16 +262,21 @@ def create_project(
 
 @router.get("/projects", response_model=List[ProjectResponse])
 def list_projects(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Offset compatibility mode; ignored when cursor is given"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("id"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_total: bool = False,
     status: Optional[str] = None,
     risk_template: Optional[str] = None,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """List all compliance projects"""
+    """List all compliance projects (keyset paginated)"""
     
-    query = db.query(Project)
+    query = db.query(Project).options(joinedload(Project.client))
     
     if status:
         query = query.filter(Project.status == status)
@@ -237,8 +284,16 @@ def list_projects(
     if risk_template:
         query = query.filter(Project.risk_template == risk_template)
     
-    projects = query.offset(skip).limit(limit).all()
-    return [project.to_dict() for project in projects]
+    page = paginate(query, PROJECT_SORTS, Project.id, limit, sort=sort, descending=order == "desc",
+                    cursor=cursor, skip=skip)
+    if include_total:
+        unfiltered = not (status or risk_template)
+        page.total, page.total_estimated = estimate_total(
+            db, db.query(Project) if unfiltered else query, table_name="projects" if unfiltered else None
+        )
+    page.apply_headers(response)
+    
+    return [project.to_dict() for project in page.items]
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
 def get_project(
@@ -304,71 +359,60 @@ def get_admin_dashboard(
 ):
     """Get admin dashboard data with analytics"""
     
-    # Get total counts
-    total_clients = db.query(User).filter(User.role == UserRole.CLIENT).count()
-    active_clients = db.query(User).filter(
-        User.role == UserRole.CLIENT,
-        User.is_active == True
-    ).count()
-    
-    total_projects = db.query(Project).count()
-    active_projects = db.query(Project).filter(Project.status == 'active').count()
-    completed_projects = db.query(Project).filter(Project.status == 'completed').count()
-    
-    # Get recent projects
-    recent_projects = db.query(Project).order_by(
-        Project.created_at.desc()
-    ).limit(5).all()
-    
-    # Get compliance statistics
-    high_risk_projects = db.query(Project).filter(
-        Project.risk_template == 'high'
-    ).count()
-    
-    # Get projects needing attention (low compliance scores)
-    projects_needing_attention = db.query(Project).join(Score).filter(
-        Score.overall_compliance_score < 70
-    ).count()
-    
-    return {
-        "total_clients": total_clients,
-        "active_clients": active_clients,
-        "total_projects": total_projects,
-        "active_projects": active_projects,
-        "completed_projects": completed_projects,
-        "high_risk_projects": high_risk_projects,
-        "projects_needing_attention": projects_needing_attention,
-        "recent_projects": [project.to_dict() for project in recent_projects]
-    }
+    return AdminDashboardService(db).get_dashboard()
 
 @router.get("/clients/progress", response_model=List[ClientProgressResponse])
 def get_clients_progress(
+    after_client_id: Optional[int] = Query(None, ge=0),
+    after_project_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Get progress overview for all clients"""
+    """Get progress overview for all clients (keyset paginated on client_id, project_id)"""
     
-    clients_with_projects = db.query(User).join(Project).filter(
-        User.role == UserRole.CLIENT
-    ).all()
-    
-    progress_data = []
-    for client in clients_with_projects:
-        for project in client.client_projects:
-            progress_data.append({
-                "client_id": client.id,
-                "client_name": client.name,
-                "client_email": client.email,
-                "organization": client.organization,
-                "project_id": project.id,
-                "project_name": project.project_name,
-                "risk_template": project.risk_template,
-                "completion_percentage": project.completion_percentage,
-                "compliance_score": project.compliance_score,
-                "risk_score": project.risk_score,
-                "status": project.status,
-                "last_activity": project.updated_at.isoformat() if project.updated_at else None
-            })
-    
-    return progress_data
+    return AdminDashboardService(db).get_clients_progress(
+        after_client_id=after_client_id,
+        after_project_id=after_project_id,
+        limit=limit
+    )
 
+# AI Inventory Maintenance
+@router.post("/ai-models/rescore-risk", response_model=AIRiskRescoreResult)
+def rescore_ai_model_risk(
+    organization_id: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Re-score AI model risk with the current risk factor tables (all organizations by default)"""
+    
+    try:
+        result = AIInventoryService(db).rescore_risk(organization_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    return result
+
+# Audit Trail Export
+@router.get("/audit-logs/export")
+def export_audit_logs(
+    organization_id: Optional[int] = Query(None, ge=1),
+    start: Optional[datetime] = Query(None, description="inclusive; bound exports to prune partitions"),
+    end: Optional[datetime] = Query(None, description="exclusive"),
+    action: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    format: str = Query("ndjson", description="csv, ndjson or parquet (needs pyarrow)"),
+    compress: bool = Query(False, alias="gzip", description="gzip CSV/NDJSON on the fly"),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Stream audit records (oldest first) as a file, with full old/new values"""
+    
+    try:
+        fmt = check_export_format(format)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    source = audit_log_export(organization_id, start, end, action, entity_type)
+    return export_response(source.filename, source.columns, source.chunks, fmt, compress)
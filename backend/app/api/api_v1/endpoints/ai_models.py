@@ -2,15 +2,18 @@
 # RESTful API for managing AI models and inventory
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from ....core.deps import get_current_user, get_db
+from ....core.export import ExportFormatError, check_export_format, export_response
 from ....models.user import User
 from ....models.ai_model import AIModel, ModelType, RiskLevel, ModelStatus, ComplianceStatus
 from ....services.ai_inventory_service import AIInventoryService
+from ....services.ai_model_import import AIModelImportService, ImportFormatError, import_format
 from ....services.gap_analysis_service import GapAnalysisService
+from ....services.export_service import ai_model_export
 
 router = APIRouter()
 
@@ -109,6 +112,39 @@ def get_ai_models(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/import")
+def import_ai_models(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or jsonl; taken from the file extension by default"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Register many AI models from a CSV or JSONL file; invalid rows are reported, not fatal"""
+    try:
+        fmt = import_format(file.filename, format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        return AIModelImportService(db).import_models(file.file, fmt, current_user.organization_id, current_user.id)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import files must be UTF-8 encoded")
+
+@router.get("/export")
+def export_ai_models(
+    format: str = Query("csv", description="csv, ndjson or parquet (needs pyarrow)"),
+    compress: bool = Query(False, alias="gzip", description="gzip CSV/NDJSON on the fly"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the organization's AI model inventory as a file"""
+    try:
+        fmt = check_export_format(format)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    source = ai_model_export(current_user.organization_id)
+    return export_response(source.filename, source.columns, source.chunks, fmt, compress)
+
 @router.get("/summary")
 def get_inventory_summary(
     db: Session = Depends(get_db),
@@ -1,2 +1,170 @@
-from fastapi import APIRouter
+# ISO 42001 Assessment API Endpoints
+# RESTful API for answering ISO 42001 control questionnaires
+
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, status
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+
+from ....core.config import settings
+from ....core.deps import get_current_user, get_db, require_assessment_access
+from ....core.file_response import file_download_response
+from ....models.user import User
+from ....models.iso_control import EvidenceFile, QuestionResponse
+from ....services.iso_assessment_service import ISOAssessmentService
+from ....services.evidence_storage import EvidenceTooLarge, get_evidence_storage
+from ....services.evidence_preview import PREVIEW_MEDIA_TYPE
+
 router = APIRouter()
+
+# Maximum number of question responses accepted in one bulk submission
+MAX_BULK_RESPONSES = 500
+
+# Pydantic models for request/response
+class QuestionResponseSubmit(BaseModel):
+    question_id: int
+    response_value: str  # 'yes', 'no', 'partial', 'not_applicable'
+    comments: Optional[str] = None
+    confidence_level: int = Field(5, ge=1, le=10)
+
+class BulkQuestionResponseSubmit(BaseModel):
+    responses: List[QuestionResponseSubmit] = Field(..., max_length=MAX_BULK_RESPONSES)
+
+class BulkQuestionResponseResult(BaseModel):
+    assessment_id: int
+    submitted: int
+    controls_rescored: int
+
+class EvidenceFileUploaded(BaseModel):
+    id: int
+    question_response_id: int
+    filename: str
+    original_filename: str
+    file_size: int
+    file_type: str
+    file_hash: str
+    upload_status: Optional[str] = None  # "processing" while the preview renders
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+@router.post("/{assessment_id}/responses/bulk", response_model=BulkQuestionResponseResult,
+             dependencies=[Depends(require_assessment_access)])
+def submit_question_responses(
+    assessment_id: int,
+    payload: BulkQuestionResponseSubmit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Submit a page of questionnaire answers in one transaction"""
+    try:
+        service = ISOAssessmentService(db)
+        return service.submit_question_responses(
+            assessment_id,
+            [response.dict() for response in payload.responses]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{assessment_id}/questions/{question_id}/evidence", response_model=EvidenceFileUploaded,
+             status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_assessment_access)])
+def upload_question_evidence(
+    assessment_id: int,
+    question_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Attach an evidence file to an answered question (identical files are stored once)"""
+    if file.content_type not in settings.ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"File type {file.content_type} is not allowed"
+        )
+    try:
+        service = ISOAssessmentService(db)
+        return service.add_question_evidence(
+            assessment_id, question_id, file.file, file.filename, file.content_type
+        )
+    except EvidenceTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/{assessment_id}/evidence/{evidence_file_id}", status_code=status.HTTP_204_NO_CONTENT,
+               dependencies=[Depends(require_assessment_access)])
+def delete_question_evidence(
+    assessment_id: int,
+    evidence_file_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Remove an evidence file; its stored content is deleted once nothing references it"""
+    try:
+        ISOAssessmentService(db).delete_question_evidence(assessment_id, evidence_file_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/{assessment_id}/evidence/{evidence_file_id}/download",
+            dependencies=[Depends(require_assessment_access)])
+def download_question_evidence(
+    assessment_id: int,
+    evidence_file_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download an evidence file; the content hash is its ETag, and Range requests resume downloads"""
+    evidence_file = db.query(EvidenceFile).join(QuestionResponse).filter(
+        EvidenceFile.id == evidence_file_id,
+        QuestionResponse.assessment_id == assessment_id
+    ).first()
+    if not evidence_file:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evidence file not found")
+
+    return file_download_response(
+        request,
+        get_evidence_storage(),
+        evidence_file.file_path,
+        etag=f'"{evidence_file.file_hash}"' if evidence_file.file_hash else None,
+        filename=evidence_file.original_filename,
+        media_type=evidence_file.file_type
+    )
+
+@router.get("/{assessment_id}/evidence/{evidence_file_id}/preview",
+            dependencies=[Depends(require_assessment_access)])
+def preview_question_evidence(
+    assessment_id: int,
+    evidence_file_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Small JPEG preview of an evidence file; 202 while it is still being rendered"""
+    evidence_file = db.query(EvidenceFile).join(QuestionResponse).filter(
+        EvidenceFile.id == evidence_file_id,
+        QuestionResponse.assessment_id == assessment_id
+    ).first()
+    if not evidence_file:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evidence file not found")
+
+    if evidence_file.preview_path:
+        return file_download_response(
+            request,
+            get_evidence_storage(),
+            evidence_file.preview_path,
+            etag=f'"{evidence_file.file_hash}-preview"',
+            filename=f"{evidence_file.id}-preview.jpg",
+            media_type=PREVIEW_MEDIA_TYPE,
+            inline=True
+        )
+    if evidence_file.upload_status == "processing":
+        return Response(status_code=status.HTTP_202_ACCEPTED, headers={"Retry-After": "2"})
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No preview available")
@@ -5,12 +5,13 @@ Handles user registration, login, token management, and profile operations
 Developed by: Qryti Dev Team
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 from typing import Any
 import logging
 
+from app.core.audit import audit_user_action
 from app.core.database import get_db
 from app.core.security import (
     security_utils, get_current_user, get_current_active_user,
@@ -22,6 +23,7 @@ from app.schemas.auth import (
     AuthResponse, RegistrationResponse, MessageResponse, UserWithOrganization,
     InviteUserRequest, UpdateProfileRequest
 )
+from app.models.audit_log import AuditActions, AuditEntityTypes
 from app.models.user import User, UserRole
 from app.models.organization import Organization
 from app.services.email_service import send_verification_email, send_password_reset_email
@@ -34,6 +36,7 @@ security = HTTPBearer()
 async def register_user(
     user_data: UserRegistration,
     background_tasks: BackgroundTasks,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -83,6 +86,11 @@ async def register_user(
         db.add(user)
         db.commit()
         
+        audit_user_action(user, AuditActions.ORGANIZATION_CREATED, AuditEntityTypes.ORGANIZATION, request,
+                          entity_id=organization.id, new_values={"name": organization.name, "domain": organization.domain})
+        audit_user_action(user, AuditActions.USER_CREATED, AuditEntityTypes.USER, request,
+                          entity_id=user.id, new_values={"email": user.email, "role": user.role.value})
+        
         # Send verification email
         background_tasks.add_task(send_verification_email, user.email, user.full_name)
         
@@ -106,6 +114,7 @@ async def register_user(
 @router.post("/login", response_model=AuthResponse)
 async def login_user(
     user_credentials: UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -118,6 +127,8 @@ async def login_user(
         )
         
         if not user:
+            audit_user_action(None, AuditActions.LOGIN_FAILED, AuditEntityTypes.USER, request,
+                              new_values={"email": user_credentials.email}, severity="warning")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -133,6 +144,7 @@ async def login_user(
         from datetime import datetime
         user.last_login = datetime.utcnow()
         db.commit()
+        audit_user_action(user, AuditActions.LOGIN, AuditEntityTypes.USER, request, entity_id=user.id)
         
         # Create tokens
         tokens = create_tokens_for_user(user)
@@ -203,6 +215,7 @@ async def refresh_token(
 @router.post("/verify-email", response_model=MessageResponse)
 async def verify_email(
     verification_data: EmailVerification,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -231,6 +244,8 @@ async def verify_email(
         # Verify user
         user.is_verified = True
         db.commit()
+        audit_user_action(user, AuditActions.USER_UPDATED, AuditEntityTypes.USER, request,
+                          entity_id=user.id, new_values={"is_verified": True})
         
         logger.info(f"Email verified for user: {user.email}")
         
@@ -277,6 +292,7 @@ async def forgot_password(
 @router.post("/reset-password", response_model=MessageResponse)
 async def reset_password(
     reset_data: PasswordResetConfirm,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -304,6 +320,8 @@ async def reset_password(
         # Update password
         user.hashed_password = security_utils.get_password_hash(reset_data.new_password)
         db.commit()
+        audit_user_action(user, AuditActions.PASSWORD_CHANGED, AuditEntityTypes.USER, request,
+                          entity_id=user.id, description="Password reset with a reset token")
         
         logger.info(f"Password reset for user: {user.email}")
         
@@ -321,6 +339,7 @@ async def reset_password(
 @router.post("/change-password", response_model=MessageResponse)
 async def change_password(
     password_data: PasswordChange,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
@@ -342,6 +361,8 @@ async def change_password(
             password_data.new_password
         )
         db.commit()
+        audit_user_action(current_user, AuditActions.PASSWORD_CHANGED, AuditEntityTypes.USER, request,
+                          entity_id=current_user.id)
         
         logger.info(f"Password changed for user: {current_user.email}")
         
@@ -368,6 +389,7 @@ async def get_profile(
 @router.put("/profile", response_model=UserWithOrganization)
 async def update_profile(
     profile_data: UpdateProfileRequest,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
@@ -376,10 +398,14 @@ async def update_profile(
     """
     try:
         # Update profile fields
+        old_values = {"full_name": current_user.full_name}
         if profile_data.full_name is not None:
             current_user.full_name = profile_data.full_name
         
         db.commit()
+        audit_user_action(current_user, AuditActions.USER_UPDATED, AuditEntityTypes.USER, request,
+                          entity_id=current_user.id, old_values=old_values,
+                          new_values={"full_name": current_user.full_name})
         
         logger.info(f"Profile updated for user: {current_user.email}")
         
@@ -395,12 +421,14 @@ async def update_profile(
 
 @router.post("/logout", response_model=MessageResponse)
 async def logout_user(
+    request: Request,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
     Logout user (client should discard tokens)
     """
     logger.info(f"User logged out: {current_user.email}")
+    audit_user_action(current_user, AuditActions.LOGOUT, AuditEntityTypes.USER, request, entity_id=current_user.id)
     
     return MessageResponse(message="Logout successful")
 
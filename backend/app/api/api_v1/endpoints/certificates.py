@@ -3,32 +3,39 @@ Certificate Management API endpoints
 Handles certificate issuance, validation, and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
-from datetime import datetime, timedelta
-import uuid
+from datetime import datetime
+import hashlib
 
+from app.core.audit import audit_user_action
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_admin_user
-from app.models import User, Project, Score
-from app.schemas.admin import CertificateIssueRequest, CertificateResponse
+from app.core.file_response import etag_matches, file_download_response
+from app.models import User, Project
+from app.models.audit_log import AuditActions, AuditEntityTypes
+from app.schemas.admin import CertificateIssueRequest, CertificateBatchIssueRequest, CertificateResponse
+from app.services.certificate_renderer import get_certificate_storage
+from app.services.certificate_service import CertificateService, CertificateError, MAX_ISSUE_BATCH
 
 router = APIRouter()
 
-# For now, we'll store certificates in a simple model
-# In production, you'd want a proper Certificate model
-class Certificate:
-    def __init__(self, project_id, certificate_type, validity_months, issued_by, notes=None):
-        self.id = None  # Would be auto-generated in DB
-        self.project_id = project_id
-        self.certificate_number = f"QRYTI-{certificate_type.upper()}-{uuid.uuid4().hex[:8].upper()}"
-        self.certificate_type = certificate_type
-        self.issued_date = datetime.utcnow()
-        self.expiry_date = self.issued_date + timedelta(days=validity_months * 30)
-        self.status = "active"
-        self.issued_by = issued_by
-        self.notes = notes
+# Unauthenticated verification, mounted outside /admin
+public_router = APIRouter()
+
+
+def _audit_issued(admin: User, certificate):
+    audit_user_action(admin, AuditActions.CERTIFICATE_GENERATED, AuditEntityTypes.CERTIFICATE,
+                      entity_id=certificate.id,
+                      new_values={
+                          "certificate_number": certificate.certificate_number,
+                          "project_id": certificate.project_id,
+                          "certificate_type": certificate.certificate_type,
+                          "expiry_date": certificate.expiry_date.isoformat()
+                      })
 
 @router.post("/certificates/issue", response_model=dict)
 def issue_certificate(
@@ -38,38 +45,20 @@ def issue_certificate(
 ):
     """Issue a compliance certificate for a project"""
     
-    # Verify project exists and has sufficient compliance score
-    project = db.query(Project).filter(Project.id == certificate_data.project_id).first()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
+    try:
+        certificate = CertificateService(db).issue(
+            project_id=certificate_data.project_id,
+            certificate_type=certificate_data.certificate_type,
+            validity_months=certificate_data.validity_period_months,
+            issued_by=current_admin.id,
+            notes=certificate_data.notes
         )
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except CertificateError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    # Check compliance score
-    latest_score = db.query(Score).filter(
-        Score.project_id == certificate_data.project_id
-    ).order_by(Score.calculated_at.desc()).first()
-    
-    if not latest_score or latest_score.overall_compliance_score < 80:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Project does not meet minimum compliance score (80%) for certification"
-        )
-    
-    # Create certificate (in production, save to database)
-    certificate = Certificate(
-        project_id=certificate_data.project_id,
-        certificate_type=certificate_data.certificate_type,
-        validity_months=certificate_data.validity_period_months,
-        issued_by=current_admin.id,
-        notes=certificate_data.notes
-    )
-    
-    # In production, you would save to database here
-    # db.add(certificate)
-    # db.commit()
+    _audit_issued(current_admin, certificate)
     
     return {
         "message": "Certificate issued successfully",
@@ -79,7 +68,51 @@ def issue_certificate(
         "issued_date": certificate.issued_date.isoformat(),
         "expiry_date": certificate.expiry_date.isoformat(),
         "status": certificate.status,
-        "download_url": f"/api/certificates/{certificate.certificate_number}/download"
+        "download_url": f"/api/v1/admin/certificates/{certificate.certificate_number}/download",
+        "verification_url": f"/api/v1/certificates/verify/{certificate.certificate_number}"
+    }
+
+@router.post("/certificates/issue:batch", response_model=dict)
+def issue_certificates_batch(
+    batch: CertificateBatchIssueRequest,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Issue certificates for many projects at once; PDFs are rendered in the certificate render pool"""
+    
+    if not batch.project_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No projects given")
+    if len(batch.project_ids) > MAX_ISSUE_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ISSUE_BATCH} projects per batch"
+        )
+    
+    try:
+        result = CertificateService(db).issue_batch(
+            project_ids=batch.project_ids,
+            certificate_type=batch.certificate_type,
+            validity_months=batch.validity_period_months,
+            issued_by=current_admin.id,
+            notes=batch.notes
+        )
+    except CertificateError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    for certificate in result["issued"]:
+        _audit_issued(current_admin, certificate)
+    
+    return {
+        "issued": [
+            {
+                "certificate_number": certificate.certificate_number,
+                "project_id": certificate.project_id,
+                "expiry_date": certificate.expiry_date.isoformat(),
+                "download_url": f"/api/v1/admin/certificates/{certificate.certificate_number}/download"
+            }
+            for certificate in result["issued"]
+        ],
+        "skipped": result["skipped"]
     }
 
 @router.get("/certificates/eligible-projects")
@@ -89,29 +122,26 @@ def get_eligible_projects(
 ):
     """Get projects eligible for certification"""
     
-    # Projects with compliance score >= 80%
-    eligible_projects = db.query(Project).join(Score).filter(
-        Score.overall_compliance_score >= 80,
+    # Projects whose latest compliance score is >= 80%
+    eligible_projects = db.query(Project).options(
+        joinedload(Project.client)
+    ).filter(
+        Project.latest_compliance_score >= 80,
         Project.status == 'active'
-    ).all()
-    
-    result = []
-    for project in eligible_projects:
-        latest_score = db.query(Score).filter(
-            Score.project_id == project.id
-        ).order_by(Score.calculated_at.desc()).first()
-        
-        result.append({
+    ).order_by(Project.latest_compliance_score.desc()).all()
+    
+    return [
+        {
             "project_id": project.id,
             "project_name": project.project_name,
             "client_name": project.client.name,
             "client_organization": project.client.organization,
-            "compliance_score": latest_score.overall_compliance_score,
+            "compliance_score": project.compliance_score,
             "completion_percentage": project.completion_percentage,
             "risk_template": project.risk_template
-        })
-    
-    return result
+        }
+        for project in eligible_projects
+    ]
 
 @router.get("/certificates/project/{project_id}")
 def get_project_certificates(
@@ -129,32 +159,36 @@ def get_project_certificates(
             detail="Project not found"
         )
     
-    # In production, query from certificates table
-    # For now, return mock data
     return {
         "project_id": project_id,
         "project_name": project.project_name,
-        "certificates": []  # Would contain actual certificates from DB
+        "certificates": [certificate.to_dict() for certificate in CertificateService(db).for_project(project_id)]
     }
 
 @router.get("/certificates/{certificate_number}/download")
 def download_certificate(
     certificate_number: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Download certificate PDF"""
+    """Download certificate PDF (rendered on first request when it has none yet)"""
     
-    # In production, you would:
-    # 1. Verify certificate exists
-    # 2. Generate PDF certificate
-    # 3. Return file response
+    service = CertificateService(db)
+    certificate = service.get(certificate_number)
+    if not certificate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate not found"
+        )
     
-    return {
-        "message": "Certificate download functionality will be implemented",
-        "certificate_number": certificate_number,
-        "download_url": f"/files/certificates/{certificate_number}.pdf"
-    }
+    certificate = service.ensure_pdf(certificate)
+    return file_download_response(
+        request, get_certificate_storage(), certificate.pdf_storage_key,
+        etag=f'"{certificate.pdf_sha256}"',
+        filename=f"{certificate.certificate_number}.pdf",
+        media_type="application/pdf"
+    )
 
 @router.put("/certificates/{certificate_number}/revoke")
 def revoke_certificate(
@@ -165,14 +199,24 @@ def revoke_certificate(
 ):
     """Revoke a certificate"""
     
-    # In production, update certificate status in database
+    try:
+        certificate = CertificateService(db).revoke(certificate_number, reason, current_admin.id)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except CertificateError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    audit_user_action(current_admin, AuditActions.CERTIFICATE_REVOKED, AuditEntityTypes.CERTIFICATE,
+                      entity_id=certificate.id,
+                      new_values={"status": certificate.status, "reason": certificate.revocation_reason},
+                      description=f"Certificate {certificate_number} revoked", severity="warning")
     
     return {
         "message": "Certificate revoked successfully",
         "certificate_number": certificate_number,
-        "revoked_by": current_admin.id,
-        "revoked_at": datetime.utcnow().isoformat(),
-        "reason": reason
+        "revoked_by": certificate.revoked_by,
+        "revoked_at": certificate.revoked_at.isoformat(),
+        "reason": certificate.revocation_reason
     }
 
 @router.get("/certificates/statistics")
@@ -182,13 +226,36 @@ def get_certificate_statistics(
 ):
     """Get certificate issuance statistics"""
     
-    # In production, query from certificates table
-    return {
-        "total_certificates_issued": 0,
-        "active_certificates": 0,
-        "expired_certificates": 0,
-        "revoked_certificates": 0,
-        "certificates_this_month": 0,
-        "eligible_projects": len(get_eligible_projects(db, current_admin))
-    }
+    return CertificateService(db).statistics()
 
+@public_router.get("/verify/{certificate_number}")
+def verify_certificate(
+    certificate_number: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Public certificate verification by certificate number (cacheable; revalidate with If-None-Match)"""
+    
+    record = CertificateService(db).verify(certificate_number)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate not found",
+            headers={"Cache-Control": "public, max-age=60"}
+        )
+    
+    updated_at = record.pop("updated_at")
+    etag = '"%s"' % hashlib.sha256(
+        f"{certificate_number}:{record['status']}:{updated_at}".encode()
+    ).hexdigest()[:32]
+    
+    max_age = settings.CERTIFICATE_VERIFY_MAX_AGE
+    if record["valid"]:
+        # Never let a cached "valid" answer outlive the certificate
+        seconds_left = (datetime.fromisoformat(record["expiry_date"]) - datetime.utcnow()).total_seconds()
+        max_age = max(0, min(max_age, int(seconds_left)))
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(record, headers=headers)
@@ -1,2 +1,87 @@
-from fastapi import APIRouter
+"""
+Evidence API endpoints
+Serves evidence files uploaded for compliance controls
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.deps import get_current_user, filter_accessible_projects
+from app.core.file_response import file_download_response
+from app.models.assessment import Assessment
+from app.models.evidence import Evidence
+from app.models.project import Project
+from app.models.stage import AssessmentStage
+from app.models.user import User
+from app.services.evidence_preview import EvidencePreviewService, PreviewFailed, PREVIEW_MEDIA_TYPE, is_previewable
+from app.services.evidence_storage import get_evidence_storage
+
 router = APIRouter()
+
+
+def _accessible_evidence(db: Session, current_user: User, evidence_id: int) -> Evidence:
+    """Active evidence row if it belongs to one of the caller's projects, else 404"""
+    query = db.query(Evidence).join(
+        AssessmentStage, Evidence.assessment_stage_id == AssessmentStage.id
+    ).join(
+        Assessment, AssessmentStage.assessment_id == Assessment.id
+    ).join(
+        Project, Assessment.project_id == Project.id
+    ).filter(Evidence.id == evidence_id, Evidence.is_active == True)
+
+    evidence = filter_accessible_projects(query, current_user).first()
+    if not evidence:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evidence not found")
+    return evidence
+
+
+@router.get("/{evidence_id}/download")
+def download_evidence(
+    evidence_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Download an evidence file (supports Range and If-None-Match; S3 files redirect to a presigned URL)"""
+    evidence = _accessible_evidence(db, current_user, evidence_id)
+
+    return file_download_response(
+        request,
+        get_evidence_storage(),
+        evidence.file_path,
+        etag=f'"{evidence.file_hash}"' if evidence.file_hash else None,
+        filename=evidence.original_file_name or evidence.file_name,
+        media_type=evidence.file_type
+    )
+
+
+@router.get("/{evidence_id}/preview")
+def preview_evidence(
+    evidence_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Small JPEG preview of an image or PDF; the first request queues the render and returns 202, 404 if it failed"""
+    evidence = _accessible_evidence(db, current_user, evidence_id)
+    if not is_previewable(evidence.file_type):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No preview for this file type")
+
+    storage = get_evidence_storage()
+    try:
+        key = EvidencePreviewService(db, storage).evidence_preview(evidence)
+    except PreviewFailed:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preview could not be rendered")
+    if not key:
+        return Response(status_code=status.HTTP_202_ACCEPTED, headers={"Retry-After": "2"})
+
+    return file_download_response(
+        request,
+        storage,
+        key,
+        etag=f'"{evidence.file_hash}-preview"',
+        filename=f"{evidence.id}-preview.jpg",
+        media_type=PREVIEW_MEDIA_TYPE,
+        inline=True
+    )
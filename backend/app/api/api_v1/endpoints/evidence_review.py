@@ -3,22 +3,52 @@ Evidence Review API endpoints for admin users
 Handles evidence approval and review workflows
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
 
+from app.core.audit import audit_user_action
 from app.core.database import get_db
 from app.core.deps import get_current_admin_user
-from app.models import User, Evidence, Assessment, Project
-from app.schemas.admin import EvidenceReviewRequest, EvidenceReviewResponse
+from app.core.file_response import file_download_response
+from app.core.pagination import paginate, estimate_total
+from app.models import User
+from app.models.audit_log import AuditActions, AuditEntityTypes
+from app.models.evidence import Evidence
+from app.schemas.admin import (
+    EvidenceReviewRequest, EvidenceReviewResponse, EvidenceBatchReviewItem, EvidenceBatchReviewResult
+)
+from app.services.evidence_review_service import (
+    EvidenceReviewService, EvidenceNotFound, MAX_CLAIM, MAX_REVIEW_BATCH
+)
+from app.services.evidence_storage import get_evidence_storage
 
 router = APIRouter()
 
+# Sortable columns for keyset pagination
+EVIDENCE_SORTS = {"id": Evidence.id, "uploaded_at": Evidence.upload_date}
+
+
+def _audit_reviews(admin: User, decisions):
+    """One audit record per committed review decision ({evidence_id, approved, notes})"""
+    for decision in decisions:
+        audit_user_action(
+            admin,
+            AuditActions.EVIDENCE_VALIDATED if decision["approved"] else AuditActions.EVIDENCE_REJECTED,
+            AuditEntityTypes.EVIDENCE,
+            entity_id=decision["evidence_id"],
+            new_values={"is_validated": decision["approved"], "validation_notes": decision.get("notes")}
+        )
+
 @router.get("/evidence/pending", response_model=List[EvidenceReviewResponse])
 def get_pending_evidence_review(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Offset compatibility mode; ignored when cursor is given"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("uploaded_at"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_total: bool = False,
     project_id: Optional[int] = None,
     control_id: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -26,41 +56,70 @@ def get_pending_evidence_review(
 ):
     """Get list of evidence files pending review"""
     
-    query = db.query(Evidence).join(Assessment).join(Project).filter(
-        Evidence.is_validated == False,
-        Evidence.is_active == True
-    )
+    service = EvidenceReviewService(db)
+    query = service.pending_query(project_id=project_id, control_id=control_id)
     
-    if project_id:
-        query = query.filter(Assessment.project_id == project_id)
+    page = paginate(query, EVIDENCE_SORTS, Evidence.id, limit, sort=sort, descending=order == "desc",
+                    cursor=cursor, skip=skip)
+    if include_total:
+        page.total, page.total_estimated = estimate_total(db, query)
+    page.apply_headers(response)
     
-    if control_id:
-        query = query.filter(Assessment.control_id == control_id)
+    return [service.to_review_item(row) for row in page.items]
+
+@router.post("/evidence/claim", response_model=List[EvidenceReviewResponse])
+def claim_evidence_for_review(
+    limit: int = Query(10, ge=1, le=MAX_CLAIM),
+    project_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Claim the next pending evidence items; other reviewers will not be handed them"""
     
-    evidence_list = query.offset(skip).limit(limit).all()
+    return EvidenceReviewService(db).claim_next(current_admin.id, limit, project_id=project_id)
+
+@router.post("/evidence/release")
+def release_evidence_claims(
+    evidence_ids: Optional[List[int]] = None,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Return claimed evidence items (all of the reviewer's claims by default) to the queue"""
     
-    result = []
-    for evidence in evidence_list:
-        assessment = evidence.assessment
-        project = assessment.project
-        client = project.client
-        
-        result.append({
-            "evidence_id": evidence.id,
-            "file_name": evidence.file_name,
-            "assessment_id": assessment.id,
-            "control_id": assessment.control_id,
-            "client_name": client.name,
-            "project_name": project.project_name,
-            "uploaded_at": evidence.uploaded_at.isoformat(),
-            "file_size": evidence.file_size,
-            "file_type": evidence.file_type,
-            "is_approved": None,
-            "review_notes": None,
-            "reviewed_by": None,
-            "reviewed_at": None
-        })
+    released = EvidenceReviewService(db).release(current_admin.id, evidence_ids)
+    return {"released": released}
+
+@router.post("/evidence/review:batch", response_model=EvidenceBatchReviewResult)
+def review_evidence_batch(
+    decisions: List[EvidenceBatchReviewItem],
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    """Approve/reject many evidence items in one transaction (all or nothing)"""
+    
+    if not decisions:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No review decisions given")
+    if len(decisions) > MAX_REVIEW_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_REVIEW_BATCH} evidence items per batch"
+        )
     
+    decisions = [decision.dict() for decision in decisions]
+    try:
+        result = EvidenceReviewService(db).review_batch(decisions, current_admin.id)
+        db.commit()
+    except EvidenceNotFound as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        db.rollback()
+        raise
+    
+    _audit_reviews(current_admin, decisions)
     return result
 
 @router.post("/evidence/{evidence_id}/review")
@@ -72,28 +131,18 @@ def review_evidence(
 ):
     """Review and approve/reject evidence"""
     
-    evidence = db.query(Evidence).filter(Evidence.id == evidence_id).first()
-    
-    if not evidence:
+    decisions = [{"evidence_id": evidence_id, "approved": review_data.approved, "notes": review_data.review_notes}]
+    try:
+        EvidenceReviewService(db).review_batch(decisions, current_admin.id)
+        db.commit()
+    except EvidenceNotFound:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Evidence not found"
         )
     
-    # Update evidence validation status
-    evidence.is_validated = review_data.approved
-    evidence.validation_notes = review_data.review_notes
-    
-    # You might want to add review tracking fields to Evidence model
-    # evidence.reviewed_by = current_admin.id
-    # evidence.reviewed_at = datetime.utcnow()
-    
-    # Update assessment evidence status
-    assessment = evidence.assessment
-    if review_data.approved:
-        assessment.evidence_provided = True
-    
-    db.commit()
+    _audit_reviews(current_admin, decisions)
     
     return {
         "message": f"Evidence {'approved' if review_data.approved else 'rejected'} successfully",
@@ -104,10 +153,11 @@ def review_evidence(
 @router.get("/evidence/{evidence_id}/download")
 def download_evidence(
     evidence_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Download evidence file for review"""
+    """Download evidence file for review (supports Range and If-None-Match)"""
     
     evidence = db.query(Evidence).filter(Evidence.id == evidence_id).first()
     
@@ -117,15 +167,14 @@ def download_evidence(
             detail="Evidence not found"
         )
     
-    # In a real implementation, you would return the file
-    # For now, return file information
-    return {
-        "file_name": evidence.file_name,
-        "file_path": evidence.file_path,
-        "file_size": evidence.file_size,
-        "file_type": evidence.file_type,
-        "download_url": f"/files/evidence/{evidence.id}/{evidence.file_name}"
-    }
+    return file_download_response(
+        request,
+        get_evidence_storage(),
+        evidence.file_path,
+        etag=f'"{evidence.file_hash}"' if evidence.file_hash else None,
+        filename=evidence.original_file_name or evidence.file_name,
+        media_type=evidence.file_type
+    )
 
 @router.get("/evidence/statistics")
 def get_evidence_statistics(
@@ -134,20 +183,5 @@ def get_evidence_statistics(
 ):
     """Get evidence review statistics"""
     
-    total_evidence = db.query(Evidence).filter(Evidence.is_active == True).count()
-    pending_review = db.query(Evidence).filter(
-        Evidence.is_active == True,
-        Evidence.is_validated == False
-    ).count()
-    approved_evidence = db.query(Evidence).filter(
-        Evidence.is_active == True,
-        Evidence.is_validated == True
-    ).count()
-    
-    return {
-        "total_evidence": total_evidence,
-        "pending_review": pending_review,
-        "approved_evidence": approved_evidence,
-        "approval_rate": round((approved_evidence / total_evidence * 100), 2) if total_evidence > 0 else 0
-    }
+    return EvidenceReviewService(db).statistics()
 
@@ -5,24 +5,31 @@ Handles organization CRUD operations and settings
 Developed by: Qryti Dev Team
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 
+from app.core.audit import audit_user_action
 from app.core.database import get_db
+from app.core.pagination import paginate, estimate_total
 from app.core.security import (
     get_current_user, get_current_admin_user,
     require_organization_access
 )
 from app.schemas.auth import OrganizationInfo, MessageResponse
+from app.models.audit_log import AuditActions, AuditEntityTypes
 from app.models.user import User, UserRole
 from app.models.organization import Organization
+from app.services.search_service import SearchService
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Sortable columns for keyset pagination
+ORGANIZATION_SORTS = {"id": Organization.id, "created_at": Organization.created_at, "name": Organization.name}
+
 # Organization schemas
 class OrganizationCreate(BaseModel):
     """Organization creation schema"""
@@ -48,10 +55,25 @@ class OrganizationStats(BaseModel):
     created_at: str
     is_active: bool
 
+
+def _audit_snapshot(organization: Organization) -> dict:
+    return {
+        "name": organization.name,
+        "domain": organization.domain,
+        "description": organization.description,
+        "is_active": organization.is_active
+    }
+
 @router.get("/", response_model=List[OrganizationInfo])
 async def list_organizations(
-    skip: int = Query(0, ge=0, description="Number of organizations to skip"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of organizations to skip (compatibility mode; ignored with cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of organizations to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("id", description="Sort key: id, created_at or name"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_total: bool = Query(False, description="Return X-Total-Count (may be an estimate)"),
+    search: Optional[str] = Query(None, description="Ranked, typo-tolerant search on name and domain"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -61,7 +83,18 @@ async def list_organizations(
     try:
         if current_user.role == UserRole.ADMIN:
             # Admin can see all organizations
-            organizations = db.query(Organization).offset(skip).limit(limit).all()
+            query = db.query(Organization)
+            if search:
+                organizations = SearchService(db).search(query, "organizations", search, limit=limit, offset=skip)
+                logger.info(f"Found {len(organizations)} organizations matching search for user {current_user.email}")
+                return organizations
+            
+            page = paginate(query, ORGANIZATION_SORTS, Organization.id, limit, sort=sort,
+                            descending=order == "desc", cursor=cursor, skip=skip)
+            if include_total:
+                page.total, page.total_estimated = estimate_total(db, query, table_name="organizations")
+            page.apply_headers(response)
+            organizations = page.items
         else:
             # Regular users can only see their own organization
             organizations = db.query(Organization).filter(
@@ -71,6 +104,8 @@ async def list_organizations(
         logger.info(f"Listed {len(organizations)} organizations for user {current_user.email}")
         return organizations
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing organizations: {e}")
         raise HTTPException(
@@ -144,6 +179,8 @@ async def update_organization(
                     detail="Domain is already taken by another organization"
                 )
         
+        old_values = _audit_snapshot(organization)
+        
         # Update organization fields
         if org_data.name is not None:
             organization.name = org_data.name
@@ -158,6 +195,9 @@ async def update_organization(
             organization.is_active = org_data.is_active
         
         db.commit()
+        audit_user_action(current_user, AuditActions.ORGANIZATION_UPDATED, AuditEntityTypes.ORGANIZATION,
+                          organization_id=organization.id, entity_id=organization.id,
+                          old_values=old_values, new_values=_audit_snapshot(organization))
         
         logger.info(f"Organization {organization_id} updated by {current_user.email}")
         return organization
@@ -208,6 +248,10 @@ async def delete_organization(
         # Soft delete (deactivate) instead of hard delete
         organization.is_active = False
         db.commit()
+        audit_user_action(current_user, AuditActions.ORGANIZATION_UPDATED, AuditEntityTypes.ORGANIZATION,
+                          organization_id=organization.id, entity_id=organization.id,
+                          old_values={"is_active": True}, new_values={"is_active": False},
+                          description="Organization deleted (deactivated)")
         
         logger.info(f"Organization {organization_id} deleted by {current_user.email}")
         
@@ -310,6 +354,9 @@ async def create_organization(
         
         db.add(organization)
         db.commit()
+        audit_user_action(current_user, AuditActions.ORGANIZATION_CREATED, AuditEntityTypes.ORGANIZATION,
+                          organization_id=organization.id, entity_id=organization.id,
+                          new_values=_audit_snapshot(organization))
         
         logger.info(f"Organization created: {org_data.name} by {current_user.email}")
         
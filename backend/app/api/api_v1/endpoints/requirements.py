@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from datetime import datetime
 
 from ....core.deps import get_current_user, get_db
+from ....core.export import ExportFormatError, check_export_format, export_response
 from ....models.user import User
 from ....models.requirement import (
     Requirement, RequirementAssessment, GapAnalysis,
@@ -15,6 +16,7 @@ from ....models.requirement import (
 )
 from ....services.requirement_service import RequirementService
 from ....services.gap_analysis_service import GapAnalysisService
+from ....services.export_service import requirement_assessment_export
 
 router = APIRouter()
 
@@ -153,6 +155,22 @@ def create_assessment(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/assessments/export")
+def export_assessments(
+    model_id: Optional[int] = Query(None, description="only this AI model's assessments"),
+    format: str = Query("csv", description="csv, ndjson or parquet (needs pyarrow)"),
+    compress: bool = Query(False, alias="gzip", description="gzip CSV/NDJSON on the fly"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the organization's requirement assessments as a file"""
+    try:
+        fmt = check_export_format(format)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    source = requirement_assessment_export(current_user.organization_id, model_id)
+    return export_response(source.filename, source.columns, source.chunks, fmt, compress)
+
 @router.get("/assessments/model/{model_id}", response_model=List[RequirementAssessmentResponse])
 def get_assessments_for_model(
     model_id: int,
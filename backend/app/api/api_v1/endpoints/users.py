@@ -5,12 +5,14 @@ Handles user CRUD operations and user administration
 Developed by: Qryti Dev Team
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 
+from app.core.audit import audit_user_action
 from app.core.database import get_db
+from app.core.pagination import paginate, estimate_total
 from app.core.security import (
     get_current_user, get_current_admin_user,
     require_organization_access, security_utils
@@ -19,16 +21,35 @@ from app.schemas.auth import (
     UserWithOrganization, UpdateUserRequest, InviteUserRequest,
     MessageResponse, UserProfile
 )
+from app.models.audit_log import AuditActions, AuditEntityTypes
 from app.models.user import User, UserRole
 from app.services.email_service import send_verification_email
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Sortable columns for keyset pagination
+USER_SORTS = {"id": User.id, "created_at": User.created_at, "name": User.name, "email": User.email}
+
+
+def _audit_snapshot(user: User) -> dict:
+    """Audited user fields (never credentials)"""
+    return {
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": user.role.value if isinstance(user.role, UserRole) else user.role,
+        "is_active": user.is_active
+    }
+
 @router.get("/", response_model=List[UserWithOrganization])
 async def list_users(
-    skip: int = Query(0, ge=0, description="Number of users to skip"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of users to skip (compatibility mode; ignored with cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of users to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    sort: str = Query("id", description="Sort key: id, created_at, name or email"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_total: bool = Query(False, description="Return X-Total-Count (may be an estimate)"),
     organization_id: Optional[int] = Query(None, description="Filter by organization ID"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -48,11 +69,21 @@ async def list_users(
             query = query.filter(User.organization_id == organization_id)
         
         # Apply pagination
-        users = query.offset(skip).limit(limit).all()
+        page = paginate(query, USER_SORTS, User.id, limit, sort=sort, descending=order == "desc",
+                        cursor=cursor, skip=skip)
+        if include_total:
+            unfiltered = current_user.role == UserRole.ADMIN and organization_id is None
+            page.total, page.total_estimated = estimate_total(
+                db, query, table_name="users" if unfiltered else None
+            )
+        page.apply_headers(response)
+        users = page.items
         
         logger.info(f"Listed {len(users)} users for user {current_user.email}")
         return users
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing users: {e}")
         raise HTTPException(
@@ -118,6 +149,7 @@ async def update_user(
         
         # Check organization access
         require_organization_access(current_user, user.organization_id)
+        old_values = _audit_snapshot(user)
         
         # Update user fields
         if user_data.full_name is not None:
@@ -130,6 +162,8 @@ async def update_user(
             user.is_active = user_data.is_active
         
         db.commit()
+        audit_user_action(current_user, AuditActions.USER_UPDATED, AuditEntityTypes.USER,
+                          entity_id=user.id, old_values=old_values, new_values=_audit_snapshot(user))
         
         logger.info(f"User {user_id} updated by admin {current_user.email}")
         return user
@@ -175,6 +209,8 @@ async def delete_user(
         # Soft delete (deactivate) instead of hard delete
         user.is_active = False
         db.commit()
+        audit_user_action(current_user, AuditActions.USER_DEACTIVATED, AuditEntityTypes.USER,
+                          entity_id=user.id, old_values={"is_active": True}, new_values={"is_active": False})
         
         logger.info(f"User {user_id} deleted by admin {current_user.email}")
         
@@ -224,6 +260,8 @@ async def invite_user(
         
         db.add(new_user)
         db.commit()
+        audit_user_action(current_user, AuditActions.USER_CREATED, AuditEntityTypes.USER,
+                          entity_id=new_user.id, new_values=_audit_snapshot(new_user), description="Invited")
         
         # Send invitation email
         send_verification_email(new_user.email, new_user.full_name)
@@ -0,0 +1,291 @@
+"""
+Asynchronous audit trail writer
+Request handlers enqueue audit records; a background thread writes them in multi-row batches
+
+Developed by: Qryti Dev Team
+"""
+
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.audit_log import AuditLog, AuditBlob, diff_values, extract_blobs
+
+logger = logging.getLogger(__name__)
+
+WRITE_RETRIES = 3
+
+# Record key carrying blob content to the writer; not an audit_logs column
+BLOBS_KEY = "_blobs"
+
+_STOP = object()
+
+
+def _writer_engine() -> Engine:
+    """
+    Engine for the writer thread. The app's SQLite engine shares one connection between
+    sessions (StaticPool), so file databases get a connection of their own to keep audit
+    commits out of request transactions.
+    """
+    url = settings.database_url_sync
+    if url.startswith("sqlite") and ":memory:" not in url:
+        return create_engine(url, connect_args={"check_same_thread": False, "timeout": 20})
+    return engine
+
+
+class AuditWriter:
+    """
+    Bounded queue drained by a background thread.
+    A batch is written when batch_size records are waiting or flush_interval_ms has passed
+    since its first record. When the queue is full, enqueue blocks for up to enqueue_timeout
+    seconds and then writes the record itself, so audit records are never dropped.
+    """
+
+    def __init__(self, bind: Optional[Engine] = None, max_queue_size: int = None, batch_size: int = None,
+                 flush_interval_ms: int = None, enqueue_timeout: float = None):
+        self.bind = bind
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or settings.AUDIT_FLUSH_INTERVAL_MS) / 1000
+        self.enqueue_timeout = settings.AUDIT_ENQUEUE_TIMEOUT if enqueue_timeout is None else enqueue_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings.AUDIT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.overflow_writes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            if self.bind is None:
+                self.bind = _writer_engine()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Write everything queued, then stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error(f"Audit writer did not stop within {timeout}s; {self.pending} records pending")
+                return
+            self._thread = None
+        # Records enqueued while stopping
+        self.flush()
+
+    def enqueue(self, record: Dict[str, Any]):
+        if not self.running:
+            self._write([record])
+            return
+        try:
+            self._queue.put(record, timeout=self.enqueue_timeout)
+        except queue.Full:
+            # Backpressure: the caller pays for its own insert instead of dropping the record
+            self.overflow_writes += 1
+            logger.warning("Audit queue full; writing record synchronously")
+            self._write([record])
+
+    def flush(self):
+        """Synchronously write whatever is queued (used when the thread is not running)"""
+        batch = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _STOP:
+                batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            self._write(batch)
+            if stopping:
+                self.flush()
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        bind = self.bind or engine
+        for attempt in range(1, WRITE_RETRIES + 1):
+            if attempt == WRITE_RETRIES and len(batch) > 1:
+                # One bad record (e.g. a constraint violation) must not sink the rest of its batch
+                self._write_each(bind, batch)
+                return
+            try:
+                _insert_records(bind, batch)
+                self.written += len(batch)
+                return
+            except SQLAlchemyError as e:
+                logger.warning(f"Audit batch of {len(batch)} failed (attempt {attempt}/{WRITE_RETRIES}): {e}")
+                time.sleep(0.1 * attempt)
+
+        for record in batch:
+            _log_unwritten(record)
+
+    def _write_each(self, bind: Engine, batch: List[Dict[str, Any]]):
+        """Final attempt: one transaction per record, so only the failing records are lost"""
+        for record in batch:
+            try:
+                _insert_records(bind, [record])
+                self.written += 1
+            except SQLAlchemyError as e:
+                logger.warning(f"Audit record failed on its own: {e}")
+                _log_unwritten(record)
+
+
+def _insert_records(bind: Engine, batch: List[Dict[str, Any]]):
+    """Insert records and their blobs in one transaction"""
+    blobs = {}
+    rows = []
+    for record in batch:
+        blobs.update(record.get(BLOBS_KEY) or {})
+        rows.append({key: value for key, value in record.items() if key != BLOBS_KEY})
+    with bind.begin() as conn:
+        if blobs:
+            _insert_blobs(conn, blobs)
+        # A list of parameter sets is sent as multi-row INSERTs
+        conn.execute(insert(AuditLog.__table__), rows)
+
+
+def _log_unwritten(record: Dict[str, Any]):
+    # Last resort: keep the record in the application log rather than losing it
+    logger.error(f"Unwritten audit record: {json.dumps(record, default=str)}")
+
+
+def _insert_blobs(conn: Connection, blobs: Dict[str, str]):
+    """
+    Store blob content not stored yet; identical content is kept once.
+    Reused blobs get last_referenced_at touched, which keeps purge_unreferenced_blobs off them.
+    """
+    rows = [
+        {"hash": digest, "content": content, "size": len(content.encode("utf-8"))}
+        for digest, content in blobs.items()
+    ]
+    table = AuditBlob.__table__
+    if conn.dialect.name in ("postgresql", "sqlite"):
+        statement = (postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert)(table)
+        conn.execute(statement.on_conflict_do_update(
+            index_elements=["hash"], set_={"last_referenced_at": func.now()}
+        ), rows)
+    else:
+        existing = set(conn.execute(select(table.c.hash).where(table.c.hash.in_(list(blobs)))).scalars())
+        if existing:
+            conn.execute(update(table).where(table.c.hash.in_(existing)).values(last_referenced_at=func.now()))
+        rows = [row for row in rows if row["hash"] not in existing]
+        if rows:
+            conn.execute(insert(table), rows)
+
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter()
+    return _writer
+
+
+def start_audit_writer():
+    get_audit_writer().start()
+
+
+def stop_audit_writer():
+    if _writer is not None:
+        _writer.stop()
+
+
+def audit(organization_id: int, action: str, entity_type: str, **fields):
+    """
+    Record an audit event without touching the caller's transaction.
+    Accepts the same fields as AuditLog.create_log; the event time is captured here,
+    not when the batch is written. old_values is kept whole and new_values is stored as a
+    patch against it; long text values are moved to audit_blobs, which stores each distinct one once.
+    """
+    blobs: Dict[str, str] = {}
+    old_values = fields.pop("old_values", None)
+    new_values = diff_values(old_values, fields.pop("new_values", None))
+    record = AuditLog.log_values(
+        organization_id, action, entity_type,
+        old_values=extract_blobs(old_values, blobs),
+        new_values=extract_blobs(new_values, blobs),
+        **fields
+    )
+    record["timestamp"] = datetime.now(timezone.utc)
+    if blobs:
+        record[BLOBS_KEY] = blobs
+    get_audit_writer().enqueue(record)
+
+
+def audit_user_action(user: Any, action: str, entity_type: str, request: Optional[Request] = None,
+                      organization_id: Optional[int] = None, **fields):
+    """
+    audit() for an action taken by user (None when unauthenticated, e.g. a failed login).
+    organization_id defaults to the user's own; request adds the client address, user agent and
+    X-Request-ID. Call it after the change is committed, so rolled-back changes are not recorded.
+    """
+    if request is not None:
+        fields.setdefault("ip_address", request.client.host if request.client else None)
+        fields.setdefault("user_agent", request.headers.get("user-agent"))
+        fields.setdefault("request_id", request.headers.get("x-request-id"))
+    audit(
+        organization_id if organization_id is not None else getattr(user, "organization_id", None),
+        action, entity_type,
+        user_id=user.id if user is not None else None,
+        **fields
+    )
+
+
+# Flush on interpreter exit too (worker killed outside the ASGI shutdown hook)
+atexit.register(stop_audit_writer)
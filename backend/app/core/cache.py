@@ -0,0 +1,165 @@
+"""
+Short-TTL cache for read-heavy snapshots
+In-process by default, shared (Redis) when CACHE_BACKEND=redis
+
+Developed by: Qryti Dev Team
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
+import json
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """Thread-safe in-process cache with per-entry expiry"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache shared between workers; values must be JSON serializable"""
+
+    def __init__(self, url: str, prefix: str = "qrytiv2:"):
+        import redis  # Optional dependency, only needed for CACHE_BACKEND=redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._client.get(self._prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: int):
+        self._client.set(self._prefix + key, json.dumps(value), ex=ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self._prefix + key for key in keys))
+
+    def clear(self):
+        for key in self._client.scan_iter(f"{self._prefix}*"):
+            self._client.delete(key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache backend selected by CACHE_BACKEND"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.CACHE_BACKEND == "redis" and settings.REDIS_URL:
+                    _cache = RedisCache(settings.REDIS_URL)
+                else:
+                    _cache = MemoryCache()
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the cache backend (e.g. with a shared implementation)"""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def cached(key: str, ttl: int, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for key, computing and storing it on a miss"""
+    cache = get_cache()
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return loader()
+
+    if value is None:
+        value = loader()
+        try:
+            cache.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+    return value
+
+
+def invalidate(*keys: str):
+    try:
+        get_cache().delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {e}")
+
+
+# Cache keys (or functions of the written instance returning one) invalidated when
+# instances of a model class are written
+_model_keys: Dict[type, Set[Union[str, Callable[[Any], str]]]] = {}
+
+
+def invalidate_on_change(key: Union[str, Callable[[Any], str]], *models: type):
+    """
+    Drop key after any committed transaction that inserts, updates or deletes one of models.
+    key may be a function of the written instance, for per-tenant entries.
+    """
+    for model in models:
+        _model_keys.setdefault(model, set()).add(key)
+
+
+def invalidate_after_commit(session: Session, *keys: str):
+    """Drop keys once session commits; for bulk writes, which the flush hook below does not see"""
+    session.info.setdefault("cache_invalidations", set()).update(keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    if not _model_keys:
+        return
+    keys = session.info.setdefault("cache_invalidations", set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        for key in _model_keys.get(type(instance), ()):
+            keys.add(key(instance) if callable(key) else key)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    keys = session.info.pop("cache_invalidations", None)
+    if keys:
+        invalidate(*keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session, previous_transaction):
+    session.info.pop("cache_invalidations", None)
@@ -46,12 +46,16 @@ class Settings(BaseSettings):
         "text/plain",
         "text/csv"
     ]
+    PREVIEW_WORKERS: int = 2  # processes rendering evidence thumbnails
+    PREVIEW_MAX_DIMENSION: int = 320  # pixels, longest side
+    PREVIEW_JPEG_QUALITY: int = 70
     
     # AWS S3 (if using S3 storage)
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: str = "us-east-1"
     S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None  # S3-compatible services (MinIO, R2, ...)
     
     # Email Configuration
     SMTP_HOST: Optional[str] = None
@@ -78,9 +82,28 @@ class Settings(BaseSettings):
     # Reporting
     REPORTS_DIR: str = "reports"
     CERTIFICATES_DIR: str = "certificates"
+    CERTIFICATE_RENDER_WORKERS: int = 2  # processes rendering certificate PDF batches
+    CERTIFICATE_VERIFY_BASE_URL: str = "https://qryti.com/api/v1/certificates/verify"  # printed on certificates
     
     # Audit Trail
     AUDIT_LOG_RETENTION_DAYS: int = 2555  # 7 years for compliance
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_ENQUEUE_TIMEOUT: float = 1.0  # seconds a full queue blocks before writing inline
+    AUDIT_BLOB_MIN_LENGTH: int = 512  # longer text values are stored once in audit_blobs
+    AUDIT_PARTITION_PREMAKE_MONTHS: int = 3  # monthly partitions created ahead of time
+    AUDIT_ARCHIVE_STORAGE: str = "local"  # local, s3
+    AUDIT_ARCHIVE_DIR: str = "archives/audit_logs"
+    
+    # Caching
+    CACHE_BACKEND: str = "memory"  # memory, redis
+    REDIS_URL: Optional[str] = None
+    ADMIN_DASHBOARD_CACHE_TTL: int = 15  # seconds
+    PAGINATION_COUNT_CACHE_TTL: int = 60  # seconds
+    AI_INVENTORY_SUMMARY_CACHE_TTL: int = 60  # seconds; also dropped on any AI model write
+    EVIDENCE_CLAIM_TTL_MINUTES: int = 30  # claimed review items return to the queue after this
+    CERTIFICATE_VERIFY_MAX_AGE: int = 300  # seconds public verification responses may be cached
     
     class Config:
         env_file = ".env"
@@ -5,10 +5,12 @@ Supports both SQLite and PostgreSQL
 Developed by: Qryti Dev Team
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from contextlib import contextmanager
+from typing import List, Optional
 import logging
 
 from app.core.config import settings
@@ -81,3 +83,44 @@ def check_db_connection():
         logger.error(f"Database connection failed: {e}")
         return False
 
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a block of code issues more SQL statements than its budget allows"""
+    pass
+
+class StatementCounter:
+    """Collects SQL statements executed on an engine while active"""
+    
+    def __init__(self):
+        self.statements: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def query_budget(max_statements: Optional[int] = None, bind=None):
+    """
+    Count SQL statements executed inside the block
+    Raises QueryBudgetExceeded on exit if max_statements is given and exceeded
+    
+    Usage:
+        with query_budget(5) as counter:
+            service.get_assessment_overview(assessment_id)
+    """
+    target = bind or engine
+    counter = StatementCounter()
+    event.listen(target, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter._record)
+    
+    if max_statements is not None and counter.count > max_statements:
+        raise QueryBudgetExceeded(
+            f"{counter.count} SQL statements executed, budget is {max_statements}:\n" +
+            "\n".join(counter.statements)
+        )
@@ -7,10 +7,12 @@ Developed by: Qryti Dev Team
 
 import logging
 import asyncio
+import re
 from typing import Optional
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy import MetaData, Table, create_engine, text, inspect
+from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn, CreateTable
 
 from app.core.config import settings
 from app.core.database import Base, engine, SessionLocal
@@ -18,6 +20,28 @@ from app.models import *  # Import all models
 
 logger = logging.getLogger(__name__)
 
+# Columns added to tables that deployed databases already have; create_all never alters an existing table
+ADDED_COLUMNS = {
+    "evidence": ["reviewed_by", "reviewed_at", "claimed_by", "claimed_at"],
+    "projects": [
+        "latest_compliance_score", "latest_risk_score", "latest_score_at",
+        "assessment_count", "answered_assessment_count"
+    ],
+    "assessment_responses": ["score_weighted_sum", "score_weight_total", "answered_questions", "response_count"],
+    "assessments": [
+        "assessment_name", "risk_template", "ai_system_name", "target_completion_date",
+        "score_totals", "status", "overall_compliance_score", "overall_risk_score", "completion_percentage",
+        "govern_score", "map_score", "measure_score", "manage_score"
+    ],
+    "evidence_files": ["file_hash", "preview_path"],
+    "audit_blobs": ["last_referenced_at"],
+}
+
+# Columns that became nullable after release; SQLite month tables (<table>_YYYY_MM) are relaxed with their table
+RELAXED_COLUMNS = {
+    "audit_logs": ["organization_id"],  # Platform admin actions and failed logins have no organization
+}
+
 class DatabaseSetup:
     """Database setup and migration utilities"""
     
@@ -79,7 +103,7 @@ class DatabaseSetup:
             # Import all models to ensure they're registered
             from app.models import (
                 user, organization, assessment, stage, 
-                control, evidence, audit_log
+                control, evidence, audit_log, project, iso_control
             )
             
             # Create all tables
@@ -97,6 +121,95 @@ class DatabaseSetup:
             logger.error(f"❌ Failed to create tables: {e}")
             return False
     
+    def add_missing_columns(self) -> bool:
+        """ALTER TABLE ... ADD COLUMN for the ADDED_COLUMNS an existing table does not have yet"""
+        try:
+            tables = Base.metadata.tables
+            inspector = inspect(self.engine)
+            existing_tables = set(inspector.get_table_names())
+            added = 0
+            for table_name, column_names in ADDED_COLUMNS.items():
+                if table_name not in existing_tables:
+                    continue
+                present = {column["name"] for column in inspector.get_columns(table_name)}
+                for name in column_names:
+                    if name in present:
+                        continue
+                    with self.engine.begin() as conn:
+                        conn.execute(text(
+                            f"ALTER TABLE {table_name} ADD COLUMN {self._column_ddl(tables[table_name].c[name])}"
+                        ))
+                    added += 1
+                    logger.info(f"✅ Added column {table_name}.{name}")
+            logger.info(f"✅ Table columns up to date ({added} added)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to add missing columns: {e}")
+            return False
+    
+    def relax_columns(self) -> bool:
+        """Drop NOT NULL from RELAXED_COLUMNS on existing tables"""
+        try:
+            inspector = inspect(self.engine)
+            table_names = inspector.get_table_names()
+            relaxed = 0
+            for table_name, column_names in RELAXED_COLUMNS.items():
+                month_table = re.compile(rf"^{table_name}_\d{{4}}_\d{{2}}$")
+                for name in table_names:
+                    if name != table_name and not (self.engine.dialect.name == "sqlite" and month_table.match(name)):
+                        continue
+                    strict = [
+                        column["name"] for column in inspector.get_columns(name)
+                        if column["name"] in column_names and not column["nullable"]
+                    ]
+                    if not strict:
+                        continue
+                    with self.engine.begin() as conn:
+                        if self.engine.dialect.name == "sqlite":
+                            # SQLite cannot alter a column: rebuild the table
+                            self._rebuild_sqlite_table(conn, name, strict)
+                        else:
+                            for column_name in strict:
+                                conn.execute(text(f"ALTER TABLE {name} ALTER COLUMN {column_name} DROP NOT NULL"))
+                    relaxed += len(strict)
+                    logger.info(f"✅ Dropped NOT NULL from {name}: {', '.join(strict)}")
+            logger.info(f"✅ Column constraints up to date ({relaxed} relaxed)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to relax column constraints: {e}")
+            return False
+    
+    def _rebuild_sqlite_table(self, conn, table_name: str, nullable_columns):
+        """Copy a table into one with nullable_columns relaxed, keeping its rows and indexes"""
+        metadata = MetaData()  # Also receives the tables its foreign keys point at
+        table = Table(table_name, metadata, autoload_with=conn)
+        for column_name in nullable_columns:
+            table.c[column_name].nullable = True
+        rebuilt = table.to_metadata(metadata, name=f"{table_name}_rebuilt")
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        
+        conn.execute(CreateTable(rebuilt))
+        conn.execute(text(f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table_name}"))
+        conn.execute(text(f"DROP TABLE {table_name}"))
+        conn.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table_name}"))
+        for index in table.indexes:
+            index.create(bind=conn)
+    
+    def _column_ddl(self, column) -> str:
+        """Column definition for ADD COLUMN; existing rows get the Python-side default"""
+        server_default = column.server_default
+        if self.engine.dialect.name == "sqlite" and server_default is not None and not isinstance(server_default.arg, str):
+            # SQLite rejects non-constant defaults such as CURRENT_TIMESTAMP here; existing rows get NULL
+            column = column._copy()
+            column.server_default = None
+        ddl = str(CreateColumn(column).compile(dialect=self.engine.dialect))
+        if column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+            ddl += f" DEFAULT {int(value) if isinstance(value, bool) else repr(value)}"
+        for foreign_key in column.foreign_keys:
+            ddl += f" REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})"
+        return ddl
+    
     def seed_initial_data(self) -> bool:
         """Seed database with initial data"""
         try:
@@ -166,6 +279,51 @@ class DatabaseSetup:
                 db.close()
             return False
     
+    def create_indexes(self):
+        """Create model indexes missing from tables that existed before they were declared"""
+        created = 0
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                try:
+                    # Existing duplicate rows make a unique index fail; log it and keep going
+                    index.create(bind=self.engine, checkfirst=True)
+                    created += 1
+                except SQLAlchemyError as e:
+                    logger.warning(f"⚠️ Could not create index {index.name}: {e}")
+        logger.info(f"✅ {created} model indexes ready")
+    
+    def setup_audit_partitions(self):
+        """Monthly audit_logs partitions (PostgreSQL) or month tables (SQLite)"""
+        from app.services.audit_log_service import ensure_audit_partitions
+        try:
+            ensure_audit_partitions(self.engine)
+            logger.info("✅ Audit log partitions ready")
+        except Exception as e:
+            # The audit trail still works unpartitioned; retention needs partitions
+            logger.error(f"❌ Failed to set up audit log partitions: {e}")
+    
+    def create_search_indexes(self):
+        """Create the indexes behind admin user/organization search"""
+        from app.services.search_service import create_search_indexes
+        create_search_indexes(self.engine)
+        logger.info("✅ Search indexes ready")
+    
+    def refresh_scorecards(self) -> bool:
+        """Recompute project scorecard columns from scores and assessments"""
+        db = self.SessionLocal()
+        try:
+            from app.models.scorecard import refresh_project_scorecards
+            refresh_project_scorecards(db)
+            db.commit()
+            logger.info("✅ Project scorecards refreshed")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to refresh project scorecards: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+    
     def setup_database(self) -> bool:
         """Complete database setup process"""
         logger.info("🚀 Starting database setup...")
@@ -182,10 +340,27 @@ class DatabaseSetup:
         if not self.create_tables():
             return False
         
-        # Step 4: Seed initial data
+        # Step 4: Columns added to or relaxed on existing tables (create_all skips existing tables)
+        if not self.add_missing_columns() or not self.relax_columns():
+            return False
+        
+        # Step 5: Seed initial data
         if not self.seed_initial_data():
             return False
         
+        # Step 6: Composite/partial indexes for hot queries (create_all skips existing tables)
+        self.create_indexes()
+        
+        # Step 7: Monthly audit log partitions
+        self.setup_audit_partitions()
+        
+        # Step 8: Search indexes (pg_trgm on PostgreSQL, FTS5 on SQLite)
+        self.create_search_indexes()
+        
+        # Step 9: Backfill denormalized project scorecards
+        if not self.refresh_scorecards():
+            return False
+        
         logger.info("✅ Database setup completed successfully!")
         return True
     
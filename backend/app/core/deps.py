@@ -5,13 +5,13 @@ Handles authentication and authorization
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
 from jose import JWTError, jwt
 from datetime import datetime
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.models import User, UserRole
+from app.models import User, UserRole, Assessment, Project
 
 security = HTTPBearer()
 
@@ -81,3 +81,28 @@ def get_current_client_user(
     
     return current_user
 
+def filter_accessible_projects(query: Query, current_user: User) -> Query:
+    """Restrict a query that joins projects to the caller's own projects; admins see every tenant"""
+    
+    if current_user.is_admin:
+        return query
+    return query.filter(Project.client_id == current_user.id)
+
+def require_assessment_access(
+    assessment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> int:
+    """Verify the assessment in the path belongs to the caller (404 otherwise, so ids don't leak)"""
+    
+    query = db.query(Assessment.id).join(
+        Project, Assessment.project_id == Project.id
+    ).filter(Assessment.id == assessment_id)
+    
+    if filter_accessible_projects(query, current_user).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
+        )
+    
+    return assessment_id
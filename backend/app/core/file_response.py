@@ -0,0 +1,173 @@
+"""
+File downloads with HTTP Range and conditional request support
+Local files are sent with the server's zero-copy (sendfile) extension when it offers one,
+otherwise in bounded chunks; S3 objects are served by redirecting to a presigned URL.
+
+Developed by: Qryti Dev Team
+"""
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional, Tuple
+import anyio
+import os
+
+from app.core.config import settings
+from app.core.storage import LocalStorage, S3Storage
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+PRESIGNED_URL_EXPIRY = 300  # seconds
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive byte range for a single-range "bytes=" header, None to send the whole file
+    (no header, unparseable, or multiple ranges). Raises RangeNotSatisfiable when no byte matches.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or etag.removeprefix("W/") in [c.removeprefix("W/") for c in candidates]
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse answering Range, If-Range and If-None-Match requests"""
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: str, request: Request, etag: str, media_type: Optional[str] = None,
+                 filename: Optional[str] = None, stat_result: Optional[os.stat_result] = None,
+                 content_disposition_type: str = "attachment"):
+        stat_result = stat_result or os.stat(path)
+        size = stat_result.st_size
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": "private, no-cache"  # Revalidate with If-None-Match, get 304s
+        }
+        self.offset, self.count = 0, size
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            status_code = status.HTTP_304_NOT_MODIFIED
+            self.count = 0
+        else:
+            status_code = status.HTTP_200_OK
+            range_header = request.headers.get("range")
+            if_range = request.headers.get("if-range")
+            if if_range and (if_range != etag or etag.startswith("W/")):
+                range_header = None  # Changed, or only weakly validated: send it whole
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiable:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={"content-range": f"bytes */{size}"}
+                )
+            if byte_range:
+                start, end = byte_range
+                status_code = status.HTTP_206_PARTIAL_CONTENT
+                self.offset, self.count = start, end - start + 1
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(self.count)
+
+        super().__init__(
+            path, status_code=status_code, headers=headers, media_type=media_type,
+            filename=filename, stat_result=stat_result, method=request.method,
+            content_disposition_type=content_disposition_type
+        )
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        with open(self.path, "rb") as file:
+            if ZERO_COPY_EXTENSION in (scope.get("extensions") or {}):
+                # The server sendfile()s straight from the descriptor; no bytes pass through Python
+                await send({
+                    "type": ZERO_COPY_EXTENSION, "file": file,
+                    "offset": self.offset, "count": self.count, "more_body": False
+                })
+                return
+
+            offset, remaining = self.offset, self.count
+            while remaining:
+                chunk = await anyio.to_thread.run_sync(
+                    os.pread, file.fileno(), min(self.chunk_size, remaining), offset
+                )
+                if not chunk:
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def local_file_path(file_path: str) -> Path:
+    """Stored evidence location: a storage key below UPLOAD_DIR, or an older absolute/relative path"""
+    path = Path(file_path)
+    if not path.is_absolute():
+        stored = Path(settings.UPLOAD_DIR) / path
+        if stored.exists():
+            return stored
+    return path
+
+
+def file_download_response(request: Request, storage, file_path: str, etag: Optional[str],
+                           filename: str, media_type: Optional[str], inline: bool = False) -> Response:
+    """Download response for a stored file; etag is the quoted content hash when known"""
+    disposition = "inline" if inline else "attachment"
+    if isinstance(storage, S3Storage):
+        return RedirectResponse(
+            storage.presigned_url(file_path, filename=filename, media_type=media_type,
+                                  expires_in=PRESIGNED_URL_EXPIRY, disposition=disposition),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+
+    path = storage.path(file_path) if isinstance(storage, LocalStorage) else local_file_path(file_path)
+    if not path.exists():
+        path = local_file_path(file_path)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    if not etag:
+        # No content hash recorded: a weak validator from size and mtime
+        etag = f'W/"{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"'
+    return RangeFileResponse(
+        str(path), request, etag=etag, media_type=media_type, filename=filename, stat_result=stat_result,
+        content_disposition_type=disposition
+    )
@@ -0,0 +1,147 @@
+"""
+Keyset (seek) pagination for list endpoints
+Opaque (sort_key, id) cursors with stable ordering, offset kept as a compatibility mode
+
+Developed by: Qryti Dev Team
+"""
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query, Session
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import hashlib
+import json
+import logging
+
+from app.core.cache import cached
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+
+class Page:
+    """One page of results plus the cursor for the next page"""
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str] = None,
+                 total: Optional[int] = None, total_estimated: bool = False):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_estimated = total_estimated
+
+    def apply_headers(self, response: Response):
+        """Expose paging metadata as headers so list response bodies keep their shape"""
+        if self.next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = self.next_cursor
+        if self.total is not None:
+            response.headers[TOTAL_COUNT_HEADER] = str(self.total)
+            response.headers[TOTAL_ESTIMATED_HEADER] = "true" if self.total_estimated else "false"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+    return value
+
+
+def encode_cursor(sort: str, sort_value: Any, row_id: int) -> str:
+    payload = json.dumps({"s": sort, "v": _encode_value(sort_value), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: str) -> Tuple[Any, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort:
+            raise ValueError("cursor was issued for a different sort")
+        return _decode_value(payload["v"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid pagination cursor: {e}"
+        )
+
+
+def paginate(query: Query, sort_columns: Dict[str, Any], id_column: Any, limit: int,
+             sort: str = "id", descending: bool = False, cursor: Optional[str] = None,
+             skip: int = 0) -> Page:
+    """
+    Seek-paginate query ordered by (sort column, id).
+    sort_columns whitelists the sortable (non-null) columns by name. Without a cursor,
+    a non-zero skip falls back to OFFSET for older clients.
+    """
+    if sort not in sort_columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported sort '{sort}'. Use one of: {', '.join(sorted(sort_columns))}"
+        )
+    sort_column = sort_columns[sort]
+    keys = [id_column] if sort_column is id_column else [sort_column, id_column]
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort)
+        after = (lambda column, value: column < value) if descending else (lambda column, value: column > value)
+        if len(keys) == 1:
+            query = query.filter(after(id_column, last_id))
+        else:
+            query = query.filter(or_(
+                after(sort_column, sort_value),
+                and_(sort_column == sort_value, after(id_column, last_id))
+            ))
+
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+    if not cursor and skip:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort,
+            getattr(last, sort_column.key),
+            getattr(last, id_column.key)
+        )
+
+    return Page(rows, next_cursor=next_cursor)
+
+
+def estimate_total(db: Session, query: Query, table_name: Optional[str] = None) -> Tuple[int, bool]:
+    """
+    Fast total for a list query. Returns (total, is_estimate).
+    Unfiltered queries on PostgreSQL (table_name given) read the planner's reltuples;
+    everything else is an exact count cached for PAGINATION_COUNT_CACHE_TTL seconds.
+    """
+    if table_name and db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+            {"table_name": table_name}
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+
+    compiled = query.order_by(None).statement.compile()
+    key = "count:" + hashlib.sha1(f"{compiled}|{sorted(compiled.params.items())!r}".encode()).hexdigest()
+    total = cached(key, settings.PAGINATION_COUNT_CACHE_TTL, lambda: query.order_by(None).count())
+    return total, False
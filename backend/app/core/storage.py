@@ -0,0 +1,146 @@
+"""
+Object storage backends
+Local directory or S3-compatible bucket behind one small interface
+
+Developed by: Qryti Dev Team
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import logging
+import os
+import shutil
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStorage:
+    """Objects stored as files below a root directory"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def put_file(self, key: str, source: str):
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        shutil.copyfile(source, partial)
+        os.replace(partial, target)  # Readers never see a half-written object
+
+    def get_file(self, key: str, target: str):
+        shutil.copyfile(self.path(key), target)
+
+    def move_file(self, key: str, source: str):
+        """Take ownership of source; a rename when it is on the same filesystem"""
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(source, target)
+        except OSError:
+            self.put_file(key, source)
+            os.unlink(source)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def size(self, key: str) -> Optional[int]:
+        path = self.path(key)
+        return path.stat().st_size if path.exists() else None
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def list_keys(self, prefix: str = "") -> Iterator[Tuple[str, datetime]]:
+        """(key, last modified) of every object below prefix"""
+        base = self.path(prefix) if prefix else self.root
+        if not base.is_dir():
+            return
+        for path in base.rglob("*"):
+            if path.is_file():
+                modified = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+                yield path.relative_to(self.root).as_posix(), modified
+
+    def describe(self, key: str) -> str:
+        return str(self.path(key))
+
+
+class S3Storage:
+    """Objects in an S3 or S3-compatible (MinIO, R2, ...) bucket"""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        import boto3  # Optional dependency, only needed for S3 storage
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=settings.AWS_REGION,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+        )
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def get_file(self, key: str, target: str):
+        self._client.download_file(self.bucket, self._key(key), target)
+
+    def put_file(self, key: str, source: str):
+        # upload_file switches to multipart uploads for large files
+        self._client.upload_file(source, self.bucket, self._key(key))
+
+    def move_file(self, key: str, source: str):
+        self.put_file(key, source)
+        os.unlink(source)
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=self._key(key))["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def delete(self, key: str):
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def list_keys(self, prefix: str = "") -> Iterator[Tuple[str, datetime]]:
+        """(key, last modified) of every object below prefix"""
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix)):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix):], item["LastModified"]
+
+    def presigned_url(self, key: str, filename: Optional[str] = None, media_type: Optional[str] = None,
+                      expires_in: int = 300, disposition: str = "attachment") -> str:
+        """Time-limited GET URL; S3 then serves the bytes, Range requests included"""
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f'{disposition}; filename="{filename}"'
+        if media_type:
+            params["ResponseContentType"] = media_type
+        return self._client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def describe(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self._key(key)}"
+
+
+def get_storage(backend: str, local_root: str, s3_prefix: str = ""):
+    """Storage for backend 'local' or 's3' (bucket and endpoint come from settings)"""
+    if backend == "s3":
+        if not settings.S3_BUCKET:
+            raise ValueError("S3 storage requires S3_BUCKET")
+        return S3Storage(settings.S3_BUCKET, prefix=s3_prefix, endpoint_url=settings.S3_ENDPOINT_URL)
+    return LocalStorage(local_root)
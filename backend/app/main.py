@@ -15,9 +15,14 @@ import time
 from pathlib import Path
 
 from app.core.config import settings
-from app.core.database import init_db, check_db_connection
+from app.core.database import init_db, check_db_connection, SessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER
 from app.core.database_setup import setup_database
 from app.api.api_v1.api import api_router
+from app.services.control_catalog import reload_control_catalog
+from app.core.audit import start_audit_writer, stop_audit_writer
+from app.services.evidence_preview import stop_preview_pool
+from app.services.certificate_renderer import stop_certificate_render_pool
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER],  # Pagination headers for the SPA
 )
 
 # Trusted Host Middleware (only in production)
@@ -133,6 +139,17 @@ async def startup_event():
             logger.error("❌ Database connection failed")
             raise Exception("Database connection failed")
         
+        # Load the ISO 42001 control catalog once per process
+        db = SessionLocal()
+        try:
+            catalog = reload_control_catalog(db)
+            logger.info(f"✅ Control catalog loaded ({len(catalog.controls)} controls)")
+        finally:
+            db.close()
+        
+        # Background audit trail writer
+        start_audit_writer()
+        
         # Create necessary directories
         Path(settings.UPLOAD_DIR).mkdir(exist_ok=True)
         Path(settings.REPORTS_DIR).mkdir(exist_ok=True)
@@ -150,6 +167,13 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info("Shutting down application...")
+    
+    # Write queued audit records before the process exits
+    stop_audit_writer()
+    
+    # Finish renders already handed to preview workers
+    stop_preview_pool()
+    stop_certificate_render_pool()
 
 # Health check endpoint
 @app.get("/health")
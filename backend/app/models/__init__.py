@@ -9,14 +9,18 @@ Developed by: Qryti Dev Team
 from .base import Base
 from .user import User, UserRole
 from .organization import Organization
-from .assessment import Assessment, Question, Evidence, Score
+from .assessment import Assessment, Question, Score
+from .evidence import Evidence
 from .stage import Stage
 from .control import Control
-from .audit_log import AuditLog
+from .audit_log import AuditLog, AuditBlob
 from .ai_model import AIModel
 from .requirement import Requirement, RequirementAssessment, GapAnalysis
 from .project import Project
 from .iso_control import ISOControl, ControlQuestion, QuestionResponse, EvidenceFile, AssessmentResponse
+from .evidence_blob import EvidenceBlob
+from .certificate import Certificate
+from . import scorecard  # noqa: F401 - registers the scorecard flush listeners
 
 __all__ = [
     "Base",
@@ -30,6 +34,7 @@ __all__ = [
     "Stage",
     "Control",
     "AuditLog",
+    "AuditBlob",
     "AIModel",
     "Requirement",
     "RequirementAssessment", 
@@ -39,6 +44,8 @@ __all__ = [
     "ControlQuestion", 
     "QuestionResponse",
     "EvidenceFile",
-    "AssessmentResponse"
+    "AssessmentResponse",
+    "EvidenceBlob",
+    "Certificate"
 ]
 
@@ -1,7 +1,7 @@
 # AI Model Registry Data Model
 # Comprehensive model for managing AI models in the organization
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -49,6 +49,10 @@ class ComplianceStatus(enum.Enum):
 class AIModel(Base):
     """AI Model Registry - Core model for AI inventory management"""
     __tablename__ = "ai_models"
+    __table_args__ = (
+        # Inventory listings are always scoped to an organization, often filtered by status
+        Index('ix_ai_models_org_status', 'organization_id', 'status'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -113,7 +117,6 @@ class AIModel(Base):
     organization = relationship("Organization", back_populates="ai_models")
     creator = relationship("User", back_populates="created_models")
     assessments = relationship("RequirementAssessment", back_populates="ai_model")
-    controls = relationship("Control", back_populates="ai_model")
     
     def __repr__(self):
         return f"<AIModel(name='{self.name}', version='{self.version}', status='{self.status}')>"
@@ -3,17 +3,18 @@ Assessment model for gap assessment responses
 Handles client responses to ISO 42001 control questions
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Numeric, JSON, Index, Float, Enum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base
+from .iso_control import RiskTemplate
 
 class Assessment(Base):
     __tablename__ = 'assessments'
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
-    control_id = Column(String(10), ForeignKey('controls.control_id'), nullable=False)
+    project_id = Column(Integer, ForeignKey('projects.id'), nullable=False, index=True)
+    control_id = Column(String(10), nullable=False)  # ISO 42001 control number; controls has no such key
     question_id = Column(Integer, ForeignKey('questions.id'), nullable=False)
     response = Column(String(20))  # 'yes', 'no', 'na'
     justification = Column(Text)
@@ -21,13 +22,31 @@ class Assessment(Base):
     assessed_by = Column(Integer, ForeignKey('users.id'), nullable=False)
     assessed_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    score_totals = Column(JSON)  # Running ISO 42001 score sums per category and NIST function
+    
+    # ISO 42001 assessment details shown on the overview
+    assessment_name = Column(String(200))
+    risk_template = Column(Enum(RiskTemplate))  # Selects the applicable controls
+    ai_system_name = Column(String(200))
+    target_completion_date = Column(DateTime)
+    
+    # ISO 42001 scores derived from score_totals (see AssessmentScoringEngine.assessment_scores)
+    status = Column(String(20), default='draft')  # 'draft', 'in_progress', 'completed'
+    overall_compliance_score = Column(Float, default=0.0)
+    overall_risk_score = Column(Float, default=0.0)
+    completion_percentage = Column(Float, default=0.0)
+    govern_score = Column(Float, default=0.0)
+    map_score = Column(Float, default=0.0)
+    measure_score = Column(Float, default=0.0)
+    manage_score = Column(Float, default=0.0)
     
     # Relationships
     project = relationship("Project", back_populates="assessments")
-    control = relationship("Control")
     question = relationship("Question")
     assessor = relationship("User")
-    evidence_files = relationship("Evidence", back_populates="assessment", cascade="all, delete-orphan")
+    question_responses = relationship("QuestionResponse", back_populates="assessment")
+    control_responses = relationship("AssessmentResponse", back_populates="assessment")
+    assessment_stages = relationship("AssessmentStage", back_populates="assessment")
     
     def __repr__(self):
         return f"<Assessment(id={self.id}, project_id={self.project_id}, control_id='{self.control_id}')>"
@@ -44,9 +63,7 @@ class Assessment(Base):
             'assessed_by': self.assessed_by,
             'assessed_at': self.assessed_at.isoformat() if self.assessed_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'control_name': self.control.control_name if self.control else None,
-            'question_text': self.question.question_text if self.question else None,
-            'evidence_count': len(self.evidence_files) if self.evidence_files else 0
+            'question_text': self.question.question_text if self.question else None
         }
     
     @property
@@ -66,15 +83,12 @@ class Question(Base):
     __tablename__ = 'questions'
     
     id = Column(Integer, primary_key=True, index=True)
-    control_id = Column(String(10), ForeignKey('controls.control_id'), nullable=False)
+    control_id = Column(String(10), nullable=False)  # ISO 42001 control number
     question_text = Column(Text, nullable=False)
     response_type = Column(String(20), default='yes_no_na')
     weight = Column(Numeric(3, 2), default=1.0)
     order_index = Column(Integer, default=0)
     
-    # Relationships
-    control = relationship("Control", back_populates="questions")
-    
     def __repr__(self):
         return f"<Question(id={self.id}, control_id='{self.control_id}')>"
     
@@ -89,49 +103,16 @@ class Question(Base):
         }
 
 
-class Evidence(Base):
-    __tablename__ = 'evidence'
-    
-    id = Column(Integer, primary_key=True, index=True)
-    assessment_id = Column(Integer, ForeignKey('assessments.id'), nullable=False)
-    file_name = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_type = Column(String(50))
-    file_size = Column(Integer)
-    version = Column(Integer, default=1)
-    uploaded_by = Column(Integer, ForeignKey('users.id'), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
-    is_current_version = Column(Boolean, default=True)
-    
-    # Relationships
-    assessment = relationship("Assessment", back_populates="evidence_files")
-    uploader = relationship("User")
-    
-    def __repr__(self):
-        return f"<Evidence(id={self.id}, file_name='{self.file_name}', version={self.version})>"
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'assessment_id': self.assessment_id,
-            'file_name': self.file_name,
-            'file_path': self.file_path,
-            'file_type': self.file_type,
-            'file_size': self.file_size,
-            'version': self.version,
-            'uploaded_by': self.uploaded_by,
-            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
-            'is_current_version': self.is_current_version,
-            'uploader_name': self.uploader.name if self.uploader else None
-        }
-
-
 class Score(Base):
     __tablename__ = 'scores'
+    __table_args__ = (
+        # Latest score per project
+        Index('ix_scores_project_calculated', 'project_id', 'calculated_at'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
-    control_id = Column(String(10), ForeignKey('controls.control_id'))
+    control_id = Column(String(10))  # ISO 42001 control number
     control_score = Column(Numeric(5, 2))
     category_score = Column(Numeric(5, 2))
     overall_compliance_score = Column(Numeric(5, 2))
@@ -140,7 +121,6 @@ class Score(Base):
     
     # Relationships
     project = relationship("Project", back_populates="scores")
-    control = relationship("Control")
     
     def __repr__(self):
         return f"<Score(id={self.id}, project_id={self.project_id}, overall_score={self.overall_compliance_score})>"
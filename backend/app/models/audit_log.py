@@ -5,10 +5,19 @@ Represents audit trail for compliance and security purposes
 Developed by: Qryti Dev Team
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, select
+from sqlalchemy.orm import relationship, object_session
 from sqlalchemy.sql import func
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import hashlib
 from app.core.database import Base
+from app.core.config import settings
+
+# Large text values are stored once in audit_blobs and referenced as {"$blob": "<sha256>"}
+BLOB_REF_KEY = "$blob"
+# new_values of an update is stored as {"$patch": {...}} against old_values; removed keys map to REMOVED
+PATCH_KEY = "$patch"
+REMOVED = {"$removed": True}
 
 class AuditLog(Base):
     """
@@ -16,12 +25,16 @@ class AuditLog(Base):
     Provides comprehensive audit trail for compliance purposes
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Organization audit trail, newest first
+        Index('ix_audit_logs_org_timestamp', 'organization_id', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     # User and organization context
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for system events
-    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=True)  # Null for platform admin actions
     
     # Action details
     action = Column(String(100), nullable=False, index=True)  # e.g., "CREATE", "UPDATE", "DELETE", "LOGIN"
@@ -30,7 +43,7 @@ class AuditLog(Base):
     
     # Change tracking
     old_values = Column(JSON, nullable=True)  # Previous values before change
-    new_values = Column(JSON, nullable=True)  # New values after change
+    new_values = Column(JSON, nullable=True)  # New values after change, as a patch when old_values is set
     
     # Request context
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
@@ -65,21 +78,48 @@ class AuditLog(Base):
                    request_id: str = None,
                    description: str = None,
                    severity: str = "info"):
-        """Create a new audit log entry"""
-        return cls(
-            organization_id=organization_id,
+        """Create a new audit log entry (new_values is stored as a patch against old_values)"""
+        return cls(**cls.log_values(
+            organization_id, action, entity_type,
             user_id=user_id,
-            action=action,
-            entity_type=entity_type,
             entity_id=entity_id,
             old_values=old_values,
-            new_values=new_values,
+            new_values=diff_values(old_values, new_values),
             ip_address=ip_address,
             user_agent=user_agent,
             request_id=request_id,
             description=description,
             severity=severity
-        )
+        ))
+    
+    @staticmethod
+    def log_values(organization_id: int,
+                   action: str,
+                   entity_type: str,
+                   user_id: int = None,
+                   entity_id: int = None,
+                   old_values: dict = None,
+                   new_values: dict = None,
+                   ip_address: str = None,
+                   user_agent: str = None,
+                   request_id: str = None,
+                   description: str = None,
+                   severity: str = "info") -> dict:
+        """Column values for an audit log entry (used for bulk inserts)"""
+        return {
+            "organization_id": organization_id,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_values": old_values,
+            "new_values": new_values,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "request_id": request_id,
+            "description": description,
+            "severity": severity
+        }
     
     @property
     def is_user_action(self):
@@ -114,9 +154,13 @@ class AuditLog(Base):
         }
         
         if include_sensitive:
+            blobs = getattr(self, "_blobs", None)
+            if blobs is None:
+                blobs = load_blobs(object_session(self), [self])
+            old_values, new_values = expand_values(self.old_values, self.new_values, blobs)
             data.update({
-                "old_values": self.old_values,
-                "new_values": self.new_values,
+                "old_values": old_values,
+                "new_values": new_values,
                 "ip_address": self.ip_address,
                 "user_agent": self.user_agent,
                 "request_id": self.request_id
@@ -124,6 +168,100 @@ class AuditLog(Base):
             
         return data
 
+class AuditBlob(Base):
+    """Content-addressed store for large audit values, shared by every log entry that references them"""
+    __tablename__ = "audit_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 of content
+    content = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())  # Touched by every write that reuses it
+
+
+def diff_values(old_values: Optional[dict], new_values: Optional[dict]) -> Optional[dict]:
+    """
+    new_values as stored: a patch of the keys that changed against old_values, with REMOVED
+    for keys new_values no longer has. Creates and deletes (either side None) are kept whole.
+    """
+    if old_values is None or new_values is None:
+        return new_values
+    patch = {key: value for key, value in new_values.items() if key not in old_values or old_values[key] != value}
+    patch.update({key: REMOVED for key in old_values.keys() - new_values.keys()})
+    return {PATCH_KEY: patch}
+
+
+def apply_patch(old_values: Optional[dict], new_values: Optional[dict]) -> Optional[dict]:
+    """Inverse of diff_values; rows written before patches were stored pass through unchanged"""
+    if not isinstance(new_values, dict) or set(new_values) != {PATCH_KEY}:
+        return new_values
+    values = dict(old_values or {})
+    for key, value in new_values[PATCH_KEY].items():
+        if value == REMOVED:
+            values.pop(key, None)
+        else:
+            values[key] = value
+    return values
+
+
+def expand_values(old_values: Optional[dict], new_values: Optional[dict],
+                  blobs: Dict[str, str]) -> Tuple[Optional[dict], Optional[dict]]:
+    """Full old/new snapshots of a stored row: blob references resolved and the patch applied"""
+    old_values = expand_blobs(old_values, blobs)
+    return old_values, apply_patch(old_values, expand_blobs(new_values, blobs))
+
+
+def extract_blobs(values: Optional[dict], blobs: Dict[str, str]) -> Optional[dict]:
+    """Replace long string values with blob references, collecting their content in blobs"""
+    if not values:
+        return values
+    if set(values) == {PATCH_KEY}:
+        return {PATCH_KEY: extract_blobs(values[PATCH_KEY], blobs)}
+    extracted = {}
+    for key, value in values.items():
+        if isinstance(value, str) and len(value) >= settings.AUDIT_BLOB_MIN_LENGTH:
+            digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
+            blobs[digest] = value
+            value = {BLOB_REF_KEY: digest}
+        extracted[key] = value
+    return extracted
+
+
+def blob_refs(values: Optional[dict]) -> Set[str]:
+    if values and set(values) == {PATCH_KEY}:
+        values = values[PATCH_KEY]
+    return {
+        value[BLOB_REF_KEY] for value in (values or {}).values()
+        if isinstance(value, dict) and BLOB_REF_KEY in value
+    }
+
+
+def expand_blobs(values: Optional[dict], blobs: Dict[str, str]) -> Optional[dict]:
+    """Inverse of extract_blobs"""
+    if not values:
+        return values
+    if set(values) == {PATCH_KEY}:
+        return {PATCH_KEY: expand_blobs(values[PATCH_KEY], blobs)}
+    return {
+        key: blobs.get(value[BLOB_REF_KEY], value)
+        if isinstance(value, dict) and BLOB_REF_KEY in value else value
+        for key, value in values.items()
+    }
+
+
+def load_blobs(session, rows: Iterable[Any]) -> Dict[str, str]:
+    """Content of every blob referenced by rows (AuditLog objects or mappings), in one query"""
+    refs = set()
+    for row in rows:
+        old_values = row["old_values"] if isinstance(row, dict) else row.old_values
+        new_values = row["new_values"] if isinstance(row, dict) else row.new_values
+        refs |= blob_refs(old_values) | blob_refs(new_values)
+    if not refs or session is None:
+        return {}
+    table = AuditBlob.__table__
+    return dict(session.execute(select(table.c.hash, table.c.content).where(table.c.hash.in_(refs))).all())
+
+
 # Common audit log actions
 class AuditActions:
     """Constants for common audit log actions"""
@@ -163,10 +301,12 @@ class AuditActions:
     EVIDENCE_DELETED = "EVIDENCE_DELETED"
     EVIDENCE_DOWNLOADED = "EVIDENCE_DOWNLOADED"
     EVIDENCE_VALIDATED = "EVIDENCE_VALIDATED"
+    EVIDENCE_REJECTED = "EVIDENCE_REJECTED"
     
     # Report generation
     REPORT_GENERATED = "REPORT_GENERATED"
     CERTIFICATE_GENERATED = "CERTIFICATE_GENERATED"
+    CERTIFICATE_REVOKED = "CERTIFICATE_REVOKED"
     DATA_EXPORTED = "DATA_EXPORTED"
     
     # System events
@@ -1,5 +1,3 @@
 # Base model for all database models
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
-
+# One declarative base: models reference each other by class name, which only resolves within a registry
+from app.core.database import Base  # noqa: F401
@@ -0,0 +1,60 @@
+"""
+Certificate model for issued compliance certificates
+Certificates are verified publicly by certificate number
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .base import Base
+
+class Certificate(Base):
+    __tablename__ = 'certificates'
+    __table_args__ = (
+        # Certificates of a project by state
+        Index('ix_certificates_project_status', 'project_id', 'status'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    certificate_number = Column(String(64), nullable=False, unique=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
+    certificate_type = Column(String(50), nullable=False)
+    issued_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expiry_date = Column(DateTime, nullable=False, index=True)  # Expiry sweep
+    status = Column(String(20), nullable=False, default='active')  # 'active', 'expired', 'revoked'
+    issued_by = Column(Integer, ForeignKey('users.id'), nullable=False)
+    notes = Column(Text)
+
+    # Rendered PDF, stored content-addressed (see certificate_renderer)
+    pdf_sha256 = Column(String(64))
+    pdf_storage_key = Column(String(200))
+
+    # Revocation
+    revoked_at = Column(DateTime)
+    revoked_by = Column(Integer, ForeignKey('users.id'))
+    revocation_reason = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    project = relationship("Project")
+    issuer = relationship("User", foreign_keys=[issued_by])
+
+    def __repr__(self):
+        return f"<Certificate(number='{self.certificate_number}', project_id={self.project_id}, status='{self.status}')>"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'certificate_number': self.certificate_number,
+            'certificate_type': self.certificate_type,
+            'issued_date': self.issued_date.isoformat() if self.issued_date else None,
+            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else None,
+            'status': self.status,
+            'issued_by': self.issued_by,
+            'notes': self.notes,
+            'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None,
+            'revocation_reason': self.revocation_reason
+        }
@@ -5,7 +5,7 @@ Represents evidence files uploaded for compliance controls
 Developed by: Qryti Dev Team
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -16,6 +16,16 @@ class Evidence(Base):
     Supports file metadata, quality ratings, and audit trail
     """
     __tablename__ = "evidence"
+    __table_args__ = (
+        # Review statistics: one conditional aggregate over the index
+        Index('ix_evidence_validated_active', 'is_active', 'is_validated', 'reviewed_at', 'upload_date'),
+        # Review queue: only unreviewed, active evidence, in upload order
+        Index(
+            'ix_evidence_pending_review', 'upload_date', 'id',
+            postgresql_where=text('is_validated = false AND is_active = true AND reviewed_at IS NULL'),
+            sqlite_where=text('is_validated = 0 AND is_active = 1 AND reviewed_at IS NULL')
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -41,6 +51,10 @@ class Evidence(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     is_validated = Column(Boolean, default=False, nullable=False)
     validation_notes = Column(Text, nullable=True)
+    reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    reviewed_at = Column(DateTime(timezone=True), nullable=True)
+    claimed_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Reviewer working on it; see EvidenceReviewService.claim_next
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
     upload_date = Column(DateTime(timezone=True), server_default=func.now())
@@ -52,7 +66,7 @@ class Evidence(Base):
     # Relationships
     assessment_stage = relationship("AssessmentStage", back_populates="evidence")
     control = relationship("Control", back_populates="evidence")
-    uploaded_by_user = relationship("User", back_populates="uploaded_evidence")
+    uploaded_by_user = relationship("User", foreign_keys=[uploaded_by], back_populates="uploaded_evidence")
     
     def __repr__(self):
         return f"<Evidence(id={self.id}, file_name='{self.file_name}', quality='{self.quality_rating}')>"
@@ -94,8 +108,8 @@ class Evidence(Base):
     
     @property
     def preview_url(self):
-        """Get preview URL for the evidence file (if applicable)"""
-        if self.is_image:
+        """Get preview URL for the evidence file (images and PDFs)"""
+        if self.is_image or self.file_type == 'application/pdf':
             return f"/api/v1/evidence/{self.id}/preview"
         return None
     
@@ -0,0 +1,20 @@
+# Content-addressed evidence storage
+# One row per distinct file content; evidence rows reference it by SHA-256
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from .base import Base
+
+class EvidenceBlob(Base):
+    __tablename__ = "evidence_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(200), nullable=False)  # ab/cd/<sha256>
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Evidence rows pointing at this content
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<EvidenceBlob(sha256='{self.sha256[:12]}', size={self.size}, refs={self.ref_count})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -80,6 +80,8 @@ class ResponseValue(str, enum.Enum):
 
 class QuestionResponse(Base):
     __tablename__ = "question_responses"
+    # Unique index (rather than a table constraint) so it can be added to existing tables; backs the upsert
+    __table_args__ = (Index('unique_assessment_question_response', 'assessment_id', 'question_id', unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False)
@@ -100,15 +102,17 @@ class EvidenceFile(Base):
     __tablename__ = "evidence_files"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_response_id = Column(Integer, ForeignKey("question_responses.id"), nullable=False)
+    question_response_id = Column(Integer, ForeignKey("question_responses.id"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)  # Size in bytes
     file_type = Column(String(50), nullable=False)  # MIME type
+    file_hash = Column(String(64), index=True)  # SHA-256, key into evidence_blobs
+    preview_path = Column(String(500))  # Storage key of the JPEG preview, shared by identical content
     version = Column(Integer, default=1)
     is_current_version = Column(Boolean, default=True)
-    upload_status = Column(String(20), default="uploaded")  # uploaded, processing, approved, rejected
+    upload_status = Column(String(20), default="uploaded")  # uploaded, processing (preview rendering), approved, rejected
     admin_review_status = Column(String(20), default="pending")  # pending, approved, rejected
     admin_comments = Column(Text)
     reviewed_by = Column(Integer, ForeignKey("users.id"))
@@ -123,6 +127,7 @@ class EvidenceFile(Base):
 
 class AssessmentResponse(Base):
     __tablename__ = "assessment_responses"
+    __table_args__ = (Index('unique_assessment_control_response', 'assessment_id', 'control_id', unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False)
@@ -132,6 +137,12 @@ class AssessmentResponse(Base):
     risk_score = Column(Float, default=0.0)  # Risk score based on NIST framework
     status = Column(String(20), default="not_started")  # not_started, in_progress, completed, reviewed
     
+    # Running totals maintained incrementally as question responses change
+    score_weighted_sum = Column(Float, default=0.0)  # Sum of question score * question weight (non-N/A)
+    score_weight_total = Column(Float, default=0.0)  # Sum of question weights for non-N/A responses
+    answered_questions = Column(Integer, default=0)  # Number of non-N/A responses
+    response_count = Column(Integer, default=0)  # Number of responses recorded, including N/A
+    
     # Relationships
     assessment = relationship("Assessment", back_populates="control_responses")
     control = relationship("ISOControl", back_populates="assessments")
@@ -34,8 +34,8 @@ class Organization(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Relationships
-    users = relationship("User", back_populates="organization")
-    assessments = relationship("Assessment", back_populates="organization")
+    # Users name their organization (User.organization) rather than referencing it
+    users = relationship("User", primaryjoin="foreign(User.organization) == Organization.name", viewonly=True)
     ai_models = relationship("AIModel", back_populates="organization")
     requirement_assessments = relationship("RequirementAssessment", back_populates="organization")
     gap_analyses = relationship("GapAnalysis", back_populates="organization")
@@ -49,11 +49,6 @@ class Organization(Base):
         """Get count of active users in this organization"""
         return len([user for user in self.users if user.is_active])
     
-    @property
-    def active_assessments_count(self):
-        """Get count of active assessments for this organization"""
-        return len([assessment for assessment in self.assessments if assessment.status != 'archived'])
-    
     def to_dict(self):
         """Convert organization to dictionary for API responses"""
         return {
@@ -68,7 +63,6 @@ class Organization(Base):
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "active_users_count": self.active_users_count,
-            "active_assessments_count": self.active_assessments_count
+            "active_users_count": self.active_users_count
         }
 
@@ -3,13 +3,17 @@ Project model for client project management
 Handles compliance projects assigned to clients
 """
 
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 from .base import Base
 
 class Project(Base):
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Active project lookup per client and client progress listing
+        Index('ix_projects_client_status', 'client_id', 'status'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -24,6 +28,13 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Scorecard - denormalized from scores/assessments on every flush (see scorecard.py)
+    latest_compliance_score = Column(Numeric(5, 2), index=True)
+    latest_risk_score = Column(Numeric(5, 2))
+    latest_score_at = Column(DateTime)
+    assessment_count = Column(Integer, default=0, nullable=False)
+    answered_assessment_count = Column(Integer, default=0, nullable=False)
+    
     # Relationships
     client = relationship("User", foreign_keys=[client_id], back_populates="client_projects")
     creator = relationship("User", foreign_keys=[created_by])
@@ -54,30 +65,18 @@ class Project(Base):
     
     @property
     def completion_percentage(self):
-        """Calculate project completion percentage based on assessments"""
-        if not self.assessments:
-            return 0
-        
-        total_assessments = len(self.assessments)
-        completed_assessments = len([a for a in self.assessments if a.response is not None])
+        """Project completion percentage based on answered assessments"""
+        total_assessments = self.assessment_count or 0
+        answered_assessments = self.answered_assessment_count or 0
         
-        return round((completed_assessments / total_assessments) * 100, 2) if total_assessments > 0 else 0
+        return round((answered_assessments / total_assessments) * 100, 2) if total_assessments > 0 else 0
     
     @property
     def compliance_score(self):
-        """Get latest overall compliance score"""
-        if not self.scores:
-            return 0
-        
-        latest_score = max(self.scores, key=lambda s: s.calculated_at)
-        return latest_score.overall_compliance_score if latest_score else 0
+        """Latest overall compliance score"""
+        return self.latest_compliance_score if self.latest_compliance_score is not None else 0
     
     @property
     def risk_score(self):
-        """Get latest risk score"""
-        if not self.scores:
-            return 0
-        
-        latest_score = max(self.scores, key=lambda s: s.calculated_at)
-        return latest_score.risk_score if latest_score else 0
-
+        """Latest risk score"""
+        return self.latest_risk_score if self.latest_risk_score is not None else 0
@@ -1,7 +1,7 @@
 # ISO 42001 Requirements Data Model
 # Comprehensive model for managing ISO 42001 requirements and assessments
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -77,6 +77,10 @@ class Requirement(Base):
 class RequirementAssessment(Base):
     """Assessment of requirements against AI models/systems"""
     __tablename__ = "requirement_assessments"
+    __table_args__ = (
+        # Gap analysis / compliance scoring filter by organization, optionally narrowed to one model
+        Index('ix_requirement_assessments_org_model', 'organization_id', 'ai_model_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
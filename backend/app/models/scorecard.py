@@ -0,0 +1,82 @@
+# Project scorecard maintenance
+# Keeps the denormalized score/completion columns on projects current within the writing transaction
+
+from sqlalchemy import event, select, func, update, inspect
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional, Set
+
+from .project import Project
+from .assessment import Assessment, Score
+
+SCORECARD_COLUMNS = [
+    "latest_compliance_score", "latest_risk_score", "latest_score_at",
+    "assessment_count", "answered_assessment_count"
+]
+
+
+def _latest_score(column):
+    return select(column).where(
+        Score.project_id == Project.id
+    ).order_by(Score.calculated_at.desc(), Score.id.desc()).limit(1).scalar_subquery()
+
+
+def refresh_project_scorecards(session: Session, project_ids: Optional[Iterable[int]] = None):
+    """Recompute scorecard columns for the given projects (all projects when None) in one UPDATE"""
+    statement = update(Project).values(
+        latest_compliance_score=_latest_score(Score.overall_compliance_score),
+        latest_risk_score=_latest_score(Score.risk_score),
+        latest_score_at=_latest_score(Score.calculated_at),
+        assessment_count=select(func.count(Assessment.id)).where(
+            Assessment.project_id == Project.id
+        ).scalar_subquery(),
+        answered_assessment_count=select(func.count(Assessment.response)).where(
+            Assessment.project_id == Project.id
+        ).scalar_subquery(),
+        updated_at=Project.updated_at  # Scoring is not a project edit; keep the onupdate from firing
+    )
+
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        statement = statement.where(Project.id.in_(project_ids))
+
+    # Core execution on the session's connection: same transaction, no ORM autoflush
+    session.connection().execute(statement)
+
+
+def _touched_project_ids(session: Session) -> Set[int]:
+    project_ids = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(instance, (Score, Assessment)):
+            continue
+        if instance.project_id is not None:
+            project_ids.add(instance.project_id)
+        # A row moved between projects also changes the old project
+        history = inspect(instance).attrs.project_id.history
+        project_ids.update(value for value in history.deleted or () if value is not None)
+    return project_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_scorecard_projects(session, flush_context, instances):
+    project_ids = _touched_project_ids(session)
+    if project_ids:
+        session.info.setdefault("scorecard_projects", set()).update(project_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_scorecards(session, flush_context):
+    project_ids = session.info.pop("scorecard_projects", None)
+    if project_ids:
+        refresh_project_scorecards(session, project_ids)
+
+        # Loaded projects reload their scorecard on next access
+        for instance in session.identity_map.values():
+            if isinstance(instance, Project) and instance.id in project_ids:
+                session.expire(instance, SCORECARD_COLUMNS)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_scorecard_projects(session, previous_transaction):
+    session.info.pop("scorecard_projects", None)
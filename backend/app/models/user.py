@@ -45,6 +45,8 @@ class User(Base):
     # Relationships
     client_projects = relationship("Project", foreign_keys="Project.client_id", back_populates="client")
     created_models = relationship("AIModel", back_populates="creator")
+    uploaded_evidence = relationship("Evidence", foreign_keys="Evidence.uploaded_by", back_populates="uploaded_by_user")
+    audit_logs = relationship("AuditLog", back_populates="user")
     
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', role='{self.role.value}')>"
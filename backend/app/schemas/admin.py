@@ -117,6 +117,11 @@ class AdminDashboardResponse(BaseModel):
     projects_needing_attention: int
     recent_projects: List[ProjectResponse]
 
+class AIRiskRescoreResult(BaseModel):
+    models_scanned: int
+    models_updated: int  # Models whose stored risk changed
+    organizations_affected: int
+
 class ClientProgressResponse(BaseModel):
     client_id: int
     client_name: str
@@ -137,6 +142,17 @@ class EvidenceReviewRequest(BaseModel):
     approved: bool
     review_notes: Optional[str] = None
 
+class EvidenceBatchReviewItem(BaseModel):
+    evidence_id: int
+    approved: bool
+    notes: Optional[str] = None
+
+class EvidenceBatchReviewResult(BaseModel):
+    reviewed: int
+    approved: int
+    rejected: int
+    assessments_updated: int  # Assessments whose evidence_provided flag was set
+
 class EvidenceReviewResponse(BaseModel):
     evidence_id: int
     file_name: str
@@ -151,6 +167,8 @@ class EvidenceReviewResponse(BaseModel):
     review_notes: Optional[str]
     reviewed_by: Optional[int]
     reviewed_at: Optional[str]
+    claimed_by: Optional[int] = None  # Reviewer currently holding the item
+    preview_url: Optional[str] = None  # Small JPEG for triage; images and PDFs only
 
 # Certificate Management Schemas
 class CertificateIssueRequest(BaseModel):
@@ -159,6 +177,12 @@ class CertificateIssueRequest(BaseModel):
     validity_period_months: int = 12
     notes: Optional[str] = None
 
+class CertificateBatchIssueRequest(BaseModel):
+    project_ids: List[int]
+    certificate_type: str = "iso_42001_compliance"
+    validity_period_months: int = 12
+    notes: Optional[str] = None
+
 class CertificateResponse(BaseModel):
     id: int
     project_id: int
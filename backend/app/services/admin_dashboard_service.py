@@ -0,0 +1,111 @@
+"""
+Admin Dashboard Service
+Builds the admin dashboard snapshot with conditional aggregation and serves it from a short-TTL cache,
+plus the per-project client progress listing
+"""
+
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, case, and_, or_
+
+from ..core.config import settings
+from ..core.cache import cached, invalidate, invalidate_on_change
+from ..models.user import User, UserRole
+from ..models.project import Project
+from ..models.assessment import Score
+
+DASHBOARD_CACHE_KEY = "admin:dashboard"
+RECENT_PROJECTS_LIMIT = 5
+CLIENT_PROGRESS_PAGE_SIZE = 100
+
+# Any committed write to users, projects or scores drops the cached snapshot
+invalidate_on_change(DASHBOARD_CACHE_KEY, User, Project, Score)
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class AdminDashboardService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dashboard(self) -> Dict[str, Any]:
+        """Dashboard snapshot: a cache hit, or two statements on a miss"""
+        return cached(DASHBOARD_CACHE_KEY, settings.ADMIN_DASHBOARD_CACHE_TTL, self.build_dashboard)
+
+    @staticmethod
+    def invalidate():
+        invalidate(DASHBOARD_CACHE_KEY)
+
+    def build_dashboard(self) -> Dict[str, Any]:
+        dashboard = self._counts()
+
+        recent_projects = self.db.query(Project).options(
+            joinedload(Project.client)
+        ).order_by(Project.created_at.desc()).limit(RECENT_PROJECTS_LIMIT).all()
+        dashboard["recent_projects"] = [project.to_dict() for project in recent_projects]
+
+        return dashboard
+
+    def _counts(self) -> Dict[str, int]:
+        """All dashboard counters in one statement"""
+        client_counts = self.db.query(
+            func.count(User.id).label("total_clients"),
+            _count_where(User.is_active == True).label("active_clients")
+        ).filter(User.role == UserRole.CLIENT).subquery()
+
+        project_counts = self.db.query(
+            func.count(Project.id).label("total_projects"),
+            _count_where(Project.status == 'active').label("active_projects"),
+            _count_where(Project.status == 'completed').label("completed_projects"),
+            _count_where(Project.risk_template == 'high').label("high_risk_projects"),
+            # Projects whose latest compliance score is low
+            _count_where(Project.latest_compliance_score < 70).label("projects_needing_attention")
+        ).subquery()
+
+        row = self.db.query(client_counts, project_counts).one()
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    def get_clients_progress(self, after_client_id: Optional[int] = None, after_project_id: Optional[int] = None,
+                             limit: int = CLIENT_PROGRESS_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        One row per client project in a single statement (scores come from the project scorecard),
+        ordered by (client_id, project_id).
+        Pass the last row's client_id/project_id to fetch the next page.
+        """
+        query = self.db.query(
+            User.id, User.name, User.email, User.organization,
+            Project.id, Project.project_name, Project.risk_template, Project.status, Project.updated_at,
+            Project.latest_compliance_score, Project.latest_risk_score,
+            Project.assessment_count, Project.answered_assessment_count
+        ).join(
+            Project, Project.client_id == User.id
+        ).filter(User.role == UserRole.CLIENT)
+
+        if after_client_id is not None:
+            query = query.filter(or_(
+                User.id > after_client_id,
+                and_(User.id == after_client_id, Project.id > (after_project_id or 0))
+            ))
+
+        rows = query.order_by(User.id, Project.id).limit(limit).all()
+
+        return [
+            {
+                "client_id": client_id,
+                "client_name": client_name,
+                "client_email": client_email,
+                "organization": organization,
+                "project_id": project_id,
+                "project_name": project_name,
+                "risk_template": risk_template,
+                "completion_percentage": round((answered / total) * 100, 2) if total else 0,
+                "compliance_score": float(compliance_score) if compliance_score is not None else 0,
+                "risk_score": float(risk_score) if risk_score is not None else 0,
+                "status": status,
+                "last_activity": updated_at.isoformat() if updated_at else None
+            }
+            for (client_id, client_name, client_email, organization, project_id, project_name, risk_template,
+                 status, updated_at, compliance_score, risk_score, total, answered) in rows
+        ]
@@ -1,19 +1,52 @@
 # AI Inventory Management Service
 # Comprehensive service for managing AI models and their lifecycle
 
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from sqlalchemy.orm import Session
+from sqlalchemy import func, case, or_, select, tuple_
 from datetime import datetime, timedelta
 import json
 import logging
 
+from ..core.cache import cached, invalidate_after_commit, invalidate_on_change
+from ..core.config import settings
 from ..models.ai_model import AIModel, ModelType, RiskLevel, ModelStatus, ComplianceStatus
 from ..models.requirement import RequirementAssessment, ComplianceLevel
 from ..models.organization import Organization
 from ..models.user import User
+from .risk_scoring import changed_rows, score_risk, score_risk_batch
 
 logger = logging.getLogger(__name__)
 
+RESCORE_CHUNK_SIZE = 2000
+RISK_FIELDS = ('risk_score', 'bias_risk', 'privacy_risk', 'security_risk', 'risk_level')
+
+# Summary distributions, keyed by their name in the summary
+SUMMARY_DIMENSIONS = {
+    'by_status': AIModel.status,
+    'by_type': AIModel.model_type,
+    'by_risk_level': AIModel.risk_level,
+    'by_compliance_status': AIModel.compliance_status
+}
+HIGH_RISK = AIModel.risk_level.in_([RiskLevel.HIGH, RiskLevel.CRITICAL])
+NEEDS_ATTENTION = or_(
+    AIModel.compliance_status.in_([ComplianceStatus.NON_COMPLIANT, ComplianceStatus.PARTIALLY_COMPLIANT]),
+    HIGH_RISK
+)
+
+
+def inventory_summary_key(organization_id: int) -> str:
+    return f"ai_inventory:summary:{organization_id}"
+
+
+# Creating, updating or deleting a model drops its organization's cached summary
+invalidate_on_change(lambda ai_model: inventory_summary_key(ai_model.organization_id), AIModel)
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
 class AIInventoryService:
     """Service for managing AI model inventory and lifecycle"""
     
@@ -152,130 +185,68 @@ class AIInventoryService:
             raise
     
     def get_inventory_summary(self, organization_id: int) -> Dict[str, Any]:
-        """Get inventory summary statistics"""
-        models = self.get_ai_models(organization_id)
-        
-        summary = {
-            'total_models': len(models),
-            'by_status': {},
-            'by_type': {},
-            'by_risk_level': {},
-            'by_compliance_status': {},
-            'average_compliance_score': 0.0,
-            'models_needing_attention': 0,
-            'models_in_production': 0,
-            'high_risk_models': 0
-        }
-        
-        if not models:
-            return summary
-        
-        # Calculate statistics
-        compliance_scores = []
-        for model in models:
-            # Status distribution
-            status = model.status.value if model.status else 'unknown'
-            summary['by_status'][status] = summary['by_status'].get(status, 0) + 1
-            
-            # Type distribution
-            model_type = model.model_type.value if model.model_type else 'unknown'
-            summary['by_type'][model_type] = summary['by_type'].get(model_type, 0) + 1
-            
-            # Risk level distribution
-            risk_level = model.risk_level.value if model.risk_level else 'unknown'
-            summary['by_risk_level'][risk_level] = summary['by_risk_level'].get(risk_level, 0) + 1
-            
-            # Compliance status distribution
-            compliance_status = model.compliance_status.value if model.compliance_status else 'unknown'
-            summary['by_compliance_status'][compliance_status] = summary['by_compliance_status'].get(compliance_status, 0) + 1
-            
-            # Compliance scores
-            if model.compliance_score:
-                compliance_scores.append(model.compliance_score)
-            
-            # Models needing attention (non-compliant or high risk)
-            if (model.compliance_status in [ComplianceStatus.NON_COMPLIANT, ComplianceStatus.PARTIALLY_COMPLIANT] or
-                model.risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]):
-                summary['models_needing_attention'] += 1
-            
-            # Production models
-            if model.status == ModelStatus.PRODUCTION:
-                summary['models_in_production'] += 1
-            
-            # High risk models
-            if model.risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
-                summary['high_risk_models'] += 1
+        """Get inventory summary statistics (cached per organization until an AI model changes)"""
+        return cached(
+            inventory_summary_key(organization_id),
+            settings.AI_INVENTORY_SUMMARY_CACHE_TTL,
+            lambda: self.build_inventory_summary(organization_id)
+        )
+    
+    def build_inventory_summary(self, organization_id: int) -> Dict[str, Any]:
+        """Counts and averages computed in the database; no AIModel rows are loaded"""
+        totals = [
+            func.count(AIModel.id).label('total_models'),
+            _count_where(NEEDS_ATTENTION).label('models_needing_attention'),
+            _count_where(AIModel.status == ModelStatus.PRODUCTION).label('models_in_production'),
+            _count_where(HIGH_RISK).label('high_risk_models'),
+            # Unscored models (NULL or 0) are left out of the average
+            func.avg(case((AIModel.compliance_score != 0, AIModel.compliance_score))).label('average_compliance_score')
+        ]
         
-        # Average compliance score
-        if compliance_scores:
-            summary['average_compliance_score'] = sum(compliance_scores) / len(compliance_scores)
+        if self.db.get_bind().dialect.name == "postgresql":
+            # One pass: a row per value of each dimension plus the grand total row
+            rows = self.db.query(*SUMMARY_DIMENSIONS.values(), *totals).filter(
+                AIModel.organization_id == organization_id
+            ).group_by(
+                func.grouping_sets(*SUMMARY_DIMENSIONS.values(), tuple_())
+            ).all()
+            total_row = next(row for row in rows if all(getattr(row, column.key) is None for column in SUMMARY_DIMENSIONS.values()))
+            distributions = {
+                bucket: {
+                    getattr(row, column.key).value: row.total_models
+                    for row in rows if getattr(row, column.key) is not None
+                }
+                for bucket, column in SUMMARY_DIMENSIONS.items()
+            }
+        else:
+            total_row = self.db.query(*totals).filter(AIModel.organization_id == organization_id).one()
+            distributions = {
+                bucket: {
+                    value.value: count
+                    for value, count in self.db.query(column, func.count(AIModel.id)).filter(
+                        AIModel.organization_id == organization_id
+                    ).group_by(column).all()
+                }
+                for bucket, column in SUMMARY_DIMENSIONS.items()
+            }
         
-        return summary
+        return {
+            'total_models': int(total_row.total_models or 0),
+            **distributions,
+            'average_compliance_score': float(total_row.average_compliance_score or 0.0),
+            'models_needing_attention': int(total_row.models_needing_attention or 0),
+            'models_in_production': int(total_row.models_in_production or 0),
+            'high_risk_models': int(total_row.high_risk_models or 0)
+        }
     
     def _calculate_risk_assessment(self, ai_model: AIModel, model_data: Dict[str, Any]) -> AIModel:
         """Calculate risk assessment for an AI model"""
         try:
-            # Base risk score calculation
-            risk_score = 0.0
-            
-            # Model type risk factors
-            type_risk_factors = {
-                ModelType.GENERATIVE_AI: 30,
-                ModelType.DEEP_LEARNING: 25,
-                ModelType.NATURAL_LANGUAGE: 20,
-                ModelType.COMPUTER_VISION: 15,
-                ModelType.RECOMMENDATION: 15,
-                ModelType.PREDICTIVE_ANALYTICS: 10,
-                ModelType.MACHINE_LEARNING: 10,
-                ModelType.DECISION_SUPPORT: 20,
-                ModelType.OTHER: 15
-            }
-            
-            if ai_model.model_type:
-                risk_score += type_risk_factors.get(ai_model.model_type, 15)
-            
-            # Data classification risk
-            data_risk_factors = {
-                'Restricted': 25,
-                'Confidential': 20,
-                'Internal': 10,
-                'Public': 5
-            }
-            
-            if ai_model.data_classification:
-                risk_score += data_risk_factors.get(ai_model.data_classification, 10)
-            
-            # Status risk (production models have higher risk)
-            if ai_model.status == ModelStatus.PRODUCTION:
-                risk_score += 20
-            elif ai_model.status == ModelStatus.STAGING:
-                risk_score += 10
-            
-            # Business purpose risk (customer-facing models have higher risk)
-            if ai_model.business_purpose and any(keyword in ai_model.business_purpose.lower() 
-                                               for keyword in ['customer', 'public', 'external', 'user-facing']):
-                risk_score += 15
-            
-            # Calculate individual risk components
-            ai_model.bias_risk = min(risk_score * 0.8, 100.0)  # Bias risk
-            ai_model.privacy_risk = min(risk_score * 0.9, 100.0)  # Privacy risk
-            ai_model.security_risk = min(risk_score * 0.7, 100.0)  # Security risk
-            
-            # Overall risk score
-            ai_model.risk_score = min(risk_score, 100.0)
-            
-            # Determine risk level
-            if ai_model.risk_score >= 80:
-                ai_model.risk_level = RiskLevel.CRITICAL
-            elif ai_model.risk_score >= 60:
-                ai_model.risk_level = RiskLevel.HIGH
-            elif ai_model.risk_score >= 40:
-                ai_model.risk_level = RiskLevel.MEDIUM
-            elif ai_model.risk_score >= 20:
-                ai_model.risk_level = RiskLevel.LOW
-            else:
-                ai_model.risk_level = RiskLevel.MINIMAL
-            
+            scores = score_risk(
+                ai_model.model_type, ai_model.data_classification, ai_model.status, ai_model.business_purpose
+            )
+            for field, value in scores.items():
+                setattr(ai_model, field, value)
             return ai_model
             
         except Exception as e:
@@ -288,6 +259,48 @@ class AIInventoryService:
             ai_model.security_risk = 50.0
             return ai_model
     
+    def rescore_risk(self, organization_id: Optional[int] = None, chunk_size: int = RESCORE_CHUNK_SIZE,
+                     progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """
+        Re-score the risk of every model (of one organization, or all) with the current factor tables,
+        e.g. after they change. Models are streamed chunk by chunk with yield_per, scored with
+        score_risk_batch and only changed rows are written back with bulk_update_mappings.
+        progress(scanned, updated) is called after each chunk. The caller commits.
+        """
+        columns = (
+            AIModel.id, AIModel.organization_id, AIModel.model_type, AIModel.data_classification,
+            AIModel.status, AIModel.business_purpose,
+            AIModel.risk_score, AIModel.bias_risk, AIModel.privacy_risk, AIModel.security_risk, AIModel.risk_level
+        )
+        statement = select(*columns).order_by(AIModel.id).execution_options(yield_per=chunk_size)
+        if organization_id is not None:
+            statement = statement.where(AIModel.organization_id == organization_id)
+        
+        scanned = updated = 0
+        organizations = set()
+        for rows in self.db.execute(statement).partitions():
+            (ids, organization_ids, model_types, classifications, statuses, purposes,
+             *current) = zip(*rows)
+            scores = score_risk_batch(model_types, classifications, statuses, purposes)
+            changes = changed_rows(ids, dict(zip(RISK_FIELDS, current)), scores)
+            if changes:
+                self.db.bulk_update_mappings(AIModel, changes)
+                self.db.flush()
+                changed_ids = {change['id'] for change in changes}
+                organizations.update(
+                    org_id for model_id, org_id in zip(ids, organization_ids) if model_id in changed_ids
+                )
+            
+            scanned += len(rows)
+            updated += len(changes)
+            if progress:
+                progress(scanned, updated)
+        
+        # Bulk updates bypass the per-instance cache invalidation
+        invalidate_after_commit(self.db, *(inventory_summary_key(org_id) for org_id in organizations))
+        logger.info(f"Risk re-scoring: {scanned} models scanned, {updated} updated")
+        return {'models_scanned': scanned, 'models_updated': updated, 'organizations_affected': len(organizations)}
+    
     def update_compliance_assessment(self, model_id: int, compliance_data: Dict[str, Any]) -> AIModel:
         """Update compliance assessment for an AI model"""
         try:
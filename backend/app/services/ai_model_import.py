@@ -0,0 +1,207 @@
+"""
+AI Model Import Service
+Bulk registration of AI models from CSV or JSONL. Rows are read one at a time from the upload,
+validated, risk-scored per chunk with score_risk_batch and inserted a chunk per transaction;
+invalid rows are reported without stopping the import
+"""
+
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+import csv
+import io
+import json
+import logging
+
+from ..core.cache import invalidate_after_commit
+from ..models.ai_model import AIModel, ModelType, ModelStatus, ComplianceStatus
+from .ai_inventory_service import inventory_summary_key
+from .risk_scoring import score_risk_batch
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+# CSV cells holding lists separate items with this
+CSV_LIST_SEPARATOR = ";"
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class AIModelImportRow(BaseModel):
+    """One inventory row; the same fields as single-model registration"""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, protected_namespaces=())
+
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    version: str = Field("1.0.0", max_length=50)
+    model_type: ModelType = ModelType.MACHINE_LEARNING
+    framework: Optional[str] = Field(None, max_length=100)
+    algorithm: Optional[str] = Field(None, max_length=100)
+    input_data_types: List[str] = []
+    output_data_types: List[str] = []
+    status: ModelStatus = ModelStatus.DEVELOPMENT
+    business_purpose: Optional[str] = None
+    stakeholders: List[str] = []
+    training_data_source: Optional[str] = None
+    data_classification: str = Field("Internal", max_length=50)
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_empty_cells(cls, data: Any) -> Any:
+        # Empty CSV cells mean "not given", so defaults apply
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value not in ("", None)}
+        return data
+
+    @field_validator("input_data_types", "output_data_types", "stakeholders", mode="before")
+    @classmethod
+    def split_list_cell(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+        return value
+
+
+def import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """Import format from an explicit choice or the file extension"""
+    fmt = (requested or "").lower()
+    if not fmt and filename:
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        fmt = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension, "")
+    if fmt not in IMPORT_FORMATS:
+        raise ImportFormatError(f"Unsupported import format; use one of: {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+
+def iter_records(source: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(row number, raw record) pairs read lazily; JSONL lines that are not JSON yield the exception"""
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            # Row numbers count the header as row 1, as spreadsheets show them
+            for number, record in enumerate(csv.DictReader(text), start=2):
+                yield number, record
+        else:
+            for number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, e
+    finally:
+        text.detach()
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    ]
+
+
+class AIModelImportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def import_models(self, source: BinaryIO, fmt: str, organization_id: int, user_id: int,
+                      chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Import every valid row of source into the organization's inventory.
+        Each chunk of valid rows is committed on its own; the report lists rows that failed
+        (validation, or their chunk's insert) with their row numbers.
+        """
+        report = {"rows_read": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+        def fail(number: int, messages: List[str]):
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"row": number, "errors": messages})
+            else:
+                report["errors_truncated"] = True
+
+        chunk: List[Tuple[int, AIModelImportRow]] = []
+        for number, record in iter_records(source, fmt):
+            report["rows_read"] += 1
+            if isinstance(record, Exception):
+                fail(number, [f"row: invalid JSON ({record})"])
+                continue
+            if not isinstance(record, dict):
+                fail(number, ["row: expected an object"])
+                continue
+            try:
+                chunk.append((number, AIModelImportRow.model_validate(record)))
+            except ValidationError as e:
+                fail(number, _validation_messages(e))
+                continue
+
+            if len(chunk) >= chunk_size:
+                report["imported"] += self._insert_chunk(chunk, organization_id, user_id, fail)
+                chunk = []
+        if chunk:
+            report["imported"] += self._insert_chunk(chunk, organization_id, user_id, fail)
+
+        logger.info(
+            f"Imported {report['imported']} AI models for organization {organization_id} "
+            f"({report['failed']} of {report['rows_read']} rows failed)"
+        )
+        return report
+
+    def _insert_chunk(self, chunk: List[Tuple[int, AIModelImportRow]], organization_id: int, user_id: int,
+                      fail) -> int:
+        rows = [row for _, row in chunk]
+        scores = score_risk_batch(
+            [row.model_type for row in rows],
+            [row.data_classification for row in rows],
+            [row.status for row in rows],
+            [row.business_purpose for row in rows]
+        )
+        now = datetime.utcnow()
+        values = [
+            {
+                "name": row.name,
+                "description": row.description,
+                "version": row.version,
+                "model_type": row.model_type,
+                "framework": row.framework,
+                "algorithm": row.algorithm,
+                "input_data_types": json.dumps(row.input_data_types),
+                "output_data_types": json.dumps(row.output_data_types),
+                "status": row.status,
+                "business_purpose": row.business_purpose,
+                "stakeholders": json.dumps(row.stakeholders),
+                "training_data_source": row.training_data_source,
+                "data_classification": row.data_classification,
+                "risk_score": float(scores["risk_score"][index]),
+                "bias_risk": float(scores["bias_risk"][index]),
+                "privacy_risk": float(scores["privacy_risk"][index]),
+                "security_risk": float(scores["security_risk"][index]),
+                "risk_level": scores["risk_level"][index],
+                "compliance_status": ComplianceStatus.NOT_ASSESSED,
+                "compliance_score": 0.0,
+                "created_date": now,
+                "last_updated": now,
+                "organization_id": organization_id,
+                "created_by": user_id
+            }
+            for index, row in enumerate(rows)
+        ]
+
+        try:
+            self.db.execute(insert(AIModel.__table__), values)
+            # Core inserts bypass the per-instance cache invalidation
+            invalidate_after_commit(self.db, inventory_summary_key(organization_id))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"AI model import chunk failed: {e}")
+            for number, _ in chunk:
+                fail(number, [f"row: not saved, its batch failed ({e.__class__.__name__})"])
+            return 0
+        return len(values)
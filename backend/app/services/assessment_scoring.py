@@ -0,0 +1,496 @@
+"""
+ISO 42001 Assessment Scoring Engine
+Maintains running weighted score sums per control, category and NIST function
+so that a single question answer is applied as an O(1) delta
+"""
+
+from typing import List, Dict, Any, Optional, Iterable
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import func, select
+import copy
+import numpy as np
+
+from ..models.iso_control import QuestionResponse, AssessmentResponse, EvidenceFile, ResponseValue
+from ..models.assessment import Assessment
+from ..data.iso_42001_controls import NIST_FUNCTION_WEIGHTS
+from .control_catalog import get_control_catalog, CatalogControl, CatalogQuestion
+from .scoring_kernel import ScoringKernel, STATUS_NAMES
+
+# Tolerance used when comparing running totals against a full recomputation
+CONSISTENCY_TOLERANCE = 1e-6
+
+# Assessments scored per kernel pass during portfolio-wide rescoring
+RESCORE_BATCH_SIZE = 500
+
+
+def evidence_count_subquery():
+    """Evidence file count per QuestionResponse row, correlated so it only probes that response's files"""
+    return select(func.count(EvidenceFile.id)).where(
+        EvidenceFile.question_response_id == QuestionResponse.id
+    ).correlate(QuestionResponse).scalar_subquery()
+
+
+def _empty_bucket() -> Dict[str, float]:
+    return {
+        "score_sum": 0.0,       # Plain sum of control compliance scores
+        "weighted_score": 0.0,  # Sum of compliance score * bucket weight
+        "weighted_risk": 0.0,   # Sum of risk score * bucket weight
+        "weight": 0.0,          # Sum of bucket weights
+        "completed": 0,         # Controls with status "completed"
+        "controls": 0           # Controls in the bucket
+    }
+
+
+def _empty_control_sums() -> Dict[str, float]:
+    return {"weighted": 0.0, "weight": 0.0, "answered": 0, "responses": 0}
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {"overall": _empty_bucket(), "category": {}, "nist": {}}
+
+
+class AssessmentScoringEngine:
+    """Incremental scoring for ISO 42001 assessments with a full-recompute fallback"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def catalog(self):
+        return get_control_catalog(self.db)
+
+    def lock_assessment(self, assessment_id: int) -> Optional[Assessment]:
+        """
+        Load an assessment under a row lock held until commit (SELECT ... FOR UPDATE).
+        Every writer of an assessment's running totals takes this lock before reading them,
+        so concurrent answers on one assessment apply their deltas one after the other.
+        """
+        return self.db.query(Assessment).filter(
+            Assessment.id == assessment_id
+        ).with_for_update().populate_existing().first()
+
+    # ------------------------------------------------------------------
+    # Scoring formulas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def question_score(response_value: Optional[ResponseValue], requires_evidence: bool,
+                       has_evidence: bool) -> Optional[float]:
+        """Score a single question response; None means the response is not scored (N/A or missing)"""
+        if response_value is None or response_value == ResponseValue.NOT_APPLICABLE:
+            return None
+        if response_value == ResponseValue.YES:
+            if requires_evidence and not has_evidence:
+                return 75.0  # Reduced score for missing evidence
+            return 100.0
+        if response_value == ResponseValue.PARTIAL:
+            return 50.0
+        return 0.0  # NO
+
+    @staticmethod
+    def _status_for(completion_percentage: float) -> str:
+        if completion_percentage == 100:
+            return "completed"
+        elif completion_percentage > 0:
+            return "in_progress"
+        return "not_started"
+
+    def _refresh_control_scores(self, assessment_response: AssessmentResponse, control: CatalogControl):
+        """Derive control scores from the running sums stored on the row"""
+        weight_total = assessment_response.score_weight_total or 0.0
+        compliance_score = (assessment_response.score_weighted_sum / weight_total) if weight_total > 0 else 0
+        completion_percentage = (
+            (assessment_response.answered_questions / assessment_response.response_count) * 100
+            if assessment_response.response_count else 0
+        )
+
+        assessment_response.compliance_score = compliance_score
+        assessment_response.completion_percentage = completion_percentage
+        assessment_response.risk_score = min((100 - compliance_score) * control.nist_weight, 100)  # Cap at 100
+        assessment_response.status = self._status_for(completion_percentage)
+
+    # ------------------------------------------------------------------
+    # Incremental path
+    # ------------------------------------------------------------------
+
+    def apply_question_change(self, assessment_id: int, question: CatalogQuestion,
+                              old_value: Optional[ResponseValue], new_value: ResponseValue,
+                              has_evidence: bool, is_new_response: bool) -> Optional[AssessmentResponse]:
+        """
+        Apply the delta of one question response changing from old_value to new_value.
+        Falls back to a full recomputation when the assessment has no running totals yet.
+        """
+        assessment = self.lock_assessment(assessment_id)
+        if not assessment:
+            return None
+        if assessment.score_totals is None:
+            self.recalculate_assessment(assessment_id)
+            return self._get_assessment_response(assessment_id, question.control_id)
+
+        control = self.catalog.control(question.control_id)
+        assessment_response = self._get_assessment_response(assessment_id, question.control_id)
+        if not control or not assessment_response:
+            return None
+
+        before = self._control_snapshot(assessment_response)
+
+        weight = question.weight or 0.0
+        old_score = self.question_score(old_value, question.requires_evidence, has_evidence)
+        new_score = self.question_score(new_value, question.requires_evidence, has_evidence)
+
+        if old_score is not None:
+            assessment_response.score_weighted_sum = (assessment_response.score_weighted_sum or 0.0) - old_score * weight
+            assessment_response.score_weight_total = (assessment_response.score_weight_total or 0.0) - weight
+            assessment_response.answered_questions = (assessment_response.answered_questions or 0) - 1
+        if new_score is not None:
+            assessment_response.score_weighted_sum = (assessment_response.score_weighted_sum or 0.0) + new_score * weight
+            assessment_response.score_weight_total = (assessment_response.score_weight_total or 0.0) + weight
+            assessment_response.answered_questions = (assessment_response.answered_questions or 0) + 1
+        if is_new_response:
+            assessment_response.response_count = (assessment_response.response_count or 0) + 1
+
+        self._refresh_control_scores(assessment_response, control)
+
+        totals = copy.deepcopy(assessment.score_totals)
+        self._shift_control(totals, control, before, sign=-1)
+        self._shift_control(totals, control, self._control_snapshot(assessment_response), sign=1)
+        self._apply_totals(assessment, totals)
+
+        return assessment_response
+
+    @staticmethod
+    def _control_snapshot(assessment_response: AssessmentResponse) -> Dict[str, Any]:
+        return {
+            "compliance_score": assessment_response.compliance_score or 0.0,
+            "risk_score": assessment_response.risk_score or 0.0,
+            "completed": assessment_response.status == "completed"
+        }
+
+    @staticmethod
+    def _shift_control(totals: Dict[str, Any], control: CatalogControl,
+                       snapshot: Dict[str, Any], sign: int, count: int = 0):
+        """Add (sign=1) or remove (sign=-1) one control's contribution to the totals"""
+        targets = [
+            (totals["overall"], control.combined_weight),
+            (totals["category"].setdefault(control.category, _empty_bucket()), control.combined_weight),
+            (totals["nist"].setdefault(control.nist_function, _empty_bucket()), control.weight)
+        ]
+        for bucket, weight in targets:
+            bucket["score_sum"] += sign * snapshot["compliance_score"]
+            bucket["weighted_score"] += sign * snapshot["compliance_score"] * weight
+            bucket["weighted_risk"] += sign * snapshot["risk_score"] * weight
+            bucket["weight"] += count * weight
+            bucket["completed"] += sign if snapshot["completed"] else 0
+            bucket["controls"] += count
+
+    def _apply_totals(self, assessment: Assessment, totals: Dict[str, Any]):
+        """Write assessment-level scores derived from the running totals"""
+        assessment.score_totals = totals
+        flag_modified(assessment, "score_totals")
+
+        for field, value in self.assessment_scores(totals).items():
+            setattr(assessment, field, value)
+
+    @staticmethod
+    def assessment_scores(totals: Dict[str, Any]) -> Dict[str, Any]:
+        """Assessment column values derived from running totals (only the columns that change)"""
+        scores = {}
+        overall = totals["overall"]
+        if overall["weight"] > 0:
+            scores["overall_compliance_score"] = overall["weighted_score"] / overall["weight"]
+            scores["overall_risk_score"] = overall["weighted_risk"] / overall["weight"]
+
+        completion_percentage = (
+            (overall["completed"] / overall["controls"]) * 100 if overall["controls"] else 0
+        )
+        scores["completion_percentage"] = completion_percentage
+
+        function_scores = {}
+        for function in NIST_FUNCTION_WEIGHTS:
+            bucket = totals["nist"].get(function)
+            function_scores[function] = (
+                bucket["weighted_score"] / bucket["weight"] if bucket and bucket["weight"] > 0 else 0
+            )
+        scores["govern_score"] = function_scores.get("govern", 0)
+        scores["map_score"] = function_scores.get("map", 0)
+        scores["measure_score"] = function_scores.get("measure", 0)
+        scores["manage_score"] = function_scores.get("manage", 0)
+
+        if completion_percentage == 100:
+            scores["status"] = "completed"
+        elif completion_percentage > 0:
+            scores["status"] = "in_progress"
+        return scores
+
+    def _get_assessment_response(self, assessment_id: int, control_id: int) -> Optional[AssessmentResponse]:
+        # Re-read under the assessment lock: the identity map may hold sums from before another writer committed
+        return self.db.query(AssessmentResponse).filter(
+            AssessmentResponse.assessment_id == assessment_id,
+            AssessmentResponse.control_id == control_id
+        ).populate_existing().first()
+
+    # ------------------------------------------------------------------
+    # Full recomputation
+    # ------------------------------------------------------------------
+
+    def _question_rows(self, assessment_id: int, control_ids: Optional[Iterable[int]] = None):
+        """Fetch every stored response for an assessment with its evidence count in one statement"""
+        query = self.db.query(
+            QuestionResponse.question_id,
+            QuestionResponse.response_value,
+            evidence_count_subquery()
+        ).filter(QuestionResponse.assessment_id == assessment_id)
+
+        if control_ids is not None:
+            catalog = self.catalog
+            controls = [catalog.control(control_id) for control_id in control_ids]
+            question_ids = [
+                question.id for control in controls if control for question in control.questions
+            ]
+            query = query.filter(QuestionResponse.question_id.in_(question_ids))
+
+        return query.all()
+
+    def _control_sums(self, assessment_id: int,
+                      control_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, float]]:
+        """Aggregate question responses into per-control running sums"""
+        catalog = self.catalog
+        sums: Dict[int, Dict[str, float]] = {}
+        for question_id, response_value, evidence_count in self._question_rows(assessment_id, control_ids):
+            question = catalog.question(question_id)
+            if question is None:
+                continue
+            entry = sums.setdefault(question.control_id, _empty_control_sums())
+            entry["responses"] += 1
+            score = self.question_score(response_value, question.requires_evidence, evidence_count > 0)
+            if score is not None:
+                entry["weighted"] += score * question.weight
+                entry["weight"] += question.weight
+                entry["answered"] += 1
+        return sums
+
+    def recalculate_controls(self, assessment_id: int, control_ids: Optional[Iterable[int]] = None):
+        """Rebuild control running sums from the stored question responses"""
+        if control_ids is not None:
+            control_ids = list(control_ids)
+        sums = self._control_sums(assessment_id, control_ids)
+
+        query = self.db.query(AssessmentResponse).filter(AssessmentResponse.assessment_id == assessment_id)
+        if control_ids is not None:
+            query = query.filter(AssessmentResponse.control_id.in_(control_ids))
+
+        catalog = self.catalog
+        for assessment_response in query.all():
+            control = catalog.control(assessment_response.control_id)
+            entry = sums.get(assessment_response.control_id)
+            if not entry:
+                # No responses - reset to the untouched defaults
+                assessment_response.score_weighted_sum = 0.0
+                assessment_response.score_weight_total = 0.0
+                assessment_response.answered_questions = 0
+                assessment_response.response_count = 0
+                assessment_response.compliance_score = 0.0
+                assessment_response.completion_percentage = 0.0
+                assessment_response.risk_score = 0.0
+                assessment_response.status = "not_started"
+                continue
+            assessment_response.score_weighted_sum = entry["weighted"]
+            assessment_response.score_weight_total = entry["weight"]
+            assessment_response.answered_questions = entry["answered"]
+            assessment_response.response_count = entry["responses"]
+            if control:
+                self._refresh_control_scores(assessment_response, control)
+
+    def rebuild_totals(self, assessment_id: int) -> Optional[Dict[str, Any]]:
+        """Rebuild the assessment-level running totals from its control responses"""
+        assessment = self.lock_assessment(assessment_id)
+        if not assessment:
+            return None
+
+        totals = self._compute_totals(assessment_id)
+        if totals["overall"]["controls"] == 0:
+            return totals
+        self._apply_totals(assessment, totals)
+        return totals
+
+    def _compute_totals(self, assessment_id: int) -> Dict[str, Any]:
+        control_responses = self.db.query(AssessmentResponse).filter(
+            AssessmentResponse.assessment_id == assessment_id
+        ).all()
+
+        catalog = self.catalog
+        totals = _empty_totals()
+        for assessment_response in control_responses:
+            control = catalog.control(assessment_response.control_id)
+            if control is None:
+                continue
+            self._shift_control(totals, control, self._control_snapshot(assessment_response), sign=1, count=1)
+        return totals
+
+    def recalculate_assessment(self, assessment_id: int, control_ids: Optional[Iterable[int]] = None):
+        """Full recomputation: rebuild control sums (optionally only some controls) and assessment totals"""
+        self.recalculate_controls(assessment_id, control_ids)
+        self.db.flush()
+        self.rebuild_totals(assessment_id)
+
+    # ------------------------------------------------------------------
+    # Portfolio-wide rescoring
+    # ------------------------------------------------------------------
+
+    def rescore_assessments(self, assessment_ids: Optional[Iterable[int]] = None,
+                            batch_size: int = RESCORE_BATCH_SIZE) -> int:
+        """
+        Recompute control and assessment scores for many assessments with the vectorized kernel
+        (e.g. after CATEGORY_WEIGHTS or NIST_FUNCTION_WEIGHTS change) and write them back in bulk.
+        Returns the number of assessments rescored; the caller commits.
+        """
+        if assessment_ids is None:
+            assessment_ids = [row[0] for row in self.db.query(Assessment.id).order_by(Assessment.id).all()]
+        else:
+            assessment_ids = sorted(set(assessment_ids))
+
+        kernel = ScoringKernel(self.catalog)
+        rescored = 0
+        for start in range(0, len(assessment_ids), batch_size):
+            rescored += self._rescore_batch(kernel, assessment_ids[start:start + batch_size])
+            self.db.flush()
+        return rescored
+
+    def _rescore_batch(self, kernel: ScoringKernel, assessment_ids: List[int]) -> int:
+        # Hold answers on the batch back until the recomputed scores are committed
+        self.db.query(Assessment.id).filter(Assessment.id.in_(assessment_ids)).with_for_update().all()
+
+        responses = self.db.query(
+            QuestionResponse.assessment_id,
+            QuestionResponse.question_id,
+            QuestionResponse.response_value,
+            evidence_count_subquery()
+        ).filter(QuestionResponse.assessment_id.in_(assessment_ids)).all()
+
+        control_rows = self.db.query(
+            AssessmentResponse.id, AssessmentResponse.assessment_id, AssessmentResponse.control_id
+        ).filter(AssessmentResponse.assessment_id.in_(assessment_ids)).all()
+
+        result = kernel.score(
+            np.array(assessment_ids, dtype=np.int64),
+            np.array([row[0] for row in responses], dtype=np.int64),
+            np.array([row[1] for row in responses], dtype=np.int64),
+            kernel.encode_responses([row[2] for row in responses]),
+            np.array([row[3] > 0 for row in responses], dtype=bool),
+            np.array([row[1] for row in control_rows], dtype=np.int64),
+            np.array([row[2] for row in control_rows], dtype=np.int64)
+        )
+
+        row_ids = [row[0] for row, scored in zip(control_rows, result["rows"].tolist()) if scored]
+        control_updates = [
+            {
+                "id": row_id,
+                "score_weighted_sum": weighted,
+                "score_weight_total": weight,
+                "answered_questions": answered,
+                "response_count": responses_count,
+                "compliance_score": compliance,
+                "completion_percentage": completion,
+                "risk_score": risk,
+                "status": STATUS_NAMES[status]
+            }
+            for row_id, weighted, weight, answered, responses_count, compliance, completion, risk, status in zip(
+                row_ids,
+                result["weighted_sum"].tolist(), result["weight_total"].tolist(),
+                result["answered"].tolist(), result["responses"].tolist(),
+                result["compliance"].tolist(), result["completion"].tolist(),
+                result["risk"].tolist(), result["status"].tolist()
+            )
+        ]
+
+        assessment_updates = [
+            dict(self.assessment_scores(totals), id=assessment_id, score_totals=totals)
+            for assessment_id, totals in zip(result["assessment_ids"].tolist(), kernel.totals(result))
+            if totals["overall"]["controls"] > 0
+        ]
+
+        if control_updates:
+            self.db.bulk_update_mappings(AssessmentResponse, control_updates)
+        if assessment_updates:
+            self.db.bulk_update_mappings(Assessment, assessment_updates)
+        return len(assessment_updates)
+
+    # ------------------------------------------------------------------
+    # Consistency checking
+    # ------------------------------------------------------------------
+
+    def drifted_assessments(self, assessment_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """Assessments whose stored running totals no longer match a recomputation"""
+        if assessment_ids is None:
+            assessment_ids = [row[0] for row in self.db.query(Assessment.id).order_by(Assessment.id).all()]
+        return [assessment_id for assessment_id in assessment_ids if self.check_consistency(assessment_id)]
+
+    def repair_drift(self, assessment_ids: Optional[Iterable[int]] = None,
+                     batch_size: int = RESCORE_BATCH_SIZE) -> List[int]:
+        """Rescore every assessment whose running totals drifted; returns their ids. The caller commits."""
+        drifted = self.drifted_assessments(assessment_ids)
+        if drifted:
+            self.rescore_assessments(drifted, batch_size)
+        return drifted
+
+    def check_consistency(self, assessment_id: int, tolerance: float = CONSISTENCY_TOLERANCE) -> List[Dict[str, Any]]:
+        """
+        Compare the stored running totals against a fresh recomputation.
+        Returns a list of discrepancies; an empty list means the totals are consistent.
+        """
+        discrepancies = []
+
+        assessment = self.db.query(Assessment).filter(Assessment.id == assessment_id).first()
+        if not assessment:
+            raise Exception("Assessment not found")
+
+        expected_controls = self._control_sums(assessment_id)
+
+        control_responses = self.db.query(AssessmentResponse).filter(
+            AssessmentResponse.assessment_id == assessment_id
+        ).all()
+        for cr in control_responses:
+            expected = expected_controls.get(cr.control_id, _empty_control_sums())
+            stored = {
+                "weighted": cr.score_weighted_sum or 0.0,
+                "weight": cr.score_weight_total or 0.0,
+                "answered": cr.answered_questions or 0,
+                "responses": cr.response_count or 0
+            }
+            for key, value in expected.items():
+                if abs(stored[key] - value) > tolerance:
+                    discrepancies.append({
+                        "scope": "control",
+                        "control_id": cr.control_id,
+                        "field": key,
+                        "stored": stored[key],
+                        "expected": value
+                    })
+
+        stored_totals = assessment.score_totals or _empty_totals()
+        expected_totals = self._compute_totals(assessment_id)
+        for scope in ("category", "nist"):
+            for key in set(expected_totals[scope]) | set(stored_totals.get(scope, {})):
+                self._compare_bucket(
+                    discrepancies, f"{scope}:{key}",
+                    stored_totals.get(scope, {}).get(key, _empty_bucket()),
+                    expected_totals[scope].get(key, _empty_bucket()),
+                    tolerance
+                )
+        self._compare_bucket(discrepancies, "overall", stored_totals.get("overall", _empty_bucket()),
+                             expected_totals["overall"], tolerance)
+
+        return discrepancies
+
+    @staticmethod
+    def _compare_bucket(discrepancies: List[Dict[str, Any]], scope: str, stored: Dict[str, float],
+                        expected: Dict[str, float], tolerance: float):
+        for key, value in expected.items():
+            if abs(stored.get(key, 0) - value) > tolerance:
+                discrepancies.append({
+                    "scope": scope,
+                    "field": key,
+                    "stored": stored.get(key, 0),
+                    "expected": value
+                })
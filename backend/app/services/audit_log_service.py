@@ -0,0 +1,421 @@
+"""
+Audit Log Service
+Monthly partitioned audit trail storage: partition-aware queries, partition maintenance and
+retention that archives whole months to compressed NDJSON before dropping them.
+
+PostgreSQL: audit_logs is a RANGE ("timestamp") partitioned table with one partition per month,
+so time-bounded queries prune partitions and retention is DETACH + DROP.
+SQLite: audit_logs holds the current month; completed months are moved to audit_logs_YYYY_MM tables
+and queries union the tables overlapping the requested range.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import Column, Index, MetaData, String, Table, and_, insert, delete, func, select, text, \
+    type_coerce, union_all
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+
+from ..core.config import settings
+from ..core.storage import get_storage
+from ..models.audit_log import AuditBlob, AuditLog, blob_refs, expand_values, load_blobs
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = AuditLog.__table__
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_PATTERN = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+ARCHIVE_BATCH_SIZE = 5000
+# A blob must have gone unreferenced this long before it is purged, so a write reusing it is never cut short
+BLOB_GRACE_PERIOD = timedelta(hours=1)
+
+
+class AuditPartition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        return (start is None or self.end > _utc(start)) and (end is None or self.start < _utc(end))
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def month_partition(value: datetime) -> AuditPartition:
+    value = _utc(value)
+    start = datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+    end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+    return AuditPartition(f"audit_logs_{start:%Y_%m}", start, end)
+
+
+def _parse_partition(name: str) -> Optional[AuditPartition]:
+    match = PARTITION_PATTERN.match(name)
+    if not match:
+        return None
+    return month_partition(datetime(int(match.group(1)), int(match.group(2)), 1))
+
+
+def _partition_table(name: str) -> Table:
+    """Table object for one month, with the audit_logs columns and no cross-table constraints"""
+    table = Table(
+        name, MetaData(),
+        *[Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in AUDIT_TABLE.columns]
+    )
+    Index(f"ix_{name}_org_timestamp", table.c.organization_id, table.c.timestamp)
+    Index(f"ix_{name}_timestamp", table.c.timestamp)
+    return table
+
+
+def _bound(conn: Connection, value: datetime):
+    """Time bound comparable with stored timestamps (SQLite stores naive 'YYYY-MM-DD HH:MM:SS' text)"""
+    value = _utc(value)
+    if conn.dialect.name == "sqlite":
+        return type_coerce(value.strftime("%Y-%m-%d %H:%M:%S"), String)
+    return value
+
+
+def list_partitions(conn: Connection) -> List[AuditPartition]:
+    """Monthly partitions (PostgreSQL) or month tables (SQLite), oldest first"""
+    if conn.dialect.name == "postgresql":
+        names = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'audit_logs'"
+        )).scalars().all()
+    else:
+        names = conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'audit_logs_%'"
+        )).scalars().all()
+    partitions = [partition for partition in map(_parse_partition, names) if partition]
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+class AuditLogService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def query_logs(self, organization_id: Optional[int] = None, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None, action: Optional[str] = None,
+                   entity_type: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Audit records in [start, end), newest first.
+        Always pass a time range for large trails: it is what prunes partitions.
+        """
+        conn = self.db.connection()
+        statement = logs_statement(conn, organization_id, start, end, action, entity_type).limit(limit)
+        rows = [dict(row._mapping) for row in conn.execute(statement)]
+        return _expand_rows(rows, load_blobs(self.db, rows))
+
+    def export_chunks(self, organization_id: Optional[int] = None, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None, action: Optional[str] = None,
+                      entity_type: Optional[str] = None,
+                      batch_size: int = ARCHIVE_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Audit records in [start, end), oldest first, streamed from a server-side cursor in chunks"""
+        conn = self.db.connection()
+        statement = logs_statement(conn, organization_id, start, end, action, entity_type, newest_first=False)
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+        for chunk in result.partitions():
+            rows = [dict(row._mapping) for row in chunk]
+            yield _expand_rows(rows, load_blobs(self.db, rows))
+
+
+def logs_statement(conn: Connection, organization_id: Optional[int] = None, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None, action: Optional[str] = None,
+                   entity_type: Optional[str] = None, newest_first: bool = True):
+    """Audit records matching the filters across the partitions overlapping [start, end)"""
+
+    def filtered(table):
+        conditions = []
+        if organization_id is not None:
+            conditions.append(table.c.organization_id == organization_id)
+        if start is not None:
+            conditions.append(table.c.timestamp >= _bound(conn, start))
+        if end is not None:
+            conditions.append(table.c.timestamp < _bound(conn, end))
+        if action is not None:
+            conditions.append(table.c.action == action)
+        if entity_type is not None:
+            conditions.append(table.c.entity_type == entity_type)
+        return select(table).where(*conditions)
+
+    if conn.dialect.name == "postgresql":
+        # The planner prunes partitions from the timestamp bounds
+        source = AUDIT_TABLE
+        statement = filtered(AUDIT_TABLE)
+    else:
+        tables = [AUDIT_TABLE] + [
+            _partition_table(partition.name)
+            for partition in list_partitions(conn) if partition.overlaps(start, end)
+        ]
+        source = union_all(*[filtered(table) for table in tables]).subquery()
+        statement = select(source)
+
+    if newest_first:
+        return statement.order_by(source.c.timestamp.desc(), source.c.id.desc())
+    return statement.order_by(source.c.timestamp, source.c.id)
+
+
+def _expand_rows(rows: List[Dict[str, Any]], blobs: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Resolve blob references and patches so rows carry their full old/new values"""
+    for row in rows:
+        row["old_values"], row["new_values"] = expand_values(row["old_values"], row["new_values"], blobs)
+    return rows
+
+
+def ensure_audit_partitions(engine: Engine, now: Optional[datetime] = None):
+    """
+    PostgreSQL: convert audit_logs to a partitioned table if needed and create the partitions
+    for the current and next AUDIT_PARTITION_PREMAKE_MONTHS months.
+    SQLite: move completed months out of audit_logs into their month tables.
+    """
+    now = _utc(now or datetime.now(timezone.utc))
+    if engine.dialect.name == "postgresql":
+        _ensure_pg_partitions(engine, now)
+    elif engine.dialect.name == "sqlite":
+        _roll_sqlite_months(engine, now)
+
+
+def _ensure_pg_partitions(engine: Engine, now: datetime):
+    with engine.begin() as conn:
+        partitioned = conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = 'audit_logs'"
+        )).scalar()
+        if not partitioned:
+            _convert_pg_table(conn)
+
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF audit_logs DEFAULT"))
+
+    _drain_pg_default(engine)
+
+    month = month_partition(now)
+    for _ in range(settings.AUDIT_PARTITION_PREMAKE_MONTHS + 1):
+        try:
+            with engine.begin() as conn:
+                _create_pg_partition(conn, month)
+        except SQLAlchemyError as e:
+            # Rows for this month landed in the default partition since the drain; the next run moves them
+            logger.warning(f"Could not create audit partition {month.name}: {e}")
+        month = month_partition(month.end)
+
+
+def _drain_pg_default(engine: Engine):
+    """
+    Move rows out of the default partition into their monthly partitions, so retention
+    (which only sees monthly partitions) archives and drops them like any other month.
+    A month's partition cannot be created while the default holds rows for it, so the
+    default is detached for the move; inserts into audit_logs wait on the lock meanwhile.
+    """
+    with engine.connect() as conn:
+        months = conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', \"timestamp\" AT TIME ZONE 'UTC') FROM {DEFAULT_PARTITION} "
+            "WHERE \"timestamp\" IS NOT NULL"
+        )).scalars().all()
+
+    columns = ", ".join(f'"{c.name}"' for c in AUDIT_TABLE.columns)
+    for month in sorted(months):
+        partition = month_partition(month)
+        in_month = (
+            f"\"timestamp\" >= '{partition.start.isoformat()}' AND \"timestamp\" < '{partition.end.isoformat()}'"
+        )
+        # One month per transaction keeps each move bounded
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {DEFAULT_PARTITION}"))
+            _create_pg_partition(conn, partition)
+            moved = conn.execute(text(
+                f"INSERT INTO {partition.name} ({columns}) SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_month}"
+            )).rowcount
+            conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+            conn.execute(text(f"ALTER TABLE audit_logs ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info(f"Moved {moved} audit records from {DEFAULT_PARTITION} to {partition.name}")
+
+
+def _create_pg_partition(conn: Connection, partition: AuditPartition, parent: str = "audit_logs"):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    ))
+
+
+def _convert_pg_table(conn: Connection):
+    """Rebuild a plain audit_logs table as a monthly partitioned one, keeping its rows and id sequence"""
+    logger.info("Converting audit_logs to a partitioned table...")
+    columns = ", ".join(f'"{c.name}"' for c in AUDIT_TABLE.columns)
+    values = ", ".join(
+        'COALESCE("timestamp", now())' if c.name == "timestamp" else f'"{c.name}"' for c in AUDIT_TABLE.columns
+    )
+
+    conn.execute(text("LOCK TABLE audit_logs IN ACCESS EXCLUSIVE MODE"))
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence('audit_logs', 'id')")).scalar()
+
+    # The partition key has to be part of the primary key
+    conn.execute(text(
+        'CREATE TABLE audit_logs_partitioned (LIKE audit_logs INCLUDING DEFAULTS, PRIMARY KEY (id, "timestamp")) '
+        'PARTITION BY RANGE ("timestamp")'
+    ))
+    conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF audit_logs_partitioned DEFAULT"))
+
+    months = conn.execute(text(
+        "SELECT DISTINCT date_trunc('month', \"timestamp\" AT TIME ZONE 'UTC') FROM audit_logs "
+        "WHERE \"timestamp\" IS NOT NULL"
+    )).scalars().all()
+    for month in months:
+        _create_pg_partition(conn, month_partition(month), parent="audit_logs_partitioned")
+
+    conn.execute(text(f"INSERT INTO audit_logs_partitioned ({columns}) SELECT {values} FROM audit_logs"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    conn.execute(text("DROP TABLE audit_logs"))
+    conn.execute(text("ALTER TABLE audit_logs_partitioned RENAME TO audit_logs"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY audit_logs.id"))
+
+    # Indexes on the parent cascade to every partition
+    for index in AUDIT_TABLE.indexes:
+        index.create(bind=conn, checkfirst=True)
+    logger.info(f"✅ audit_logs partitioned ({len(months)} monthly partitions)")
+
+
+def _roll_sqlite_months(engine: Engine, now: datetime):
+    current = month_partition(now)
+    with engine.connect() as conn:
+        months = conn.execute(
+            select(func.substr(AUDIT_TABLE.c.timestamp, 1, 7)).where(
+                AUDIT_TABLE.c.timestamp < _bound(conn, current.start)
+            ).distinct()
+        ).scalars().all()
+
+    for month in sorted(months):
+        partition = month_partition(datetime.strptime(month, "%Y-%m"))
+        table = _partition_table(partition.name)
+        with engine.begin() as conn:
+            in_month = and_(
+                AUDIT_TABLE.c.timestamp >= _bound(conn, partition.start),
+                AUDIT_TABLE.c.timestamp < _bound(conn, partition.end)
+            )
+            # One month per transaction keeps each DELETE bounded
+            table.create(conn, checkfirst=True)
+            moved = conn.execute(insert(table).from_select(
+                [c.name for c in AUDIT_TABLE.columns], select(AUDIT_TABLE).where(in_month)
+            )).rowcount
+            conn.execute(delete(AUDIT_TABLE).where(in_month))
+        logger.info(f"Moved {moved} audit records to {partition.name}")
+
+
+def purge_expired_audit_logs(engine: Engine, storage=None, now: Optional[datetime] = None,
+                             dry_run: bool = False) -> List[Dict[str, Any]]:
+    """
+    Archive and drop every monthly partition that ended before the retention cutoff
+    (AUDIT_LOG_RETENTION_DAYS). A partition is only dropped once its archive is stored in full.
+    Rows that landed in the PostgreSQL default partition are first moved into their months.
+    """
+    now = _utc(now or datetime.now(timezone.utc))
+    cutoff = now - timedelta(days=settings.AUDIT_LOG_RETENTION_DAYS)
+    ensure_audit_partitions(engine, now)
+
+    with engine.connect() as conn:
+        expired = [partition for partition in list_partitions(conn) if partition.end <= cutoff]
+    if dry_run:
+        return [{"partition": partition.name, "archived_to": None, "rows": None} for partition in expired]
+
+    storage = storage or get_storage(
+        settings.AUDIT_ARCHIVE_STORAGE, settings.AUDIT_ARCHIVE_DIR, s3_prefix="archives/audit_logs"
+    )
+    purged = []
+    for partition in expired:
+        key = f"{partition.name}.ndjson.gz"
+        rows = _archive_partition(engine, partition, storage, key)
+        _drop_partition(engine, partition)
+        logger.info(f"Archived {rows} audit records from {partition.name} to {storage.describe(key)}")
+        purged.append({"partition": partition.name, "archived_to": storage.describe(key), "rows": rows})
+    if purged:
+        blobs = purge_unreferenced_blobs(engine, now)
+        logger.info(f"Deleted {blobs} audit blobs no longer referenced")
+    return purged
+
+
+def purge_unreferenced_blobs(engine: Engine, now: Optional[datetime] = None,
+                             batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Delete audit_blobs no audit record references any more, in batches of batch_size.
+    References are collected from audit_logs and every month table in one streamed pass; a blob
+    reused since then (or within BLOB_GRACE_PERIOD of it) has a newer last_referenced_at and is kept.
+    """
+    cutoff = _utc(now or datetime.now(timezone.utc)) - BLOB_GRACE_PERIOD
+    blobs = AuditBlob.__table__
+    last_referenced = func.coalesce(blobs.c.last_referenced_at, blobs.c.created_at)
+
+    with engine.connect() as conn:
+        tables = [AUDIT_TABLE]
+        if conn.dialect.name != "postgresql":
+            # PostgreSQL partitions are read through the audit_logs parent
+            tables += [_partition_table(partition.name) for partition in list_partitions(conn)]
+        referenced = set()
+        for table in tables:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                select(table.c.old_values, table.c.new_values)
+            )
+            for old_values, new_values in result:
+                referenced |= blob_refs(old_values) | blob_refs(new_values)
+        bound = _bound(conn, cutoff)
+
+    deleted = 0
+    after = ""
+    while True:
+        with engine.begin() as conn:
+            hashes = conn.execute(
+                select(blobs.c.hash).where(blobs.c.hash > after, last_referenced < bound)
+                .order_by(blobs.c.hash).limit(batch_size)
+            ).scalars().all()
+            if not hashes:
+                return deleted
+            unreferenced = [digest for digest in hashes if digest not in referenced]
+            if unreferenced:
+                deleted += conn.execute(
+                    delete(blobs).where(blobs.c.hash.in_(unreferenced), last_referenced < bound)
+                ).rowcount
+        after = hashes[-1]
+
+
+def _archive_partition(engine: Engine, partition: AuditPartition, storage, key: str) -> int:
+    table = _partition_table(partition.name)
+    fd, path = tempfile.mkstemp(suffix=".ndjson.gz")
+    os.close(fd)
+    try:
+        rows = 0
+        with gzip.open(path, "wt", encoding="utf-8") as archive, engine.connect() as conn:
+            # Server-side cursor: the month is streamed, never held in memory
+            result = conn.execution_options(stream_results=True, yield_per=ARCHIVE_BATCH_SIZE).execute(
+                select(table).order_by(table.c.id)
+            )
+            with Session(bind=engine) as session:
+                for chunk in result.partitions():
+                    # Archives are self-contained: blob references are resolved
+                    chunk = [dict(row._mapping) for row in chunk]
+                    for record in _expand_rows(chunk, load_blobs(session, chunk)):
+                        archive.write(json.dumps(record, default=str, separators=(",", ":")))
+                        archive.write("\n")
+                    rows += len(chunk)
+
+        storage.put_file(key, path)
+        if storage.size(key) != os.path.getsize(path):
+            raise IOError(f"Archive {storage.describe(key)} is incomplete; keeping {partition.name}")
+        return rows
+    finally:
+        os.unlink(path)
+
+
+def _drop_partition(engine: Engine, partition: AuditPartition):
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {partition.name}"))
+        conn.execute(text(f"DROP TABLE {partition.name}"))
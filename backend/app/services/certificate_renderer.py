@@ -0,0 +1,227 @@
+"""
+Certificate Renderer
+Certificate PDFs with ReportLab. The static page (border, seal, headings, labels) is drawn once per
+process and replayed into each document as its recorded content stream, so a certificate only costs
+the variable fields. Batches are rendered in a process pool and stored content-addressed.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from ..core.config import settings
+from ..core.storage import get_storage
+from .evidence_storage import INCOMING_DIR, blob_key
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = landscape(A4)
+# Every font the page uses, selected in this order in every document so the recorded
+# background's font resource names (/F1, /F2, ...) match
+FONTS = ("Helvetica", "Helvetica-Bold", "Times-Roman", "Times-Italic", "Times-Bold")
+NAVY = HexColor("#1f2a44")
+GOLD = HexColor("#b08d3c")
+GREY = HexColor("#5b6275")
+
+CERTIFICATE_TITLES = {
+    "iso_42001_compliance": "ISO/IEC 42001:2023 Artificial Intelligence Management System"
+}
+
+
+class RenderedCertificate(NamedTuple):
+    sha256: str
+    storage_key: str
+    size: int
+
+
+def get_certificate_storage():
+    return get_storage(settings.STORAGE_TYPE, settings.CERTIFICATES_DIR, s3_prefix="certificates")
+
+
+def _select_fonts(pdf: canvas.Canvas):
+    for font in FONTS:
+        pdf.setFont(font, 10)
+
+
+def _draw_background(pdf: canvas.Canvas):
+    width, height = PAGE_SIZE
+    pdf.saveState()
+
+    # Double border
+    pdf.setStrokeColor(NAVY)
+    pdf.setLineWidth(6)
+    pdf.rect(24, 24, width - 48, height - 48)
+    pdf.setStrokeColor(GOLD)
+    pdf.setLineWidth(1.5)
+    pdf.rect(36, 36, width - 72, height - 72)
+    for x, y in ((36, 36), (width - 36, 36), (36, height - 36), (width - 36, height - 36)):
+        pdf.circle(x, y, 6, stroke=1, fill=0)
+
+    # Seal
+    seal_x, seal_y = width - 130, 120
+    pdf.setFillColor(GOLD)
+    pdf.circle(seal_x, seal_y, 48, stroke=0, fill=1)
+    pdf.setStrokeColor(HexColor("#ffffff"))
+    pdf.setLineWidth(1)
+    pdf.circle(seal_x, seal_y, 40, stroke=1, fill=0)
+    pdf.setFillColor(HexColor("#ffffff"))
+    pdf.setFont("Helvetica-Bold", 16)
+    pdf.drawCentredString(seal_x, seal_y + 2, "QRYTI")
+    pdf.setFont("Helvetica", 7)
+    pdf.drawCentredString(seal_x, seal_y - 12, "VERIFIED")
+
+    # Headings and labels
+    pdf.setFillColor(NAVY)
+    pdf.setFont("Times-Bold", 34)
+    pdf.drawCentredString(width / 2, height - 110, "Certificate of Compliance")
+    pdf.setFillColor(GREY)
+    pdf.setFont("Times-Italic", 15)
+    pdf.drawCentredString(width / 2, height - 160, "This is to certify that")
+    pdf.drawCentredString(width / 2, height - 262, "has been assessed and found to conform with")
+
+    pdf.setFont("Helvetica", 9)
+    pdf.drawString(90, 150, "CERTIFICATE NUMBER")
+    pdf.drawString(90, 112, "ISSUED")
+    pdf.drawString(250, 112, "VALID UNTIL")
+    pdf.drawString(90, 62, "Verify this certificate at")
+
+    pdf.setStrokeColor(GREY)
+    pdf.setLineWidth(0.5)
+    pdf.line(width / 2 - 110, 96, width / 2 + 110, 96)
+    pdf.drawCentredString(width / 2, 84, "Qryti Certification Authority")
+
+    pdf.restoreState()
+
+
+def _draw_fields(pdf: canvas.Canvas, fields: Dict[str, Any]):
+    width, height = PAGE_SIZE
+    pdf.setFillColor(NAVY)
+    pdf.setFont("Times-Bold", 26)
+    pdf.drawCentredString(width / 2, height - 205, fields["organization"] or fields["project_name"])
+    pdf.setFont("Times-Roman", 14)
+    system = fields.get("ai_system_name") or fields["project_name"]
+    pdf.drawCentredString(width / 2, height - 232, f"for the AI system “{system}”")
+
+    pdf.setFont("Times-Bold", 17)
+    title = CERTIFICATE_TITLES.get(fields["certificate_type"], fields["certificate_type"].replace("_", " ").title())
+    pdf.drawCentredString(width / 2, height - 295, title)
+
+    pdf.setFont("Helvetica-Bold", 12)
+    pdf.drawString(90, 134, fields["certificate_number"])
+    pdf.setFont("Helvetica", 11)
+    pdf.drawString(90, 98, fields["issued_date"])
+    pdf.drawString(250, 98, fields["expiry_date"])
+    pdf.drawString(90, 48, fields["verification_url"])
+
+
+class CertificateTemplate:
+    """The static page, recorded once; render() adds only the per-certificate fields"""
+
+    def __init__(self):
+        recorder = canvas.Canvas(io.BytesIO(), pagesize=PAGE_SIZE)
+        _select_fonts(recorder)
+        _draw_background(recorder)
+        self.background = recorder.getCurrentPageContent()
+
+    def render(self, fields: Dict[str, Any]) -> bytes:
+        buffer = io.BytesIO()
+        # invariant: identical fields give identical bytes (no timestamps or random IDs)
+        pdf = canvas.Canvas(buffer, pagesize=PAGE_SIZE, invariant=1)
+        pdf.setTitle(f"Certificate {fields['certificate_number']}")
+        pdf.setAuthor("Qryti")
+        _select_fonts(pdf)
+        pdf.addLiteral(self.background)
+        _draw_fields(pdf, fields)
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+
+_template: Optional[CertificateTemplate] = None
+
+
+def get_certificate_template() -> CertificateTemplate:
+    global _template
+    if _template is None:
+        _template = CertificateTemplate()
+    return _template
+
+
+def render_and_store(fields: Dict[str, Any]) -> RenderedCertificate:
+    """Render one certificate and store it under its SHA-256 (a no-op write when already stored)"""
+    pdf = get_certificate_template().render(fields)
+    sha256 = hashlib.sha256(pdf).hexdigest()
+    key = f"{blob_key(sha256)}.pdf"
+
+    storage = get_certificate_storage()
+    if not storage.exists(key):
+        incoming = Path(settings.CERTIFICATES_DIR) / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=incoming, suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as target:
+                target.write(pdf)
+            storage.move_file(key, path)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+    return RenderedCertificate(sha256, key, len(pdf))
+
+
+class CertificateRenderPool:
+    """Process pool for batch rendering; each worker records the template once at start-up"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or settings.CERTIFICATE_RENDER_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def render_many(self, fields_list: List[Dict[str, Any]]) -> List[RenderedCertificate]:
+        if len(fields_list) <= 1:
+            # Not worth the inter-process round trip
+            return [render_and_store(fields) for fields in fields_list]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=get_certificate_template
+                )
+            executor = self._executor
+        chunk_size = max(1, len(fields_list) // (self.workers * 4))
+        return list(executor.map(render_and_store, fields_list, chunksize=chunk_size))
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_pool: Optional[CertificateRenderPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_certificate_render_pool() -> CertificateRenderPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = CertificateRenderPool()
+    return _pool
+
+
+def stop_certificate_render_pool():
+    if _pool is not None:
+        _pool.shutdown()
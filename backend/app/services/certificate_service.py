@@ -0,0 +1,271 @@
+"""
+Certificate Service
+Issues, revokes and verifies compliance certificates; statistics come from one aggregate and
+expiry is applied by a bulk sweep
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, select, update, bindparam
+from sqlalchemy.exc import IntegrityError
+import logging
+import uuid
+
+from ..core.config import settings
+from ..models.certificate import Certificate
+from ..models.project import Project
+from ..models.user import User
+from .certificate_renderer import RenderedCertificate, get_certificate_render_pool, render_and_store
+
+logger = logging.getLogger(__name__)
+
+MIN_CERTIFICATION_SCORE = 80
+NUMBER_ATTEMPTS = 3
+MAX_ISSUE_BATCH = 500
+
+
+class CertificateError(ValueError):
+    pass
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def certificate_number(certificate_type: str) -> str:
+    return f"QRYTI-{certificate_type.upper()}-{uuid.uuid4().hex[:12].upper()}"
+
+
+def effective_status(status: str, expiry_date: datetime, now: Optional[datetime] = None) -> str:
+    """Status as of now, whether or not the expiry sweep has run since the certificate lapsed"""
+    if status == "active" and expiry_date <= (now or datetime.utcnow()):
+        return "expired"
+    return status
+
+
+class CertificateService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def issue(self, project_id: int, certificate_type: str, validity_months: int, issued_by: int,
+              notes: Optional[str] = None) -> Certificate:
+        project = self.db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            raise LookupError("Project not found")
+        if project.latest_compliance_score is None or project.latest_compliance_score < MIN_CERTIFICATION_SCORE:
+            raise CertificateError(
+                f"Project does not meet minimum compliance score ({MIN_CERTIFICATION_SCORE}%) for certification"
+            )
+
+        issued_date = datetime.utcnow()
+        for attempt in range(1, NUMBER_ATTEMPTS + 1):
+            certificate = Certificate(
+                certificate_number=certificate_number(certificate_type),
+                project_id=project_id,
+                certificate_type=certificate_type,
+                issued_date=issued_date,
+                expiry_date=issued_date + timedelta(days=validity_months * 30),
+                status="active",
+                issued_by=issued_by,
+                notes=notes
+            )
+            self.db.add(certificate)
+            try:
+                self.db.commit()
+                return certificate
+            except IntegrityError:
+                # Certificate number collision; draw another
+                self.db.rollback()
+                logger.warning(f"Certificate number collision (attempt {attempt}/{NUMBER_ATTEMPTS})")
+        raise CertificateError("Could not allocate a unique certificate number")
+
+    def issue_batch(self, project_ids: List[int], certificate_type: str, validity_months: int, issued_by: int,
+                    notes: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Issue certificates for every eligible project in project_ids in one transaction, then render
+        their PDFs in the render pool. Ineligible or unknown projects are reported, not issued.
+        """
+        project_ids = list(dict.fromkeys(project_ids))
+        scores = dict(self.db.query(Project.id, Project.latest_compliance_score).filter(
+            Project.id.in_(project_ids)
+        ).all())
+        eligible = [
+            project_id for project_id in project_ids
+            if scores.get(project_id) is not None and scores[project_id] >= MIN_CERTIFICATION_SCORE
+        ]
+        skipped = [
+            {"project_id": project_id,
+             "reason": "Project not found" if project_id not in scores else "Compliance score below threshold"}
+            for project_id in project_ids if project_id not in eligible
+        ]
+
+        issued_date = datetime.utcnow()
+        for attempt in range(1, NUMBER_ATTEMPTS + 1):
+            certificates = [
+                Certificate(
+                    certificate_number=certificate_number(certificate_type),
+                    project_id=project_id,
+                    certificate_type=certificate_type,
+                    issued_date=issued_date,
+                    expiry_date=issued_date + timedelta(days=validity_months * 30),
+                    status="active",
+                    issued_by=issued_by,
+                    notes=notes
+                )
+                for project_id in eligible
+            ]
+            self.db.add_all(certificates)
+            try:
+                self.db.commit()
+                break
+            except IntegrityError:
+                self.db.rollback()
+                logger.warning(f"Certificate number collision in batch (attempt {attempt}/{NUMBER_ATTEMPTS})")
+        else:
+            raise CertificateError("Could not allocate unique certificate numbers")
+
+        self.render_pdfs([certificate.id for certificate in certificates])
+        return {"issued": certificates, "skipped": skipped}
+
+    def certificate_fields(self, certificate_ids: List[int]) -> List[Dict[str, Any]]:
+        """Everything printed on the given certificates, in one query"""
+        rows = self.db.query(
+            Certificate.id, Certificate.certificate_number, Certificate.certificate_type,
+            Certificate.issued_date, Certificate.expiry_date,
+            Project.project_name, Project.ai_system_name, User.organization
+        ).join(
+            Project, Certificate.project_id == Project.id
+        ).join(
+            User, Project.client_id == User.id
+        ).filter(Certificate.id.in_(certificate_ids)).order_by(Certificate.id).all()
+
+        return [
+            {
+                "id": row.id,
+                "certificate_number": row.certificate_number,
+                "certificate_type": row.certificate_type,
+                "organization": row.organization,
+                "project_name": row.project_name,
+                "ai_system_name": row.ai_system_name,
+                "issued_date": row.issued_date.strftime("%d %B %Y"),
+                "expiry_date": row.expiry_date.strftime("%d %B %Y"),
+                "verification_url": f"{settings.CERTIFICATE_VERIFY_BASE_URL}/{row.certificate_number}"
+            }
+            for row in rows
+        ]
+
+    def render_pdfs(self, certificate_ids: List[int]) -> List[RenderedCertificate]:
+        """Render (fanned out over the render pool) and record the PDFs of the given certificates"""
+        if not certificate_ids:
+            return []
+        fields_list = self.certificate_fields(certificate_ids)
+        rendered = get_certificate_render_pool().render_many(fields_list)
+        self._record_pdfs(fields_list, rendered)
+        return rendered
+
+    def ensure_pdf(self, certificate: Certificate) -> Certificate:
+        """Render a certificate's PDF in-process when it has none yet"""
+        if not certificate.pdf_storage_key:
+            fields_list = self.certificate_fields([certificate.id])
+            self._record_pdfs(fields_list, [render_and_store(fields_list[0])])
+            self.db.refresh(certificate)
+        return certificate
+
+    def _record_pdfs(self, fields_list: List[Dict[str, Any]], rendered: List[RenderedCertificate]):
+        table = Certificate.__table__
+        self.db.execute(
+            update(table).where(table.c.id == bindparam("certificate_id")).values(
+                pdf_sha256=bindparam("sha256"), pdf_storage_key=bindparam("storage_key")
+            ),
+            [
+                {"certificate_id": fields["id"], "sha256": pdf.sha256, "storage_key": pdf.storage_key}
+                for fields, pdf in zip(fields_list, rendered)
+            ]
+        )
+        self.db.commit()
+
+    def get(self, number: str) -> Optional[Certificate]:
+        return self.db.query(Certificate).filter(Certificate.certificate_number == number).first()
+
+    def for_project(self, project_id: int) -> List[Certificate]:
+        return self.db.query(Certificate).filter(
+            Certificate.project_id == project_id
+        ).order_by(Certificate.issued_date.desc()).all()
+
+    def revoke(self, number: str, reason: str, revoked_by: int) -> Certificate:
+        certificate = self.get(number)
+        if not certificate:
+            raise LookupError("Certificate not found")
+        if certificate.status == "revoked":
+            raise CertificateError("Certificate is already revoked")
+        certificate.status = "revoked"
+        certificate.revoked_at = datetime.utcnow()
+        certificate.revoked_by = revoked_by
+        certificate.revocation_reason = reason
+        self.db.commit()
+        return certificate
+
+    def verify(self, number: str) -> Optional[Dict[str, Any]]:
+        """Public verification record: one lookup on the unique certificate_number index"""
+        row = self.db.query(
+            Certificate.certificate_number, Certificate.certificate_type, Certificate.status,
+            Certificate.issued_date, Certificate.expiry_date, Certificate.revoked_at, Certificate.updated_at,
+            Project.project_name, Project.ai_system_name, User.organization
+        ).join(
+            Project, Certificate.project_id == Project.id
+        ).join(
+            User, Project.client_id == User.id
+        ).filter(Certificate.certificate_number == number).first()
+        if not row:
+            return None
+
+        status = effective_status(row.status, row.expiry_date)
+        return {
+            "certificate_number": row.certificate_number,
+            "certificate_type": row.certificate_type,
+            "status": status,
+            "valid": status == "active",
+            "organization": row.organization,
+            "project_name": row.project_name,
+            "ai_system_name": row.ai_system_name,
+            "issued_date": row.issued_date.isoformat(),
+            "expiry_date": row.expiry_date.isoformat(),
+            "revoked_at": row.revoked_at.isoformat() if row.revoked_at else None,
+            "updated_at": row.updated_at
+        }
+
+    def statistics(self) -> Dict[str, int]:
+        """Certificate counters and the eligible project count in one statement"""
+        now = datetime.utcnow()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        lapsed = Certificate.expiry_date <= now
+        eligible_projects = select(func.count(Project.id)).where(
+            Project.latest_compliance_score >= MIN_CERTIFICATION_SCORE,
+            Project.status == 'active'
+        ).scalar_subquery()
+
+        row = self.db.query(
+            func.count(Certificate.id).label("total_certificates_issued"),
+            _count_where((Certificate.status == "active") & ~lapsed).label("active_certificates"),
+            _count_where((Certificate.status == "expired") | ((Certificate.status == "active") & lapsed))
+            .label("expired_certificates"),
+            _count_where(Certificate.status == "revoked").label("revoked_certificates"),
+            _count_where(Certificate.issued_date >= month_start).label("certificates_this_month"),
+            eligible_projects.label("eligible_projects")
+        ).one()
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+
+def expire_certificates(db: Session, now: Optional[datetime] = None) -> int:
+    """Mark every active certificate past its expiry date as expired in one UPDATE; the caller commits"""
+    now = now or datetime.utcnow()
+    table = Certificate.__table__
+    expired = db.execute(
+        update(table).where(table.c.status == "active", table.c.expiry_date <= now).values(
+            status="expired", updated_at=now
+        )
+    ).rowcount
+    logger.info(f"Expired {expired} certificates")
+    return expired
+
@@ -0,0 +1,234 @@
+"""
+ISO 42001 Control Catalog
+Immutable in-process index of the static control framework, shared across requests
+"""
+
+from typing import Dict, Tuple, Optional, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+import threading
+import logging
+import time
+
+from ..models.iso_control import ISOControl, ControlQuestion
+from ..data.iso_42001_controls import (
+    ISO_42001_CONTROLS, RISK_TEMPLATE_CONTROLS,
+    NIST_FUNCTION_WEIGHTS, CATEGORY_WEIGHTS
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker trusts its catalog before comparing it with the control tables again
+CATALOG_CHECK_INTERVAL = 30
+
+
+class _FrozenRecord:
+    """Base for slot-based records that cannot be modified after construction"""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:3])
+        return f"<{type(self).__name__}({fields})>"
+
+
+class CatalogQuestion(_FrozenRecord):
+    __slots__ = (
+        "id", "control_id", "question_number", "question_text", "guidance",
+        "weight", "requires_evidence", "evidence_description"
+    )
+
+
+class CatalogControl(_FrozenRecord):
+    __slots__ = (
+        "id", "control_number", "title", "description", "category", "nist_function",
+        "weight", "combined_weight", "nist_weight", "is_mandatory", "min_risk_template",
+        "questions"
+    )
+
+
+class ControlCatalog:
+    """
+    Read-only view of ISO 42001 controls and questions.
+    category, nist_function and min_risk_template are stored as plain string values.
+    """
+
+    def __init__(self, controls: Tuple[CatalogControl, ...], version: Tuple[Any, ...]):
+        self.version = version
+        self.controls = controls
+        self.controls_by_id: Dict[int, CatalogControl] = {
+            control.id: control for control in controls if control.id is not None
+        }
+        self.controls_by_number: Dict[str, CatalogControl] = {
+            control.control_number: control for control in controls
+        }
+        self.questions_by_id: Dict[int, CatalogQuestion] = {
+            question.id: question
+            for control in controls for question in control.questions
+            if question.id is not None
+        }
+        self.template_controls: Dict[str, Tuple[CatalogControl, ...]] = {
+            template: tuple(
+                self.controls_by_number[number] for number in numbers
+                if number in self.controls_by_number
+            )
+            for template, numbers in RISK_TEMPLATE_CONTROLS.items()
+        }
+
+    def control(self, control_id: int) -> Optional[CatalogControl]:
+        return self.controls_by_id.get(control_id)
+
+    def question(self, question_id: int) -> Optional[CatalogQuestion]:
+        return self.questions_by_id.get(question_id)
+
+    def applicable_controls(self, risk_template: str) -> Tuple[CatalogControl, ...]:
+        return self.template_controls.get(risk_template, ())
+
+    @staticmethod
+    def _make_control(control_id, control_number, title, description, category, nist_function,
+                      weight, is_mandatory, min_risk_template, questions) -> CatalogControl:
+        weight = weight if weight is not None else 1.0
+        return CatalogControl(
+            id=control_id,
+            control_number=control_number,
+            title=title,
+            description=description,
+            category=category,
+            nist_function=nist_function,
+            weight=weight,
+            combined_weight=weight * CATEGORY_WEIGHTS.get(category, 1.0),
+            nist_weight=NIST_FUNCTION_WEIGHTS.get(nist_function, 1.0),
+            is_mandatory=is_mandatory,
+            min_risk_template=min_risk_template,
+            questions=tuple(questions)
+        )
+
+    @classmethod
+    def from_db(cls, db: Session, version: Optional[Tuple[Any, ...]] = None) -> "ControlCatalog":
+        """Build the catalog from the iso_controls and control_questions tables (two statements)"""
+        questions_by_control: Dict[int, list] = {}
+        for question in db.query(ControlQuestion).order_by(ControlQuestion.control_id, ControlQuestion.id).all():
+            questions_by_control.setdefault(question.control_id, []).append(CatalogQuestion(
+                id=question.id,
+                control_id=question.control_id,
+                question_number=question.question_number,
+                question_text=question.question_text,
+                guidance=question.guidance,
+                weight=question.weight if question.weight is not None else 1.0,
+                requires_evidence=bool(question.requires_evidence),
+                evidence_description=question.evidence_description
+            ))
+
+        controls = tuple(
+            cls._make_control(
+                control.id, control.control_number, control.title, control.description,
+                control.category.value, control.nist_function.value, control.weight,
+                control.is_mandatory,
+                control.min_risk_template.value if control.min_risk_template else None,
+                questions_by_control.get(control.id, [])
+            )
+            for control in db.query(ISOControl).order_by(ISOControl.id).all()
+        )
+        return cls(controls, version if version is not None else catalog_version(db))
+
+    @classmethod
+    def from_data(cls) -> "ControlCatalog":
+        """Build the catalog from the static framework data (no database ids)"""
+        controls = tuple(
+            cls._make_control(
+                None, data["control_number"], data["title"], data["description"],
+                data["category"], data["nist_function"], data["weight"],
+                data["is_mandatory"], data["min_risk_template"],
+                [
+                    CatalogQuestion(
+                        id=None,
+                        control_id=None,
+                        question_number=question["question_number"],
+                        question_text=question["question_text"],
+                        guidance=question.get("guidance"),
+                        weight=question["weight"],
+                        requires_evidence=question["requires_evidence"],
+                        evidence_description=question.get("evidence_description")
+                    )
+                    for question in data["questions"]
+                ]
+            )
+            for data in ISO_42001_CONTROLS
+        )
+        return cls(controls, ("data", len(controls)))
+
+
+def catalog_version(db: Session) -> Tuple[Any, ...]:
+    """Cheap stamp that changes whenever the control tables are (re)initialized or edited"""
+    control_count, control_max_id, control_updated = db.query(
+        func.count(ISOControl.id), func.max(ISOControl.id),
+        func.max(func.coalesce(ISOControl.updated_at, ISOControl.created_at))
+    ).one()
+    question_count, question_max_id, question_updated = db.query(
+        func.count(ControlQuestion.id), func.max(ControlQuestion.id),
+        func.max(func.coalesce(ControlQuestion.updated_at, ControlQuestion.created_at))
+    ).one()
+    return (
+        control_count, control_max_id, str(control_updated),
+        question_count, question_max_id, str(question_updated)
+    )
+
+
+# Process-wide catalog instance
+_catalog: Optional[ControlCatalog] = None
+_catalog_checked_at = 0.0
+_fallback_catalog: Optional[ControlCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def _static_fallback() -> ControlCatalog:
+    """Catalog from the framework data, used only while the control tables are empty"""
+    global _fallback_catalog
+    if _fallback_catalog is None:
+        logger.warning("ISO control tables are empty - using static framework data for the catalog")
+        _fallback_catalog = ControlCatalog.from_data()
+    return _fallback_catalog
+
+
+def _refresh_catalog(db: Session, force: bool = False) -> Optional[ControlCatalog]:
+    """Rebuild the shared catalog if forced or its version is stale; caller holds _catalog_lock"""
+    global _catalog, _catalog_checked_at
+    version = catalog_version(db)
+    if force or _catalog is None or _catalog.version != version:
+        catalog = ControlCatalog.from_db(db, version)
+        # Never keep an empty catalog: the tables may be seeded by another worker
+        _catalog = catalog if catalog.controls else None
+        if _catalog is not None:
+            logger.info(f"Loaded ISO 42001 control catalog: {len(_catalog.controls)} controls")
+    _catalog_checked_at = time.monotonic()
+    return _catalog
+
+
+def get_control_catalog(db: Session) -> ControlCatalog:
+    """
+    Return the shared catalog. Every CATALOG_CHECK_INTERVAL seconds its version is compared with
+    the control tables, so workers pick up a re-initialization done by another process.
+    """
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _catalog_checked_at < CATALOG_CHECK_INTERVAL:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is None or time.monotonic() - _catalog_checked_at >= CATALOG_CHECK_INTERVAL:
+            _refresh_catalog(db)
+        return _catalog or _static_fallback()
+
+
+def reload_control_catalog(db: Session, force: bool = False) -> ControlCatalog:
+    """Rebuild the shared catalog if the control tables changed since it was built"""
+    with _catalog_lock:
+        return _refresh_catalog(db, force) or _static_fallback()
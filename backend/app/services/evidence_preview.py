@@ -0,0 +1,329 @@
+"""
+Evidence Preview Service
+Renders small JPEG previews of evidence (downscaled images, first page of PDFs) in a process pool,
+stored once per content hash next to the evidence blobs, so reviewers can triage without
+opening originals
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import update
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.file_response import local_file_path
+from ..core.storage import LocalStorage
+from ..models.evidence import Evidence
+from ..models.iso_control import EvidenceFile
+from .evidence_storage import CHUNK_SIZE, INCOMING_DIR, blob_key, get_evidence_storage
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_MEDIA_TYPE = "image/jpeg"
+IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+PDF_TYPE = "application/pdf"
+PDF_RENDER_TIMEOUT = 60  # seconds
+WORKER_MAX_TASKS = 200  # Recycle workers so decoder memory does not accumulate
+
+
+class PreviewResult(NamedTuple):
+    sha256: str
+    key: Optional[str]  # None when the file could not be rendered
+
+
+class PreviewFailed(Exception):
+    """The content was rendered before and failed; it is not queued again"""
+
+
+def preview_key(sha256: str) -> str:
+    return f"previews/{blob_key(sha256)}.jpg"
+
+
+def preview_failure_key(sha256: str) -> str:
+    """Empty marker stored in place of a preview the content could not be rendered to"""
+    return f"{preview_key(sha256)}.failed"
+
+
+def source_failure_key(storage_key: str) -> str:
+    """Marker for a stored file whose render failed before its content hash was known"""
+    return f"previews/failed/{hashlib.sha256(storage_key.encode('utf-8')).hexdigest()}"
+
+
+def _store_failure_marker(storage, key: str):
+    workdir = Path(settings.UPLOAD_DIR) / INCOMING_DIR
+    workdir.mkdir(parents=True, exist_ok=True)
+    fd, marker = tempfile.mkstemp(dir=workdir)
+    os.close(fd)
+    try:
+        storage.move_file(key, marker)
+    finally:
+        if os.path.exists(marker):
+            os.unlink(marker)
+
+
+def is_previewable(media_type: Optional[str]) -> bool:
+    return media_type in IMAGE_TYPES or (media_type == PDF_TYPE and shutil.which("pdftoppm") is not None)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _render_image(source: str, target: str, size: int, quality: int):
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # JPEGs are decoded at a reduced scale instead of full size
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            flattened = Image.new("RGB", image.size, "white")
+            flattened.paste(image, mask=image.getchannel("A"))
+            image = flattened
+        else:
+            image = image.convert("RGB")
+        image.save(target, "JPEG", quality=quality, optimize=True)
+
+
+def _render_pdf_page(source: str, target: str, size: int, quality: int) -> bool:
+    """First page via poppler's pdftoppm; False when it is not installed"""
+    pdftoppm = shutil.which("pdftoppm")
+    if not pdftoppm:
+        logger.warning("pdftoppm not found; PDF previews are disabled")
+        return False
+    prefix = target + ".page"
+    subprocess.run(
+        [pdftoppm, "-f", "1", "-l", "1", "-singlefile", "-scale-to", str(size),
+         "-jpeg", "-jpegopt", f"quality={quality}", source, prefix],
+        check=True, capture_output=True, timeout=PDF_RENDER_TIMEOUT
+    )
+    os.replace(prefix + ".jpg", target)
+    return True
+
+
+def build_preview(storage_key: str, media_type: str, sha256: Optional[str] = None) -> PreviewResult:
+    """
+    Render and store the preview for one stored file. Runs in a pool worker process.
+    Content that already has a preview is not rendered again; files stored without a hash
+    are hashed here.
+    """
+    storage = get_evidence_storage()
+    if sha256 and storage.exists(preview_key(sha256)):
+        return PreviewResult(sha256, preview_key(sha256))
+    if sha256 and storage.exists(preview_failure_key(sha256)):
+        return PreviewResult(sha256, None)
+
+    workdir = Path(settings.UPLOAD_DIR) / INCOMING_DIR
+    workdir.mkdir(parents=True, exist_ok=True)
+    temporary = []
+    try:
+        if isinstance(storage, LocalStorage):
+            source = str(storage.path(storage_key) if storage.exists(storage_key) else local_file_path(storage_key))
+        else:
+            fd, source = tempfile.mkstemp(dir=workdir)
+            os.close(fd)
+            temporary.append(source)
+            storage.get_file(storage_key, source)
+
+        if not sha256:
+            sha256 = _file_sha256(source)
+            if storage.exists(preview_key(sha256)):
+                return PreviewResult(sha256, preview_key(sha256))
+
+        fd, target = tempfile.mkstemp(dir=workdir, suffix=".jpg")
+        os.close(fd)
+        temporary.append(target)
+        size, quality = settings.PREVIEW_MAX_DIMENSION, settings.PREVIEW_JPEG_QUALITY
+        try:
+            if media_type == PDF_TYPE:
+                rendered = _render_pdf_page(source, target, size, quality)
+            else:
+                _render_image(source, target, size, quality)
+                rendered = True
+        except Exception as e:
+            # Corrupt or unsupported content fails the same way every time: record it instead of retrying
+            logger.warning(f"Could not render preview of {storage_key}: {e}")
+            _store_failure_marker(storage, preview_failure_key(sha256))
+            return PreviewResult(sha256, None)
+        if not rendered:
+            return PreviewResult(sha256, None)
+
+        storage.move_file(preview_key(sha256), target)
+        return PreviewResult(sha256, preview_key(sha256))
+    finally:
+        for path in temporary:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class PreviewPool:
+    """
+    Process pool for preview rendering, so decoding and resizing never run on API workers.
+    Callbacks run in the parent process once a preview is stored (or has failed, with None).
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or settings.PREVIEW_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Future, List[Callable]]] = {}  # storage key -> render in flight
+
+    def submit(self, storage_key: str, media_type: str, sha256: Optional[str] = None,
+               on_done: Optional[Callable[[Optional[PreviewResult]], None]] = None) -> Future:
+        """Queue a render; a file already being rendered joins that render instead of queueing another"""
+        with self._lock:
+            if storage_key in self._pending:
+                future, callbacks = self._pending[storage_key]
+                if on_done:
+                    callbacks.append(on_done)
+                return future
+            if self._executor is None:
+                # spawn: forking a threaded server process can copy held locks into the children
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=WORKER_MAX_TASKS
+                )
+            future = self._executor.submit(build_preview, storage_key, media_type, sha256)
+            self._pending[storage_key] = (future, [on_done] if on_done else [])
+
+        def finish(done: Future):
+            with self._lock:
+                _, callbacks = self._pending.pop(storage_key, (done, []))
+            try:
+                result = done.result()
+            except Exception as e:
+                logger.warning(f"Preview for {storage_key} failed: {e}")
+                result = None
+            for callback in callbacks:
+                try:
+                    callback(result)
+                except Exception as e:
+                    logger.error(f"Recording preview for {storage_key} failed: {e}")
+
+        future.add_done_callback(finish)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+
+_pool: Optional[PreviewPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_preview_pool() -> PreviewPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PreviewPool()
+    return _pool
+
+
+def stop_preview_pool():
+    if _pool is not None:
+        _pool.shutdown()
+
+
+def _record_evidence_file_preview(evidence_file_id: int, result: Optional[PreviewResult]):
+    table = EvidenceFile.__table__
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(table).where(table.c.id == evidence_file_id).values(preview_path=result.key if result else None)
+        )
+        # Leave reviews that happened meanwhile alone
+        db.execute(
+            update(table).where(table.c.id == evidence_file_id, table.c.upload_status == "processing")
+            .values(upload_status="uploaded")
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record_evidence_hash(evidence_id: int, storage_key: str, result: Optional[PreviewResult]):
+    """
+    Evidence stored before hashing gets the hash computed by the preview worker.
+    A render that failed before hashing (unreadable file, crashed worker) is marked by storage key instead.
+    """
+    if result is None:
+        _store_failure_marker(get_evidence_storage(), source_failure_key(storage_key))
+        return
+    table = Evidence.__table__
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(table).where(table.c.id == evidence_id, table.c.file_hash.is_(None))
+            .values(file_hash=result.sha256)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+class EvidencePreviewService:
+    def __init__(self, db: Session, storage=None):
+        self.db = db
+        self.storage = storage or get_evidence_storage()
+
+    def prepare(self, evidence_file: EvidenceFile) -> bool:
+        """
+        Set the preview state of a new evidence file in the caller's transaction.
+        Returns True when a render has to be queued (after commit) with enqueue().
+        """
+        if not is_previewable(evidence_file.file_type):
+            return False
+        cached = preview_key(evidence_file.file_hash)
+        if self.storage.exists(cached):
+            evidence_file.preview_path = cached
+            return False
+        if self.storage.exists(preview_failure_key(evidence_file.file_hash)):
+            return False
+        evidence_file.upload_status = "processing"
+        return True
+
+    def enqueue(self, evidence_file: EvidenceFile) -> Future:
+        evidence_file_id = evidence_file.id
+        return get_preview_pool().submit(
+            evidence_file.file_path, evidence_file.file_type, evidence_file.file_hash,
+            on_done=lambda result: _record_evidence_file_preview(evidence_file_id, result)
+        )
+
+    def evidence_preview(self, evidence: Evidence) -> Optional[str]:
+        """
+        Storage key of the preview for an evidence record, queueing a render when there is none yet.
+        Raises PreviewFailed once a render of its content has failed.
+        """
+        if evidence.file_hash and self.storage.exists(preview_key(evidence.file_hash)):
+            return preview_key(evidence.file_hash)
+        if evidence.file_hash and self.storage.exists(preview_failure_key(evidence.file_hash)):
+            raise PreviewFailed(evidence.file_hash)
+        if not evidence.file_hash and self.storage.exists(source_failure_key(evidence.file_path)):
+            raise PreviewFailed(evidence.file_path)
+        evidence_id, storage_key = evidence.id, evidence.file_path
+        get_preview_pool().submit(
+            storage_key, evidence.file_type, evidence.file_hash,
+            on_done=lambda result: _record_evidence_hash(evidence_id, storage_key, result)
+        )
+        return None
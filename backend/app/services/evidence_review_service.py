@@ -0,0 +1,214 @@
+"""
+Evidence Review Service
+Admin evidence review queue: pending items in one statement, statistics in one conditional aggregate,
+and claiming of queue items so concurrent reviewers never work on the same file
+"""
+
+from datetime import datetime, timedelta
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import func, case, and_, or_, select, update
+import logging
+
+from ..core.config import settings
+from ..models.assessment import Assessment
+from ..models.evidence import Evidence
+from ..models.stage import AssessmentStage
+from ..models.project import Project
+from ..models.user import User
+from .evidence_preview import is_previewable
+
+logger = logging.getLogger(__name__)
+
+MAX_CLAIM = 50
+MAX_REVIEW_BATCH = 500
+
+# Matches the partial index ix_evidence_pending_review
+PENDING_REVIEW = and_(Evidence.is_validated == False, Evidence.is_active == True, Evidence.reviewed_at.is_(None))
+
+
+class EvidenceNotFound(ValueError):
+    pass
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class EvidenceReviewService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def pending_query(self, project_id: Optional[int] = None, control_id: Optional[str] = None) -> Query:
+        """Pending evidence with its assessment, project and client columns, one row per file"""
+        query = self.db.query(
+            Evidence.id, Evidence.file_name, Evidence.file_type, Evidence.file_size, Evidence.upload_date,
+            Evidence.claimed_by, Evidence.claimed_at,
+            Assessment.id.label("assessment_id"), Assessment.control_id,
+            Project.project_name, User.name.label("client_name")
+        ).join(
+            AssessmentStage, Evidence.assessment_stage_id == AssessmentStage.id
+        ).join(
+            Assessment, AssessmentStage.assessment_id == Assessment.id
+        ).join(
+            Project, Assessment.project_id == Project.id
+        ).join(
+            User, Project.client_id == User.id
+        ).filter(PENDING_REVIEW)
+
+        if project_id:
+            query = query.filter(Assessment.project_id == project_id)
+        if control_id:
+            query = query.filter(Assessment.control_id == control_id)
+        return query
+
+    @staticmethod
+    def to_review_item(row) -> Dict[str, Any]:
+        return {
+            "evidence_id": row.id,
+            "file_name": row.file_name,
+            "assessment_id": row.assessment_id,
+            "control_id": row.control_id,
+            "client_name": row.client_name,
+            "project_name": row.project_name,
+            "uploaded_at": row.upload_date.isoformat() if row.upload_date else None,
+            "file_size": row.file_size,
+            "file_type": row.file_type,
+            "is_approved": None,
+            "review_notes": None,
+            "reviewed_by": None,
+            "reviewed_at": None,
+            "claimed_by": row.claimed_by,
+            "preview_url": f"/api/v1/evidence/{row.id}/preview" if is_previewable(row.file_type) else None
+        }
+
+    def statistics(self) -> Dict[str, Any]:
+        """Review counters for active evidence in one statement"""
+        row = self.db.query(
+            func.count(Evidence.id).label("total_evidence"),
+            _count_where(PENDING_REVIEW).label("pending_review"),
+            _count_where(Evidence.is_validated == True).label("approved_evidence"),
+            _count_where(and_(Evidence.is_validated == False, Evidence.reviewed_at.isnot(None))).label("rejected_evidence")
+        ).filter(Evidence.is_active == True).one()
+
+        stats = {key: int(value or 0) for key, value in row._mapping.items()}
+        total, approved = stats["total_evidence"], stats["approved_evidence"]
+        stats["approval_rate"] = round((approved / total * 100), 2) if total > 0 else 0
+        return stats
+
+    def claim_next(self, reviewer_id: int, limit: int, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Claim up to limit of the oldest unclaimed pending items for reviewer_id.
+        On PostgreSQL the candidates are locked with FOR UPDATE SKIP LOCKED, so concurrent
+        claims pass over each other's rows instead of waiting; the claiming UPDATE re-checks
+        availability, which keeps SQLite (no row locks) correct too. Claims expire after
+        EVIDENCE_CLAIM_TTL_MINUTES.
+        """
+        now = datetime.utcnow()
+        available = or_(
+            Evidence.claimed_at.is_(None),
+            Evidence.claimed_at < now - timedelta(minutes=settings.EVIDENCE_CLAIM_TTL_MINUTES)
+        )
+
+        candidates = self.db.query(Evidence.id).filter(PENDING_REVIEW, available)
+        if project_id:
+            candidates = candidates.filter(Evidence.assessment_stage_id.in_(
+                self.db.query(AssessmentStage.id).join(
+                    Assessment, AssessmentStage.assessment_id == Assessment.id
+                ).filter(Assessment.project_id == project_id)
+            ))
+        evidence_ids = [evidence_id for (evidence_id,) in candidates.order_by(
+            Evidence.upload_date, Evidence.id
+        ).limit(min(limit, MAX_CLAIM)).with_for_update(skip_locked=True).all()]
+
+        if not evidence_ids:
+            self.db.rollback()
+            return []
+
+        self.db.query(Evidence).filter(Evidence.id.in_(evidence_ids), available).update(
+            {Evidence.claimed_by: reviewer_id, Evidence.claimed_at: now}, synchronize_session=False
+        )
+        self.db.commit()
+
+        claimed = self.pending_query().filter(
+            Evidence.id.in_(evidence_ids), Evidence.claimed_by == reviewer_id, Evidence.claimed_at == now
+        ).order_by(Evidence.upload_date, Evidence.id).all()
+        logger.info(f"Reviewer {reviewer_id} claimed {len(claimed)} evidence items")
+        return [self.to_review_item(row) for row in claimed]
+
+    def release(self, reviewer_id: int, evidence_ids: Optional[List[int]] = None) -> int:
+        """Return a reviewer's claimed items (all of them by default) to the queue"""
+        query = self.db.query(Evidence).filter(Evidence.claimed_by == reviewer_id, Evidence.reviewed_at.is_(None))
+        if evidence_ids:
+            query = query.filter(Evidence.id.in_(evidence_ids))
+        released = query.update({Evidence.claimed_by: None, Evidence.claimed_at: None}, synchronize_session=False)
+        self.db.commit()
+        return released
+
+    def review_batch(self, decisions: List[Dict[str, Any]], reviewer_id: int) -> Dict[str, int]:
+        """
+        Apply review decisions ({evidence_id, approved, notes}) in the caller's transaction.
+        Evidence rows are updated with one UPDATE ... WHERE id IN per distinct (approved, notes)
+        pair, and assessments gaining approved evidence get evidence_provided set with one more.
+        ISO 42001 scores count question evidence files, not reviewed evidence, so nothing is rescored.
+        Raises EvidenceNotFound for unknown ids, ValueError for duplicates.
+        """
+        evidence_ids = [decision["evidence_id"] for decision in decisions]
+        if len(set(evidence_ids)) != len(evidence_ids):
+            raise ValueError("Each evidence item can only be reviewed once per batch")
+
+        evidence_table = Evidence.__table__
+        stage_table = AssessmentStage.__table__
+        connection = self.db.connection()
+        assessment_of = dict(connection.execute(
+            select(evidence_table.c.id, stage_table.c.assessment_id).join(
+                stage_table, evidence_table.c.assessment_stage_id == stage_table.c.id
+            ).where(evidence_table.c.id.in_(evidence_ids))
+        ).all())
+        missing = sorted(set(evidence_ids) - set(assessment_of))
+        if missing:
+            raise EvidenceNotFound(f"Evidence not found: {', '.join(map(str, missing))}")
+
+        groups: Dict[Tuple[bool, Optional[str]], List[int]] = defaultdict(list)
+        for decision in decisions:
+            groups[(decision["approved"], decision.get("notes"))].append(decision["evidence_id"])
+
+        now = datetime.utcnow()
+        for (approved, notes), ids in groups.items():
+            connection.execute(
+                update(evidence_table).where(evidence_table.c.id.in_(ids)).values(
+                    is_validated=approved, validation_notes=notes, reviewed_by=reviewer_id, reviewed_at=now,
+                    claimed_by=None, claimed_at=None
+                )
+            )
+
+        approved_assessments = {assessment_of[d["evidence_id"]] for d in decisions if d["approved"]}
+        assessment_table = Assessment.__table__
+        flipped = []
+        if approved_assessments:
+            flipped = list(connection.execute(
+                select(assessment_table.c.id).where(
+                    assessment_table.c.id.in_(approved_assessments),
+                    or_(assessment_table.c.evidence_provided.is_(None), assessment_table.c.evidence_provided == False)
+                )
+            ).scalars())
+        if flipped:
+            connection.execute(
+                update(assessment_table).where(assessment_table.c.id.in_(flipped)).values(evidence_provided=True)
+            )
+
+        # Rows loaded in this session reload the new review state on next access
+        for instance in self.db.identity_map.values():
+            if isinstance(instance, Evidence) and instance.id in assessment_of:
+                self.db.expire(instance)
+            elif isinstance(instance, Assessment) and instance.id in flipped:
+                self.db.expire(instance)
+
+        approved_count = sum(1 for decision in decisions if decision["approved"])
+        return {
+            "reviewed": len(decisions),
+            "approved": approved_count,
+            "rejected": len(decisions) - approved_count,
+            "assessments_updated": len(flipped)
+        }
@@ -0,0 +1,200 @@
+"""
+Evidence Storage Service
+Streams uploads to disk while hashing and size-checking them, and stores each distinct file once
+under its SHA-256 (UPLOAD_DIR/ab/cd/<sha256> locally, or the same key in S3) with reference counting
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+import hashlib
+import logging
+import os
+import re
+import tempfile
+
+from ..core.config import settings
+from ..core.storage import get_storage
+from ..models.evidence_blob import EvidenceBlob
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+INCOMING_DIR = ".incoming"  # Same filesystem as UPLOAD_DIR, so storing a new blob is a rename
+GARBAGE_GRACE_PERIOD = timedelta(hours=1)
+
+# Stored objects named after a blob: the content itself, its JPEG preview or failed-render marker
+BLOB_OBJECT_PATTERN = re.compile(r"^(?:previews/)?[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(?:\.jpg(?:\.failed)?)?$")
+ORPHAN_SWEEP_BATCH = 1000
+
+
+class EvidenceTooLarge(ValueError):
+    pass
+
+
+class StoredEvidence(NamedTuple):
+    sha256: str
+    size: int
+    storage_key: str
+    deduplicated: bool  # Content was already stored
+
+
+def blob_key(sha256: str) -> str:
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def get_evidence_storage():
+    return get_storage(settings.STORAGE_TYPE, settings.UPLOAD_DIR, s3_prefix="evidence")
+
+
+class EvidenceStorageService:
+    def __init__(self, db: Session, storage=None):
+        self.db = db
+        self.storage = storage or get_evidence_storage()
+
+    def store(self, source: BinaryIO, max_size: Optional[int] = None) -> StoredEvidence:
+        """
+        Copy source to storage in CHUNK_SIZE pieces, hashing as it goes.
+        Raises EvidenceTooLarge as soon as more than max_size (MAX_FILE_SIZE) bytes have been read.
+        The blob reference is added in the caller's transaction.
+        """
+        max_size = max_size or settings.MAX_FILE_SIZE
+        incoming = Path(settings.UPLOAD_DIR) / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+
+        fd, path = tempfile.mkstemp(dir=incoming)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as target:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise EvidenceTooLarge(f"File exceeds the {max_size // (1024 * 1024)} MB limit")
+                    digest.update(chunk)
+                    target.write(chunk)
+
+            sha256 = digest.hexdigest()
+            key = blob_key(sha256)
+            deduplicated = self.storage.exists(key)
+            if not deduplicated:
+                self.storage.move_file(key, path)
+            self._add_reference(sha256, key, size)
+            return StoredEvidence(sha256, size, key, deduplicated)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _add_reference(self, sha256: str, key: str, size: int):
+        table = EvidenceBlob.__table__
+        now = datetime.now(timezone.utc)
+        values = {"sha256": sha256, "storage_key": key, "size": size, "ref_count": 1, "last_referenced_at": now}
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ("postgresql", "sqlite"):
+            statement = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(table).values(**values)
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=["sha256"],
+                set_={"ref_count": table.c.ref_count + 1, "last_referenced_at": now}
+            ))
+            return
+
+        updated = self.db.execute(
+            update(table).where(table.c.sha256 == sha256).values(
+                ref_count=table.c.ref_count + 1, last_referenced_at=now
+            )
+        ).rowcount
+        if not updated:
+            self.db.execute(insert(table).values(**values))
+
+    def release(self, sha256: str):
+        """
+        Drop one reference in the caller's transaction; unreferenced content is removed by
+        collect_garbage once the grace period, counted from this release, has passed
+        """
+        table = EvidenceBlob.__table__
+        self.db.execute(
+            update(table).where(table.c.sha256 == sha256, table.c.ref_count > 0).values(
+                ref_count=table.c.ref_count - 1, last_referenced_at=datetime.now(timezone.utc)
+            )
+        )
+
+    def collect_garbage(self) -> List[str]:
+        """
+        Delete content nobody has referenced for GARBAGE_GRACE_PERIOD.
+        A row is only deleted while it is still unreferenced and past the grace period, so an
+        upload that deduplicated against it in the meantime keeps it; rows are committed before
+        their objects are removed. Previews of removed content go with the next sweep_orphans.
+        """
+        table = EvidenceBlob.__table__
+        cutoff = datetime.now(timezone.utc) - GARBAGE_GRACE_PERIOD
+        candidates = self.db.execute(
+            select(table.c.sha256, table.c.storage_key).where(
+                table.c.ref_count <= 0, table.c.last_referenced_at < cutoff
+            )
+        ).all()
+
+        removed = []
+        for sha256, key in candidates:
+            deleted = self.db.execute(
+                delete(table).where(
+                    table.c.sha256 == sha256, table.c.ref_count <= 0, table.c.last_referenced_at < cutoff
+                )
+            ).rowcount
+            if deleted:
+                removed.append(key)
+        self.db.commit()
+
+        for key in removed:
+            try:
+                self.storage.delete(key)
+            except Exception as e:
+                logger.warning(f"Could not delete evidence blob {key}: {e}")
+        return removed
+
+    def sweep_orphans(self) -> List[str]:
+        """
+        Delete stored objects older than GARBAGE_GRACE_PERIOD that no evidence_blobs row accounts
+        for: content moved in by store() whose transaction rolled back, previews of collected
+        content, and upload temp files left by a crashed worker.
+        """
+        cutoff = datetime.now(timezone.utc) - GARBAGE_GRACE_PERIOD
+        table = EvidenceBlob.__table__
+        removed = []
+        candidates: Dict[str, List[str]] = {}
+
+        def remove_unreferenced():
+            existing = set(self.db.execute(
+                select(table.c.sha256).where(table.c.sha256.in_(list(candidates)))
+            ).scalars())
+            for sha256, keys in candidates.items():
+                if sha256 not in existing:
+                    removed.extend(keys)
+            candidates.clear()
+
+        for key, modified in self.storage.list_keys():
+            if modified >= cutoff:
+                continue
+            match = BLOB_OBJECT_PATTERN.match(key)
+            if match:
+                candidates.setdefault(match.group(1), []).append(key)
+                if len(candidates) >= ORPHAN_SWEEP_BATCH:
+                    remove_unreferenced()
+            elif key.startswith(f"{INCOMING_DIR}/") or key.endswith(".partial"):
+                removed.append(key)
+        if candidates:
+            remove_unreferenced()
+        self.db.rollback()
+
+        for key in removed:
+            try:
+                self.storage.delete(key)
+            except Exception as e:
+                logger.warning(f"Could not delete orphaned evidence object {key}: {e}")
+        return removed
@@ -0,0 +1,100 @@
+"""
+Export Service
+Row sources for the streaming exports: AI model inventories, requirement assessments and audit logs.
+Each source reads through its own session on a server-side cursor, chunk by chunk, while the
+response is being sent.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from sqlalchemy import select
+
+from ..core.database import SessionLocal
+from ..core.export import ExportColumn, columns_of
+from ..models.ai_model import AIModel
+from ..models.requirement import Requirement, RequirementAssessment
+from .audit_log_service import AUDIT_TABLE, AuditLogService
+
+EXPORT_BATCH_SIZE = 5000
+
+AI_MODEL_EXPORT = select(
+    AIModel.id, AIModel.name, AIModel.description, AIModel.version, AIModel.model_type,
+    AIModel.framework, AIModel.algorithm, AIModel.status, AIModel.business_purpose,
+    AIModel.data_classification, AIModel.risk_level, AIModel.risk_score, AIModel.bias_risk,
+    AIModel.privacy_risk, AIModel.security_risk, AIModel.compliance_status, AIModel.compliance_score,
+    AIModel.monitoring_enabled, AIModel.created_date, AIModel.last_updated, AIModel.deployment_date,
+    AIModel.last_audit_date, AIModel.next_audit_date, AIModel.organization_id, AIModel.created_by
+)
+
+REQUIREMENT_ASSESSMENT_EXPORT = select(
+    RequirementAssessment.id,
+    Requirement.requirement_id.label("requirement"),
+    RequirementAssessment.ai_model_id,
+    AIModel.name.label("ai_model_name"),
+    RequirementAssessment.compliance_level, RequirementAssessment.compliance_score,
+    RequirementAssessment.status, RequirementAssessment.risk_level,
+    RequirementAssessment.current_state, RequirementAssessment.gap_analysis,
+    RequirementAssessment.evidence_provided, RequirementAssessment.recommendations,
+    RequirementAssessment.mitigation_plan, RequirementAssessment.assessment_date,
+    RequirementAssessment.target_completion_date, RequirementAssessment.actual_completion_date,
+    RequirementAssessment.next_review_date, RequirementAssessment.assessed_by
+).join(
+    Requirement, RequirementAssessment.requirement_id == Requirement.id
+).join(
+    AIModel, RequirementAssessment.ai_model_id == AIModel.id
+)
+
+
+class ExportSource(NamedTuple):
+    filename: str
+    columns: List[ExportColumn]
+    chunks: Iterator[List[Dict[str, Any]]]
+
+
+def _stream(statement, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    db = SessionLocal()
+    try:
+        result = db.connection().execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+        for chunk in result.partitions():
+            yield [dict(row._mapping) for row in chunk]
+    finally:
+        db.close()
+
+
+def _audit_chunks(filters: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    db = SessionLocal()
+    try:
+        yield from AuditLogService(db).export_chunks(batch_size=EXPORT_BATCH_SIZE, **filters)
+    finally:
+        db.close()
+
+
+def ai_model_export(organization_id: int) -> ExportSource:
+    statement = AI_MODEL_EXPORT.where(AIModel.organization_id == organization_id).order_by(AIModel.id)
+    return ExportSource(
+        f"ai_models_{organization_id}_{datetime.utcnow():%Y%m%d}", columns_of(statement), _stream(statement)
+    )
+
+
+def requirement_assessment_export(organization_id: int, ai_model_id: Optional[int] = None) -> ExportSource:
+    statement = REQUIREMENT_ASSESSMENT_EXPORT.where(RequirementAssessment.organization_id == organization_id)
+    if ai_model_id is not None:
+        statement = statement.where(RequirementAssessment.ai_model_id == ai_model_id)
+    statement = statement.order_by(RequirementAssessment.id)
+    return ExportSource(
+        f"requirement_assessments_{organization_id}_{datetime.utcnow():%Y%m%d}",
+        columns_of(statement), _stream(statement)
+    )
+
+
+def audit_log_export(organization_id: Optional[int] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, action: Optional[str] = None,
+                     entity_type: Optional[str] = None) -> ExportSource:
+    """Audit records oldest first, blob references resolved; pass a time range to prune partitions"""
+    scope = f"_{organization_id}" if organization_id is not None else ""
+    filters = dict(organization_id=organization_id, start=start, end=end, action=action, entity_type=entity_type)
+    return ExportSource(
+        f"audit_logs{scope}_{datetime.utcnow():%Y%m%d}",
+        [ExportColumn(column.name, column.type) for column in AUDIT_TABLE.columns],
+        _audit_chunks(filters)
+    )
@@ -3,25 +3,40 @@ ISO 42001 Assessment Service
 Handles gap assessment logic, scoring, and NIST AI RMF integration
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, BinaryIO
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 import math
+import os
+import re
 
 from ..models.iso_control import (
-    ISOControl, ControlQuestion, QuestionResponse, AssessmentResponse,
+    ISOControl, ControlQuestion, QuestionResponse, AssessmentResponse, EvidenceFile,
     ResponseValue, ControlCategory, NISTFunction, RiskTemplate
 )
 from ..models.assessment import Assessment
 from ..models.project import Project
-from ..data.iso_42001_controls import (
-    ISO_42001_CONTROLS, RISK_TEMPLATE_CONTROLS, 
-    NIST_FUNCTION_WEIGHTS, CATEGORY_WEIGHTS
-)
+from ..data.iso_42001_controls import ISO_42001_CONTROLS
+from .assessment_scoring import AssessmentScoringEngine, evidence_count_subquery
+from .control_catalog import get_control_catalog, reload_control_catalog, CatalogControl
+from .evidence_storage import EvidenceStorageService, EvidenceTooLarge
+from .evidence_preview import EvidencePreviewService
+
+# Maximum SQL statements each read page may issue (checked with app.core.database.query_budget)
+QUERY_BUDGETS = {
+    "assessment_overview": 2,
+    "control_questionnaire": 2,
+    "gap_analysis": 3
+}
 
 class ISOAssessmentService:
     def __init__(self, db: Session):
         self.db = db
+        self.scoring = AssessmentScoringEngine(db)
+
+    @property
+    def catalog(self):
+        return get_control_catalog(self.db)
 
     def initialize_controls_database(self) -> bool:
         """Initialize the ISO 42001 controls database from the framework data"""
@@ -61,6 +76,9 @@ class ISOAssessmentService:
                     self.db.add(question)
 
             self.db.commit()
+
+            # Control tables changed - rebuild the shared catalog
+            reload_control_catalog(self.db, force=True)
             return True
 
         except Exception as e:
@@ -90,10 +108,10 @@ class ISOAssessmentService:
             self.db.flush()
 
             # Get applicable controls for the risk template
-            applicable_control_numbers = RISK_TEMPLATE_CONTROLS.get(risk_template, [])
-            applicable_controls = self.db.query(ISOControl).filter(
-                ISOControl.control_number.in_(applicable_control_numbers)
-            ).all()
+            applicable_controls = [
+                control for control in self.catalog.applicable_controls(risk_template)
+                if control.id is not None
+            ]
 
             # Create assessment responses for each applicable control
             for control in applicable_controls:
@@ -103,6 +121,10 @@ class ISOAssessmentService:
                 )
                 self.db.add(assessment_response)
 
+            # Seed the running score totals used for incremental rescoring
+            self.db.flush()
+            self.scoring.rebuild_totals(assessment.id)
+
             self.db.commit()
             return assessment
 
@@ -116,15 +138,17 @@ class ISOAssessmentService:
         if not assessment:
             raise Exception("Assessment not found")
 
-        # Get control responses with controls and questions
+        # Get control responses; control metadata comes from the catalog
         control_responses = self.db.query(AssessmentResponse).filter(
             AssessmentResponse.assessment_id == assessment_id
         ).all()
+        catalog = self.catalog
+        controls = {cr.id: catalog.control(cr.control_id) for cr in control_responses}
 
         # Calculate category progress
         category_progress = {}
         for category in ControlCategory:
-            category_controls = [cr for cr in control_responses if cr.control.category == category]
+            category_controls = [cr for cr in control_responses if controls[cr.id] and controls[cr.id].category == category.value]
             if category_controls:
                 completed = len([cr for cr in category_controls if cr.status == "completed"])
                 total = len(category_controls)
@@ -138,7 +162,7 @@ class ISOAssessmentService:
         # Calculate NIST function progress
         nist_progress = {}
         for function in NISTFunction:
-            function_controls = [cr for cr in control_responses if cr.control.nist_function == function]
+            function_controls = [cr for cr in control_responses if controls[cr.id] and controls[cr.id].nist_function == function.value]
             if function_controls:
                 completed = len([cr for cr in function_controls if cr.status == "completed"])
                 total = len(function_controls)
@@ -154,7 +178,7 @@ class ISOAssessmentService:
                 "id": assessment.id,
                 "assessment_name": assessment.assessment_name,
                 "risk_template": assessment.risk_template.value,
-                "status": assessment.status.value,
+                "status": assessment.status,
                 "overall_compliance_score": assessment.overall_compliance_score,
                 "overall_risk_score": assessment.overall_risk_score,
                 "completion_percentage": assessment.completion_percentage,
@@ -175,11 +199,9 @@ class ISOAssessmentService:
     def get_control_questionnaire(self, assessment_id: int, control_number: str) -> Dict[str, Any]:
         """Get questionnaire for a specific control"""
         # Get the control and its questions
-        control = self.db.query(ISOControl).filter(
-            ISOControl.control_number == control_number
-        ).first()
+        control = self.catalog.controls_by_number.get(control_number)
         
-        if not control:
+        if not control or control.id is None:
             raise Exception("Control not found")
 
         # Get assessment response for this control
@@ -193,15 +215,17 @@ class ISOAssessmentService:
         if not assessment_response:
             raise Exception("Assessment response not found")
 
-        # Get questions and their responses
+        # Get all responses for the control's questions in one statement
+        responses_by_question = {
+            question_response.question_id: (question_response, evidence_count)
+            for question_response, evidence_count in self._question_responses_with_evidence(
+                assessment_id, question_ids=[question.id for question in control.questions]
+            )
+        }
+
         questions_data = []
         for question in control.questions:
-            question_response = self.db.query(QuestionResponse).filter(
-                and_(
-                    QuestionResponse.assessment_id == assessment_id,
-                    QuestionResponse.question_id == question.id
-                )
-            ).first()
+            question_response, evidence_count = responses_by_question.get(question.id, (None, 0))
 
             questions_data.append({
                 "id": question.id,
@@ -216,7 +240,7 @@ class ISOAssessmentService:
                     "response_value": question_response.response_value.value if question_response else None,
                     "comments": question_response.comments if question_response else None,
                     "confidence_level": question_response.confidence_level if question_response else 5,
-                    "evidence_files": len(question_response.evidence_files) if question_response else 0
+                    "evidence_files": evidence_count
                 }
             })
 
@@ -226,8 +250,8 @@ class ISOAssessmentService:
                 "control_number": control.control_number,
                 "title": control.title,
                 "description": control.description,
-                "category": control.category.value,
-                "nist_function": control.nist_function.value,
+                "category": control.category,
+                "nist_function": control.nist_function,
                 "weight": control.weight
             },
             "assessment_response": {
@@ -243,6 +267,14 @@ class ISOAssessmentService:
     def submit_question_response(self, assessment_id: int, question_id: int, response_data: Dict[str, Any]) -> QuestionResponse:
         """Submit or update a response to a control question"""
         try:
+            question = self.catalog.question(question_id)
+            if not question:
+                raise Exception("Question not found")
+
+            # Serialize writers of this assessment's running totals until commit
+            if not self.scoring.lock_assessment(assessment_id):
+                raise Exception("Assessment not found")
+
             # Get or create question response
             question_response = self.db.query(QuestionResponse).filter(
                 and_(
@@ -251,9 +283,18 @@ class ISOAssessmentService:
                 )
             ).first()
 
+            new_value = ResponseValue(response_data["response_value"])
+            is_new_response = question_response is None
+            old_value = None
+            has_evidence = False
+
             if question_response:
                 # Update existing response
-                question_response.response_value = ResponseValue(response_data["response_value"])
+                old_value = question_response.response_value
+                has_evidence = self.db.query(EvidenceFile.id).filter(
+                    EvidenceFile.question_response_id == question_response.id
+                ).first() is not None
+                question_response.response_value = new_value
                 question_response.comments = response_data.get("comments")
                 question_response.confidence_level = response_data.get("confidence_level", 5)
             else:
@@ -261,7 +302,7 @@ class ISOAssessmentService:
                 question_response = QuestionResponse(
                     assessment_id=assessment_id,
                     question_id=question_id,
-                    response_value=ResponseValue(response_data["response_value"]),
+                    response_value=new_value,
                     comments=response_data.get("comments"),
                     confidence_level=response_data.get("confidence_level", 5)
                 )
@@ -269,11 +310,11 @@ class ISOAssessmentService:
 
             self.db.flush()
 
-            # Recalculate scores for the control
-            self._recalculate_control_scores(assessment_id, question_response.question.control_id)
-            
-            # Recalculate overall assessment scores
-            self._recalculate_assessment_scores(assessment_id)
+            # Apply only the delta to the control, category and NIST function totals
+            self.scoring.apply_question_change(
+                assessment_id, question, old_value, new_value,
+                has_evidence=has_evidence, is_new_response=is_new_response
+            )
 
             self.db.commit()
             return question_response
@@ -282,150 +323,198 @@ class ISOAssessmentService:
             self.db.rollback()
             raise Exception(f"Failed to submit question response: {str(e)}")
 
-    def _recalculate_control_scores(self, assessment_id: int, control_id: int):
-        """Recalculate scores for a specific control"""
-        # Get all question responses for this control
-        question_responses = self.db.query(QuestionResponse).join(ControlQuestion).filter(
+    def add_question_evidence(self, assessment_id: int, question_id: int, source: BinaryIO,
+                              filename: str, content_type: str) -> EvidenceFile:
+        """
+        Attach an evidence file to an answered question. The file is streamed into content-addressed
+        storage; the first evidence on a response rescores its control.
+        """
+        question = self.catalog.question(question_id)
+        if not question:
+            raise ValueError("Question not found")
+
+        question_response = self.db.query(QuestionResponse).filter(
             and_(
                 QuestionResponse.assessment_id == assessment_id,
-                ControlQuestion.control_id == control_id
+                QuestionResponse.question_id == question_id
             )
-        ).all()
-
-        if not question_responses:
-            return
+        ).first()
+        if not question_response:
+            raise ValueError("Answer the question before attaching evidence")
 
-        # Calculate compliance score
-        total_weight = 0
-        weighted_score = 0
-        answered_questions = 0
-
-        for qr in question_responses:
-            if qr.response_value != ResponseValue.NOT_APPLICABLE:
-                total_weight += qr.question.weight
-                answered_questions += 1
-
-                # Score calculation based on response and evidence
-                if qr.response_value == ResponseValue.YES:
-                    # Check if evidence is provided when required
-                    has_evidence = len(qr.evidence_files) > 0
-                    if qr.question.requires_evidence and has_evidence:
-                        score = 100  # Full score
-                    elif qr.question.requires_evidence and not has_evidence:
-                        score = 75   # Reduced score for missing evidence
-                    else:
-                        score = 100  # Full score when evidence not required
-                elif qr.response_value == ResponseValue.PARTIAL:
-                    score = 50   # Partial implementation
-                else:  # NO
-                    score = 0    # No implementation
-
-                weighted_score += score * qr.question.weight
-
-        # Calculate final scores
-        compliance_score = (weighted_score / total_weight) if total_weight > 0 else 0
-        completion_percentage = (answered_questions / len(question_responses)) * 100 if question_responses else 0
-
-        # Calculate risk score (inverse of compliance, adjusted by NIST function)
-        control = self.db.query(ISOControl).filter(ISOControl.id == control_id).first()
-        nist_weight = NIST_FUNCTION_WEIGHTS.get(control.nist_function.value, 1.0)
-        risk_score = (100 - compliance_score) * nist_weight
-
-        # Update assessment response
-        assessment_response = self.db.query(AssessmentResponse).filter(
-            and_(
-                AssessmentResponse.assessment_id == assessment_id,
-                AssessmentResponse.control_id == control_id
+        try:
+            self.scoring.lock_assessment(assessment_id)
+            had_evidence = self.db.query(EvidenceFile.id).filter(
+                EvidenceFile.question_response_id == question_response.id
+            ).first() is not None
+
+            stored = EvidenceStorageService(self.db).store(source)
+            original_filename = os.path.basename(filename or "evidence")
+            evidence_file = EvidenceFile(
+                question_response_id=question_response.id,
+                filename=re.sub(r"[^A-Za-z0-9._-]", "_", original_filename)[:255],
+                original_filename=original_filename[:255],
+                file_path=stored.storage_key,
+                file_size=stored.size,
+                file_type=content_type,
+                file_hash=stored.sha256
             )
+            previews = EvidencePreviewService(self.db)
+            render_preview = previews.prepare(evidence_file)
+            self.db.add(evidence_file)
+            self.db.flush()
+
+            if not had_evidence and question.requires_evidence:
+                self.scoring.recalculate_assessment(assessment_id, [question.control_id])
+
+            self.db.commit()
+            if render_preview:
+                previews.enqueue(evidence_file)
+            return evidence_file
+
+        except EvidenceTooLarge:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Failed to attach evidence: {str(e)}")
+
+    def delete_question_evidence(self, assessment_id: int, evidence_file_id: int) -> None:
+        """
+        Remove an evidence file from a question and release its stored content (deleted later by
+        scripts/collect_evidence_garbage.py); removing the last evidence on a response rescores its control.
+        """
+        row = self.db.query(EvidenceFile, QuestionResponse.question_id).join(QuestionResponse).filter(
+            EvidenceFile.id == evidence_file_id,
+            QuestionResponse.assessment_id == assessment_id
         ).first()
+        if not row:
+            raise ValueError("Evidence file not found")
+        evidence_file, question_id = row
 
-        if assessment_response:
-            assessment_response.compliance_score = compliance_score
-            assessment_response.completion_percentage = completion_percentage
-            assessment_response.risk_score = min(risk_score, 100)  # Cap at 100
-            
-            # Update status
-            if completion_percentage == 100:
-                assessment_response.status = "completed"
-            elif completion_percentage > 0:
-                assessment_response.status = "in_progress"
-            else:
-                assessment_response.status = "not_started"
+        try:
+            self.scoring.lock_assessment(assessment_id)
+            question_response_id = evidence_file.question_response_id
+            if evidence_file.file_hash:
+                EvidenceStorageService(self.db).release(evidence_file.file_hash)
+            self.db.delete(evidence_file)
+            self.db.flush()
 
-    def _recalculate_assessment_scores(self, assessment_id: int):
-        """Recalculate overall assessment scores"""
-        assessment = self.db.query(Assessment).filter(Assessment.id == assessment_id).first()
-        if not assessment:
-            return
+            has_evidence = self.db.query(EvidenceFile.id).filter(
+                EvidenceFile.question_response_id == question_response_id
+            ).first() is not None
+            question = self.catalog.question(question_id)
+            if not has_evidence and question and question.requires_evidence:
+                self.scoring.recalculate_assessment(assessment_id, [question.control_id])
 
-        # Get all control responses
-        control_responses = self.db.query(AssessmentResponse).filter(
-            AssessmentResponse.assessment_id == assessment_id
-        ).all()
+            self.db.commit()
 
-        if not control_responses:
-            return
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Failed to delete evidence: {str(e)}")
 
-        # Calculate weighted overall scores
-        total_weight = 0
-        weighted_compliance = 0
-        weighted_risk = 0
-        completed_controls = 0
-
-        for cr in control_responses:
-            control_weight = cr.control.weight * CATEGORY_WEIGHTS.get(cr.control.category.value, 1.0)
-            total_weight += control_weight
-            weighted_compliance += cr.compliance_score * control_weight
-            weighted_risk += cr.risk_score * control_weight
-            
-            if cr.status == "completed":
-                completed_controls += 1
-
-        # Update assessment scores
-        if total_weight > 0:
-            assessment.overall_compliance_score = weighted_compliance / total_weight
-            assessment.overall_risk_score = weighted_risk / total_weight
-
-        assessment.completion_percentage = (completed_controls / len(control_responses)) * 100 if control_responses else 0
-
-        # Calculate NIST function scores
-        self._calculate_nist_function_scores(assessment_id)
-
-        # Update status
-        if assessment.completion_percentage == 100:
-            assessment.status = "completed"
-        elif assessment.completion_percentage > 0:
-            assessment.status = "in_progress"
-
-    def _calculate_nist_function_scores(self, assessment_id: int):
-        """Calculate scores for each NIST AI RMF function"""
-        assessment = self.db.query(Assessment).filter(Assessment.id == assessment_id).first()
-        if not assessment:
+    def submit_question_responses(self, assessment_id: int, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Submit a batch of question responses in one transaction.
+        Upserts all responses, rescoring the touched controls and the assessment exactly once.
+        """
+        try:
+            # Serialize writers of this assessment's running totals until commit
+            if not self.scoring.lock_assessment(assessment_id):
+                raise Exception("Assessment not found")
+
+            # Later entries for the same question win
+            rows = {}
+            for response_data in responses:
+                question_id = int(response_data["question_id"])
+                rows[question_id] = {
+                    "assessment_id": assessment_id,
+                    "question_id": question_id,
+                    "response_value": ResponseValue(response_data["response_value"]),
+                    "comments": response_data.get("comments"),
+                    "confidence_level": response_data.get("confidence_level", 5)
+                }
+
+            if not rows:
+                return {"assessment_id": assessment_id, "submitted": 0, "controls_rescored": 0}
+
+            catalog = self.catalog
+            question_controls = {
+                question_id: catalog.question(question_id).control_id
+                for question_id in rows if catalog.question(question_id)
+            }
+            unknown_questions = sorted(set(rows) - set(question_controls))
+            if unknown_questions:
+                raise Exception(f"Questions not found: {unknown_questions}")
+
+            self._upsert_question_responses(assessment_id, list(rows.values()))
+
+            # Recompute only the touched controls, then the assessment and NIST scores once
+            touched_controls = set(question_controls.values())
+            self.scoring.recalculate_assessment(assessment_id, touched_controls)
+
+            self.db.commit()
+            return {
+                "assessment_id": assessment_id,
+                "submitted": len(rows),
+                "controls_rescored": len(touched_controls)
+            }
+
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Failed to submit question responses: {str(e)}")
+
+    def _upsert_question_responses(self, assessment_id: int, rows: List[Dict[str, Any]]):
+        """Insert or update question responses with a single statement where the database allows it"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+
+            stmt = insert(QuestionResponse).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[QuestionResponse.assessment_id, QuestionResponse.question_id],
+                set_={
+                    "response_value": stmt.excluded.response_value,
+                    "comments": stmt.excluded.comments,
+                    "confidence_level": stmt.excluded.confidence_level,
+                    "updated_at": func.now()
+                }
+            )
+            self.db.execute(stmt)
             return
 
-        function_scores = {}
-        
-        for function in NISTFunction:
-            # Get control responses for this NIST function
-            control_responses = self.db.query(AssessmentResponse).join(ISOControl).filter(
-                and_(
-                    AssessmentResponse.assessment_id == assessment_id,
-                    ISOControl.nist_function == function
-                )
-            ).all()
+        # SQLite and others: one lookup, then bulk insert/update mappings
+        existing = dict(self.db.query(QuestionResponse.question_id, QuestionResponse.id).filter(
+            QuestionResponse.assessment_id == assessment_id,
+            QuestionResponse.question_id.in_([row["question_id"] for row in rows])
+        ).all())
 
-            if control_responses:
-                total_weight = sum(cr.control.weight for cr in control_responses)
-                weighted_score = sum(cr.compliance_score * cr.control.weight for cr in control_responses)
-                function_scores[function.value] = weighted_score / total_weight if total_weight > 0 else 0
-            else:
-                function_scores[function.value] = 0
+        inserts = [row for row in rows if row["question_id"] not in existing]
+        updates = [dict(row, id=existing[row["question_id"]]) for row in rows if row["question_id"] in existing]
+
+        if inserts:
+            self.db.bulk_insert_mappings(QuestionResponse, inserts)
+        if updates:
+            self.db.bulk_update_mappings(QuestionResponse, updates)
 
-        # Update assessment with NIST function scores
-        assessment.govern_score = function_scores.get("govern", 0)
-        assessment.map_score = function_scores.get("map", 0)
-        assessment.measure_score = function_scores.get("measure", 0)
-        assessment.manage_score = function_scores.get("manage", 0)
+    def _recalculate_control_scores(self, assessment_id: int, control_id: int):
+        """Recalculate scores for a specific control from all of its question responses"""
+        self.scoring.recalculate_controls(assessment_id, [control_id])
+
+    def _recalculate_assessment_scores(self, assessment_id: int):
+        """Recalculate overall assessment scores, including NIST function scores"""
+        self.db.flush()
+        self.scoring.rebuild_totals(assessment_id)
+
+    def recalculate_scores(self, assessment_id: int) -> List[Dict[str, Any]]:
+        """Full recomputation of all scores for an assessment; returns discrepancies found beforehand"""
+        try:
+            discrepancies = self.scoring.check_consistency(assessment_id)
+            self.scoring.recalculate_assessment(assessment_id)
+            self.db.commit()
+            return discrepancies
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Failed to recalculate scores: {str(e)}")
 
     def get_gap_analysis(self, assessment_id: int) -> Dict[str, Any]:
         """Generate comprehensive gap analysis report"""
@@ -433,48 +522,55 @@ class ISOAssessmentService:
         if not assessment:
             raise Exception("Assessment not found")
 
-        # Get all control responses with details
-        control_responses = self.db.query(AssessmentResponse).join(ISOControl).filter(
+        # Get all control responses; control metadata comes from the catalog
+        control_responses = self.db.query(AssessmentResponse).filter(
             AssessmentResponse.assessment_id == assessment_id
         ).all()
+        catalog = self.catalog
+
+        # Consider anything below 80% as a gap
+        gapped_responses = [
+            cr for cr in control_responses
+            if cr.compliance_score < 80 and catalog.control(cr.control_id)
+        ]
+
+        # Fetch the failing question responses for every gapped control at once
+        gap_details_by_control = {cr.control_id: [] for cr in gapped_responses}
+        if gapped_responses:
+            for qr, evidence_count in self._question_responses_with_evidence(
+                assessment_id,
+                control_ids=list(gap_details_by_control),
+                response_values=[ResponseValue.NO, ResponseValue.PARTIAL]
+            ):
+                question = catalog.question(qr.question_id)
+                gap_details_by_control[question.control_id].append({
+                    "question": question.question_text,
+                    "response": qr.response_value.value,
+                    "guidance": question.guidance,
+                    "evidence_required": question.requires_evidence,
+                    "evidence_provided": evidence_count > 0
+                })
 
         gaps = []
         recommendations = []
 
-        for cr in control_responses:
-            if cr.compliance_score < 80:  # Consider anything below 80% as a gap
-                # Get question responses to identify specific gaps
-                question_responses = self.db.query(QuestionResponse).join(ControlQuestion).filter(
-                    and_(
-                        QuestionResponse.assessment_id == assessment_id,
-                        ControlQuestion.control_id == cr.control_id
-                    )
-                ).all()
-
-                gap_details = []
-                for qr in question_responses:
-                    if qr.response_value in [ResponseValue.NO, ResponseValue.PARTIAL]:
-                        gap_details.append({
-                            "question": qr.question.question_text,
-                            "response": qr.response_value.value,
-                            "guidance": qr.question.guidance,
-                            "evidence_required": qr.question.requires_evidence,
-                            "evidence_provided": len(qr.evidence_files) > 0
-                        })
-
-                gaps.append({
-                    "control_number": cr.control.control_number,
-                    "control_title": cr.control.title,
-                    "category": cr.control.category.value,
-                    "nist_function": cr.control.nist_function.value,
-                    "compliance_score": cr.compliance_score,
-                    "risk_score": cr.risk_score,
-                    "gap_severity": self._calculate_gap_severity(cr.compliance_score, cr.control.weight),
-                    "gap_details": gap_details
-                })
+        for cr in gapped_responses:
+            control = catalog.control(cr.control_id)
+            gap_details = gap_details_by_control[cr.control_id]
 
-                # Generate recommendations
-                recommendations.extend(self._generate_recommendations(cr.control, gap_details))
+            gaps.append({
+                "control_number": control.control_number,
+                "control_title": control.title,
+                "category": control.category,
+                "nist_function": control.nist_function,
+                "compliance_score": cr.compliance_score,
+                "risk_score": cr.risk_score,
+                "gap_severity": self._calculate_gap_severity(cr.compliance_score, control.weight),
+                "gap_details": gap_details
+            })
+
+            # Generate recommendations
+            recommendations.extend(self._generate_recommendations(control, gap_details))
 
         return {
             "assessment_summary": {
@@ -498,6 +594,35 @@ class ISOAssessmentService:
             "remediation_priority": self._prioritize_remediation(gaps)
         }
 
+    def _question_responses_with_evidence(self, assessment_id: int,
+                                          question_ids: Optional[List[int]] = None,
+                                          control_ids: Optional[List[int]] = None,
+                                          response_values: Optional[List[ResponseValue]] = None):
+        """Fetch question responses with their evidence file count in one statement"""
+        if control_ids is not None:
+            catalog = self.catalog
+            control_question_ids = [
+                question.id
+                for control_id in control_ids if catalog.control(control_id)
+                for question in catalog.control(control_id).questions
+            ]
+            if question_ids is not None:
+                requested = set(question_ids)
+                control_question_ids = [question_id for question_id in control_question_ids if question_id in requested]
+            question_ids = control_question_ids
+
+        query = self.db.query(
+            QuestionResponse,
+            evidence_count_subquery()
+        ).filter(QuestionResponse.assessment_id == assessment_id)
+
+        if question_ids is not None:
+            query = query.filter(QuestionResponse.question_id.in_(question_ids))
+        if response_values is not None:
+            query = query.filter(QuestionResponse.response_value.in_(response_values))
+
+        return query.order_by(QuestionResponse.question_id).all()
+
     def _calculate_gap_severity(self, compliance_score: float, control_weight: float) -> str:
         """Calculate gap severity based on compliance score and control weight"""
         impact_score = (100 - compliance_score) * control_weight
@@ -511,7 +636,7 @@ class ISOAssessmentService:
         else:
             return "low"
 
-    def _generate_recommendations(self, control: ISOControl, gap_details: List[Dict]) -> List[Dict]:
+    def _generate_recommendations(self, control: CatalogControl, gap_details: List[Dict]) -> List[Dict]:
         """Generate specific recommendations for addressing gaps"""
         recommendations = []
         
@@ -0,0 +1,121 @@
+"""
+AI Model Risk Scoring
+Risk factor tables and a vectorized scorer shared by single-model scoring on create/update and
+inventory-wide re-scoring
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+import re
+import numpy as np
+
+from ..models.ai_model import ModelType, ModelStatus, RiskLevel
+
+TYPE_RISK_FACTORS = {
+    ModelType.GENERATIVE_AI: 30,
+    ModelType.DEEP_LEARNING: 25,
+    ModelType.NATURAL_LANGUAGE: 20,
+    ModelType.COMPUTER_VISION: 15,
+    ModelType.RECOMMENDATION: 15,
+    ModelType.PREDICTIVE_ANALYTICS: 10,
+    ModelType.MACHINE_LEARNING: 10,
+    ModelType.DECISION_SUPPORT: 20,
+    ModelType.OTHER: 15
+}
+DEFAULT_TYPE_RISK = 15
+
+DATA_CLASSIFICATION_RISK_FACTORS = {
+    'Restricted': 25,
+    'Confidential': 20,
+    'Internal': 10,
+    'Public': 5
+}
+DEFAULT_DATA_CLASSIFICATION_RISK = 10
+
+# Production models carry more risk
+STATUS_RISK_FACTORS = {
+    ModelStatus.PRODUCTION: 20,
+    ModelStatus.STAGING: 10
+}
+
+# Customer-facing business purposes add risk
+CUSTOMER_FACING_KEYWORDS = ('customer', 'public', 'external', 'user-facing')
+CUSTOMER_FACING_RISK = 15
+CUSTOMER_FACING_PATTERN = re.compile('|'.join(map(re.escape, CUSTOMER_FACING_KEYWORDS)), re.IGNORECASE)
+
+# Component risks as a share of the overall score
+BIAS_RISK_FACTOR = 0.8
+PRIVACY_RISK_FACTOR = 0.9
+SECURITY_RISK_FACTOR = 0.7
+
+# Lower bounds of LOW, MEDIUM, HIGH and CRITICAL
+RISK_LEVEL_THRESHOLDS = np.array([20.0, 40.0, 60.0, 80.0])
+RISK_LEVELS = (RiskLevel.MINIMAL, RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+
+
+def _factor_column(values: Sequence[Any], factor: Callable[[Any], float]) -> np.ndarray:
+    """Per-row factor; columns repeat a handful of values, so each distinct value is looked up once"""
+    codes: Dict[Any, int] = {}
+    index = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64, count=len(values))
+    table = np.array([factor(value) for value in codes] or [0.0], dtype=np.float64)
+    return table[index]
+
+
+def score_risk_batch(model_types: Sequence[Any], data_classifications: Sequence[Any],
+                     statuses: Sequence[Any], business_purposes: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Risk scores for many models, one entry per model in each input column.
+    Returns arrays risk_score, bias_risk, privacy_risk, security_risk and the list risk_level.
+    """
+    score = (
+        _factor_column(model_types, lambda value: TYPE_RISK_FACTORS.get(value, DEFAULT_TYPE_RISK) if value else 0)
+        + _factor_column(
+            data_classifications,
+            lambda value: DATA_CLASSIFICATION_RISK_FACTORS.get(value, DEFAULT_DATA_CLASSIFICATION_RISK) if value else 0
+        )
+        + _factor_column(statuses, lambda value: STATUS_RISK_FACTORS.get(value, 0))
+        + CUSTOMER_FACING_RISK * np.fromiter(
+            (bool(purpose and CUSTOMER_FACING_PATTERN.search(purpose)) for purpose in business_purposes),
+            dtype=bool, count=len(business_purposes)
+        )
+    )
+
+    risk_score = np.minimum(score, 100.0)
+    levels = np.searchsorted(RISK_LEVEL_THRESHOLDS, risk_score, side='right')
+    return {
+        'risk_score': risk_score,
+        'bias_risk': np.minimum(score * BIAS_RISK_FACTOR, 100.0),
+        'privacy_risk': np.minimum(score * PRIVACY_RISK_FACTOR, 100.0),
+        'security_risk': np.minimum(score * SECURITY_RISK_FACTOR, 100.0),
+        'risk_level': [RISK_LEVELS[level] for level in levels.tolist()]
+    }
+
+
+def score_risk(model_type: Any, data_classification: Any, status: Any, business_purpose: Any) -> Dict[str, Any]:
+    """Risk scores of a single model"""
+    scores = score_risk_batch([model_type], [data_classification], [status], [business_purpose])
+    return {
+        key: value[0] if key == 'risk_level' else float(value[0])
+        for key, value in scores.items()
+    }
+
+
+def changed_rows(ids: Iterable[int], current: Dict[str, Sequence[Any]], scores: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Update mappings for the rows whose stored risk differs from the new scores"""
+    ids = np.fromiter(ids, dtype=np.int64)
+    changed = np.zeros(ids.size, dtype=bool)
+    for key in ('risk_score', 'bias_risk', 'privacy_risk', 'security_risk'):
+        stored = np.array([np.nan if value is None else value for value in current[key]], dtype=np.float64)
+        changed |= ~np.isclose(stored, scores[key])
+    changed |= np.array([stored != new for stored, new in zip(current['risk_level'], scores['risk_level'])], dtype=bool)
+
+    return [
+        {
+            'id': int(ids[row]),
+            'risk_score': float(scores['risk_score'][row]),
+            'bias_risk': float(scores['bias_risk'][row]),
+            'privacy_risk': float(scores['privacy_risk'][row]),
+            'security_risk': float(scores['security_risk'][row]),
+            'risk_level': scores['risk_level'][row]
+        }
+        for row in np.flatnonzero(changed).tolist()
+    ]
@@ -0,0 +1,230 @@
+"""
+ISO 42001 Vectorized Scoring Kernel
+Scores many assessments at once with NumPy segment reductions over flat response arrays
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
+
+from ..models.iso_control import ResponseValue
+from ..data.iso_42001_controls import NIST_FUNCTION_WEIGHTS, CATEGORY_WEIGHTS
+from .control_catalog import ControlCatalog
+
+# Integer codes for response values; anything else is treated as not scored
+RESPONSE_CODES = {
+    ResponseValue.NO: 0,
+    ResponseValue.PARTIAL: 1,
+    ResponseValue.YES: 2,
+    ResponseValue.NOT_APPLICABLE: 3
+}
+_CODE_SCORES = np.array([0.0, 50.0, 100.0, 0.0])
+_NOT_SCORED = RESPONSE_CODES[ResponseValue.NOT_APPLICABLE]
+_YES = RESPONSE_CODES[ResponseValue.YES]
+
+# Score given to a YES answer whose required evidence is missing
+YES_WITHOUT_EVIDENCE_SCORE = 75.0
+
+STATUS_NOT_STARTED, STATUS_IN_PROGRESS, STATUS_COMPLETED = 0, 1, 2
+STATUS_NAMES = ("not_started", "in_progress", "completed")
+
+
+class ScoringKernel:
+    """
+    Array form of the control catalog plus the scoring formulas of AssessmentScoringEngine.
+    Inputs and outputs are flat arrays so callers can load and write back rows in bulk.
+    """
+
+    def __init__(self, catalog: ControlCatalog,
+                 category_weights: Optional[Dict[str, float]] = None,
+                 nist_weights: Optional[Dict[str, float]] = None):
+        category_weights = CATEGORY_WEIGHTS if category_weights is None else category_weights
+        nist_weights = NIST_FUNCTION_WEIGHTS if nist_weights is None else nist_weights
+
+        controls = [control for control in catalog.controls if control.id is not None]
+        self.categories: List[str] = sorted({control.category for control in controls})
+        self.nist_functions: List[str] = list(NIST_FUNCTION_WEIGHTS)
+        for control in controls:
+            if control.nist_function not in self.nist_functions:
+                self.nist_functions.append(control.nist_function)
+
+        # Control arrays, indexed by dense control position
+        self.control_ids = np.array([control.id for control in controls], dtype=np.int64)
+        self.control_weight = np.array([control.weight for control in controls], dtype=np.float64)
+        self.control_combined_weight = np.array(
+            [control.weight * category_weights.get(control.category, 1.0) for control in controls],
+            dtype=np.float64
+        )
+        self.control_nist_weight = np.array(
+            [nist_weights.get(control.nist_function, 1.0) for control in controls], dtype=np.float64
+        )
+        self.control_category = np.array(
+            [self.categories.index(control.category) for control in controls], dtype=np.int64
+        )
+        self.control_nist = np.array(
+            [self.nist_functions.index(control.nist_function) for control in controls], dtype=np.int64
+        )
+        self._control_pos = self._lookup(self.control_ids)
+
+        # Question arrays, indexed by dense question position
+        questions = [
+            (question, position)
+            for position, control in enumerate(controls)
+            for question in control.questions if question.id is not None
+        ]
+        question_ids = np.array([question.id for question, _ in questions], dtype=np.int64)
+        self.question_control = np.array([position for _, position in questions], dtype=np.int64)
+        self.question_weight = np.array([question.weight or 0.0 for question, _ in questions], dtype=np.float64)
+        self.question_requires_evidence = np.array(
+            [bool(question.requires_evidence) for question, _ in questions], dtype=bool
+        )
+        self._question_pos = self._lookup(question_ids)
+
+    @staticmethod
+    def _lookup(ids: np.ndarray) -> np.ndarray:
+        """Dense id -> position table; unknown ids map to -1"""
+        table = np.full(int(ids.max()) + 1 if ids.size else 1, -1, dtype=np.int64)
+        table[ids] = np.arange(ids.size)
+        return table
+
+    @staticmethod
+    def _positions(table: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        positions = np.full(ids.shape, -1, dtype=np.int64)
+        known = (ids >= 0) & (ids < table.size)
+        positions[known] = table[ids[known]]
+        return positions
+
+    @staticmethod
+    def encode_responses(values: Sequence[Optional[ResponseValue]]) -> np.ndarray:
+        """Encode response values as kernel codes (missing values are not scored)"""
+        return np.fromiter(
+            (RESPONSE_CODES.get(value, _NOT_SCORED) for value in values), dtype=np.int8, count=len(values)
+        )
+
+    def score(self, assessment_ids: np.ndarray,
+              response_assessment_ids: np.ndarray, response_question_ids: np.ndarray,
+              response_codes: np.ndarray, response_has_evidence: np.ndarray,
+              control_assessment_ids: np.ndarray, control_control_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score assessments from flat arrays.
+        response_* arrays hold one entry per question response; control_* arrays hold one entry per
+        assessment response (control row). Returns per-control-row and per-assessment arrays.
+        """
+        assessment_ids = np.unique(assessment_ids)
+        n_assessments = assessment_ids.size
+        n_controls = self.control_ids.size
+
+        # Question responses -> (assessment, control) segments
+        question_pos = self._positions(self._question_pos, response_question_ids)
+        response_assessment_pos = np.searchsorted(assessment_ids, response_assessment_ids)
+        valid = (question_pos >= 0) & (response_assessment_pos < n_assessments)
+        valid[valid] = assessment_ids[response_assessment_pos[valid]] == response_assessment_ids[valid]
+        question_pos = question_pos[valid]
+        codes = response_codes[valid]
+
+        scored = codes != _NOT_SCORED
+        question_scores = _CODE_SCORES[codes]
+        missing_evidence = (codes == _YES) & self.question_requires_evidence[question_pos] & ~response_has_evidence[valid]
+        question_scores[missing_evidence] = YES_WITHOUT_EVIDENCE_SCORE
+        weights = np.where(scored, self.question_weight[question_pos], 0.0)
+
+        segment = response_assessment_pos[valid] * n_controls + self.question_control[question_pos]
+        size = n_assessments * n_controls
+        # bincount returns int64 for empty input even with weights, so pin the dtype for np.divide below
+        weighted_sum = np.bincount(segment, weights=question_scores * weights, minlength=size).astype(np.float64)
+        weight_total = np.bincount(segment, weights=weights, minlength=size).astype(np.float64)
+        answered = np.bincount(segment, weights=scored.astype(np.float64), minlength=size).astype(np.int64)
+        responses = np.bincount(segment, minlength=size)
+
+        # Gather segments onto control rows
+        control_pos = self._positions(self._control_pos, control_control_ids)
+        control_assessment_pos = np.searchsorted(assessment_ids, control_assessment_ids)
+        rows = (control_pos >= 0) & (control_assessment_pos < n_assessments)
+        rows[rows] = assessment_ids[control_assessment_pos[rows]] == control_assessment_ids[rows]
+        row_control = control_pos[rows]
+        row_assessment = control_assessment_pos[rows]
+        row_segment = row_assessment * n_controls + row_control
+
+        row_weighted = weighted_sum[row_segment]
+        row_weight = weight_total[row_segment]
+        row_answered = answered[row_segment]
+        row_responses = responses[row_segment]
+        has_responses = row_responses > 0
+
+        compliance = np.divide(row_weighted, row_weight, out=np.zeros_like(row_weighted), where=row_weight > 0)
+        completion = np.divide(
+            row_answered, row_responses, out=np.zeros(row_answered.shape), where=has_responses
+        ) * 100
+        risk = np.where(
+            has_responses, np.minimum((100 - compliance) * self.control_nist_weight[row_control], 100), 0.0
+        )
+        status = np.where(
+            completion == 100, STATUS_COMPLETED, np.where(completion > 0, STATUS_IN_PROGRESS, STATUS_NOT_STARTED)
+        )
+        completed = status == STATUS_COMPLETED
+
+        return {
+            "assessment_ids": assessment_ids,
+            "rows": rows,
+            "weighted_sum": row_weighted,
+            "weight_total": row_weight,
+            "answered": row_answered,
+            "responses": row_responses,
+            "compliance": compliance,
+            "completion": completion,
+            "risk": risk,
+            "status": status,
+            "overall": self._buckets(
+                row_assessment, n_assessments, compliance, risk, completed,
+                self.control_combined_weight[row_control]
+            ),
+            "category": self._buckets(
+                row_assessment * len(self.categories) + self.control_category[row_control],
+                n_assessments * len(self.categories), compliance, risk, completed,
+                self.control_combined_weight[row_control]
+            ),
+            "nist": self._buckets(
+                row_assessment * len(self.nist_functions) + self.control_nist[row_control],
+                n_assessments * len(self.nist_functions), compliance, risk, completed,
+                self.control_weight[row_control]
+            )
+        }
+
+    @staticmethod
+    def _buckets(segment: np.ndarray, size: int, compliance: np.ndarray, risk: np.ndarray,
+                 completed: np.ndarray, weight: np.ndarray) -> Dict[str, np.ndarray]:
+        """Segment sums matching the running-total buckets of AssessmentScoringEngine"""
+        return {
+            "score_sum": np.bincount(segment, weights=compliance, minlength=size),
+            "weighted_score": np.bincount(segment, weights=compliance * weight, minlength=size),
+            "weighted_risk": np.bincount(segment, weights=risk * weight, minlength=size),
+            "weight": np.bincount(segment, weights=weight, minlength=size),
+            "completed": np.bincount(segment, weights=completed.astype(np.float64), minlength=size).astype(np.int64),
+            "controls": np.bincount(segment, minlength=size)
+        }
+
+    def totals(self, result: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Convert kernel buckets into score_totals dicts, one per assessment (in assessment_ids order)"""
+        n_assessments = result["assessment_ids"].size
+
+        def bucket_lists(buckets, width):
+            return {key: values.reshape(n_assessments, width).tolist() for key, values in buckets.items()}
+
+        overall = bucket_lists(result["overall"], 1)
+        category = bucket_lists(result["category"], len(self.categories))
+        nist = bucket_lists(result["nist"], len(self.nist_functions))
+
+        def named(buckets, index, names):
+            return {
+                name: {key: buckets[key][index][position] for key in buckets}
+                for position, name in enumerate(names)
+                if buckets["controls"][index][position] > 0
+            }
+
+        return [
+            {
+                "overall": {key: overall[key][index][0] for key in overall},
+                "category": named(category, index, self.categories),
+                "nist": named(nist, index, self.nist_functions)
+            }
+            for index in range(n_assessments)
+        ]
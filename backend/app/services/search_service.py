@@ -0,0 +1,235 @@
+"""
+Search Service
+Ranked substring, prefix and typo-tolerant lookup for admin user and organization search.
+PostgreSQL uses pg_trgm GIN indexes, SQLite an FTS5 trigram shadow table kept in sync by triggers;
+other databases fall back to LIKE.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import Float, Integer, bindparam, case, func, literal, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+import math
+import threading
+
+from ..models.user import User
+from ..models.organization import Organization
+
+logger = logging.getLogger(__name__)
+
+BACKEND_TRIGRAM = "trigram"
+BACKEND_FTS5 = "fts5"
+BACKEND_LIKE = "like"
+
+# Trigram matching needs at least three characters; shorter terms use LIKE
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+# Share of the term's trigrams a column must contain for a fuzzy FTS5 match
+# (PostgreSQL uses the pg_trgm % operator and its similarity_threshold instead)
+FUZZY_MIN_TRIGRAM_OVERLAP = 0.5
+
+
+class SearchTarget:
+    def __init__(self, model, table: str, columns: Sequence[str]):
+        self.model = model
+        self.table = table
+        self.columns = tuple(columns)
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+    def column(self, name: str):
+        return getattr(self.model, name)
+
+
+SEARCH_TARGETS: Dict[str, SearchTarget] = {
+    "users": SearchTarget(User, "users", ("name", "email", "organization")),
+    "organizations": SearchTarget(Organization, "organizations", ("name", "domain"))
+}
+
+# Detected backend per (database, table)
+_backends: Dict[Tuple[str, str], str] = {}
+_backends_lock = threading.Lock()
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _trigrams(term: str) -> List[str]:
+    term = term.lower()
+    return sorted({term[i:i + 3] for i in range(len(term) - 2)})
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def backend(self, target: SearchTarget) -> str:
+        """Search backend available for target on the current database"""
+        bind = self.db.get_bind()
+        key = (str(bind.url), target.table)
+        backend = _backends.get(key)
+        if backend is None:
+            backend = self._detect_backend(target)
+            with _backends_lock:
+                _backends[key] = backend
+        return backend
+
+    def _detect_backend(self, target: SearchTarget) -> str:
+        dialect = self.db.get_bind().dialect.name
+        try:
+            if dialect == "postgresql":
+                installed = self.db.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                ).scalar()
+                return BACKEND_TRIGRAM if installed else BACKEND_LIKE
+            if dialect == "sqlite":
+                exists = self.db.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": target.fts_table}
+                ).scalar()
+                return BACKEND_FTS5 if exists else BACKEND_LIKE
+        except SQLAlchemyError as e:
+            logger.warning(f"Search backend detection failed for {target.table}: {e}")
+        return BACKEND_LIKE
+
+    def filter(self, query: Query, target_name: str, term: str, columns: Optional[Sequence[str]] = None,
+               fuzzy: bool = True) -> Tuple[Query, Any]:
+        """
+        Restrict query to rows matching term in columns (all searchable columns by default).
+        Returns the filtered query and a relevance expression (higher is better).
+        """
+        target = SEARCH_TARGETS[target_name]
+        columns = tuple(columns or target.columns)
+        term = term.strip()
+        backend = self.backend(target)
+        if len(term) < MIN_TRIGRAM_TERM_LENGTH:
+            backend = BACKEND_LIKE
+
+        if backend == BACKEND_FTS5:
+            return self._fts_filter(query, target, term, columns, fuzzy)
+        return self._like_filter(query, target, term, columns, fuzzy and backend == BACKEND_TRIGRAM)
+
+    def search(self, query: Query, target_name: str, term: str, limit: int, offset: int = 0) -> List[Any]:
+        """Matching rows ordered by relevance"""
+        target = SEARCH_TARGETS[target_name]
+        query, rank = self.filter(query, target_name, term)
+        return query.order_by(rank.desc(), target.model.id).offset(offset).limit(limit).all()
+
+    @staticmethod
+    def _boosts(target: SearchTarget, term: str, columns: Sequence[str]):
+        """Prefix matches outrank substring matches, which outrank fuzzy matches"""
+        escaped = _escape_like(term)
+        prefix = or_(*[target.column(c).ilike(f"{escaped}%", escape="\\") for c in columns])
+        substring = or_(*[target.column(c).ilike(f"%{escaped}%", escape="\\") for c in columns])
+        return substring, case((prefix, 2.0), (substring, 1.0), else_=0.0)
+
+    def _like_filter(self, query: Query, target: SearchTarget, term: str, columns: Sequence[str],
+                     trigram: bool) -> Tuple[Query, Any]:
+        # ILIKE '%term%' and the % similarity operator are both served by the gin_trgm_ops indexes
+        substring, rank = self._boosts(target, term, columns)
+        if not trigram:
+            return query.filter(substring), rank
+
+        similar = or_(*[target.column(c).op("%")(term) for c in columns])
+        similarity = func.greatest(*[func.coalesce(func.similarity(target.column(c), term), 0) for c in columns])
+        return query.filter(or_(substring, similar)), rank + similarity
+
+    def _fts_filter(self, query: Query, target: SearchTarget, term: str, columns: Sequence[str],
+                    fuzzy: bool) -> Tuple[Query, Any]:
+        expression = _fts_phrase(term)
+        trigrams = _trigrams(term) if fuzzy and len(term) > MIN_TRIGRAM_TERM_LENGTH else []
+        if trigrams:
+            # The index finds rows sharing any trigram; _trigram_overlap then drops weak matches
+            expression = " OR ".join([expression] + [_fts_phrase(trigram) for trigram in trigrams])
+        if tuple(columns) != target.columns:
+            expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+
+        matches = text(
+            f"SELECT rowid AS id, -bm25({target.fts_table}) AS score "
+            f"FROM {target.fts_table} WHERE {target.fts_table} MATCH :match"
+        ).bindparams(bindparam("match", value=expression, unique=True)).columns(id=Integer, score=Float).subquery()
+
+        _, boost = self._boosts(target, term, columns)
+        query = query.join(matches, matches.c.id == target.model.id)
+        if trigrams:
+            query = query.filter(self._trigram_overlap(target, trigrams, columns))
+        return query, boost * literal(100.0) + matches.c.score
+
+    @staticmethod
+    def _trigram_overlap(target: SearchTarget, trigrams: Sequence[str], columns: Sequence[str]):
+        """Some column contains at least FUZZY_MIN_TRIGRAM_OVERLAP of the term's trigrams"""
+        required = max(1, math.ceil(len(trigrams) * FUZZY_MIN_TRIGRAM_OVERLAP))
+        return or_(*[
+            sum(case((func.instr(func.lower(target.column(c)), trigram) > 0, 1), else_=0) for trigram in trigrams)
+            >= required
+            for c in columns
+        ])
+
+
+def create_search_indexes(engine: Engine):
+    """Create the trigram indexes (PostgreSQL) or FTS5 shadow tables and sync triggers (SQLite)"""
+    dialect = engine.dialect.name
+    for target in SEARCH_TARGETS.values():
+        try:
+            if dialect == "postgresql":
+                _create_trigram_indexes(engine, target)
+            elif dialect == "sqlite":
+                _create_fts_table(engine, target)
+        except SQLAlchemyError as e:
+            logger.warning(f"Search indexes for {target.table} unavailable, falling back to LIKE: {e}")
+
+    with _backends_lock:
+        _backends.clear()
+
+
+def _create_trigram_indexes(engine: Engine, target: SearchTarget):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column in target.columns:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{target.table}_{column}_trgm "
+                f"ON {target.table} USING gin ({column} gin_trgm_ops)"
+            ))
+
+
+def _create_fts_table(engine: Engine, target: SearchTarget):
+    fts = target.fts_table
+    columns = ", ".join(target.columns)
+    new_values = ", ".join(f"new.{column}" for column in target.columns)
+    old_values = ", ".join(f"old.{column}" for column in target.columns)
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+        ).scalar()
+
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{columns}, content='{target.table}', content_rowid='id', tokenize='trigram')"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {target.table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {target.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {target.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        ))
+
+        if not exists:
+            # Index rows written before the shadow table existed
+            conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
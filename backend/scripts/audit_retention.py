@@ -0,0 +1,28 @@
+"""
+Audit log retention job
+Creates upcoming monthly partitions, then archives and drops months older than
+AUDIT_LOG_RETENTION_DAYS. Run daily from cron.
+
+Usage (from backend/): python scripts/audit_retention.py [--dry-run]
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine
+from app.services.audit_log_service import purge_expired_audit_logs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    dry_run = "--dry-run" in sys.argv[1:]
+    for purged in purge_expired_audit_logs(engine, dry_run=dry_run):
+        if dry_run:
+            print(f"would archive and drop {purged['partition']}")
+        else:
+            print(f"{purged['partition']}: {purged['rows']} rows -> {purged['archived_to']}")
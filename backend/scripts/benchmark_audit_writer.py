@@ -0,0 +1,113 @@
+"""
+Audit writer throughput benchmark
+Compares one INSERT + commit per audit record with the batched background writer
+
+Usage (from backend/): python scripts/benchmark_audit_writer.py [records] [database_url]
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, insert, func, select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.audit import AuditWriter
+from app.models.audit_log import AuditLog, AuditActions, AuditEntityTypes
+
+PRODUCERS = 8
+
+
+def make_record(i: int) -> dict:
+    record = AuditLog.log_values(
+        organization_id=1 + i % 20,
+        action=AuditActions.ASSESSMENT_UPDATED,
+        entity_type=AuditEntityTypes.ASSESSMENT,
+        user_id=1 + i % 200,
+        entity_id=i,
+        old_values={"status": "draft", "score": i % 100},
+        new_values={"status": "in_progress", "score": (i + 7) % 100},
+        ip_address="10.0.0.1",
+        request_id=f"{i:036d}"
+    )
+    record["timestamp"] = datetime.now(timezone.utc)
+    return record
+
+
+def row_count(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(AuditLog.__table__)).scalar()
+
+
+def reset(engine):
+    AuditLog.__table__.drop(engine, checkfirst=True)
+    AuditLog.__table__.create(engine)
+
+
+def run_producers(records, enqueue):
+    """Spread records across PRODUCERS threads, like concurrent request handlers"""
+    threads = [
+        threading.Thread(target=lambda chunk: [enqueue(r) for r in chunk], args=(records[i::PRODUCERS],))
+        for i in range(PRODUCERS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def bench_inline(engine, records) -> float:
+    """Baseline: every action commits its own audit insert"""
+    lock = threading.Lock()
+
+    def write(record):
+        with lock, engine.begin() as conn:
+            conn.execute(insert(AuditLog.__table__), record)
+
+    start = time.perf_counter()
+    run_producers(records, write)
+    return time.perf_counter() - start
+
+
+def bench_writer(engine, records):
+    writer = AuditWriter(bind=engine)
+    writer.start()
+
+    start = time.perf_counter()
+    run_producers(records, writer.enqueue)
+    enqueued = time.perf_counter() - start
+    writer.stop()
+    drained = time.perf_counter() - start
+    return enqueued, drained, writer.overflow_writes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    if len(sys.argv) > 2:
+        url = sys.argv[2]
+    else:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'audit_bench.db')}"
+    engine = create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {})
+    records = [make_record(i) for i in range(count)]
+
+    reset(engine)
+    inline = bench_inline(engine, records)
+    assert row_count(engine) == count
+
+    reset(engine)
+    enqueued, drained, overflow = bench_writer(engine, records)
+    assert row_count(engine) == count, "writer lost records"
+
+    print(f"{count} audit records, {PRODUCERS} producer threads, {url}")
+    print(f"  inline insert+commit : {inline:8.3f}s  {count / inline:10.0f} records/s")
+    print(f"  writer enqueue       : {enqueued:8.3f}s  {count / enqueued:10.0f} records/s (request-side cost)")
+    print(f"  writer drained       : {drained:8.3f}s  {count / drained:10.0f} records/s ({overflow} overflow writes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Certificate render benchmark
+Compares drawing the whole certificate page per document with replaying the recorded background
+template, then times a batch through the render pool (stored into a temporary directory)
+
+Usage (from backend/): python scripts/benchmark_certificate_render.py [certificates]
+
+Developed by: Qryti Dev Team
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Store benchmark PDFs out of the way; pool workers inherit the environment
+os.environ["STORAGE_TYPE"] = "local"
+os.environ["CERTIFICATES_DIR"] = tempfile.mkdtemp(prefix="certificate_bench_")
+
+from reportlab.pdfgen import canvas
+
+from app.services.certificate_renderer import (
+    PAGE_SIZE, CertificateRenderPool, _draw_background, _draw_fields, get_certificate_template
+)
+
+
+def make_fields(i: int) -> dict:
+    number = f"QRYTI-ISO_42001_COMPLIANCE-{i:012X}"
+    return {
+        "id": i,
+        "certificate_number": number,
+        "certificate_type": "iso_42001_compliance",
+        "organization": f"Example Organization {i}",
+        "project_name": f"Project {i}",
+        "ai_system_name": f"Credit scoring model v{i % 7}",
+        "issued_date": "19 October 2026",
+        "expiry_date": "14 October 2027",
+        "verification_url": f"https://qryti.com/api/v1/certificates/verify/{number}"
+    }
+
+
+def render_full(fields: dict) -> bytes:
+    """Baseline: draw the static page again for every certificate"""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=PAGE_SIZE, invariant=1)
+    _draw_background(pdf)
+    _draw_fields(pdf, fields)
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def per_certificate_ms(render, fields_list) -> float:
+    start = time.perf_counter()
+    for fields in fields_list:
+        render(fields)
+    return (time.perf_counter() - start) * 1000 / len(fields_list)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fields_list = [make_fields(i) for i in range(count)]
+    template = get_certificate_template()
+    render_full(fields_list[0])
+    template.render(fields_list[0])
+
+    full = per_certificate_ms(render_full, fields_list)
+    templated = per_certificate_ms(template.render, fields_list)
+
+    pool = CertificateRenderPool()
+    pool.render_many(fields_list[:pool.workers * 2])  # start the workers
+    start = time.perf_counter()
+    rendered = pool.render_many(fields_list)
+    batch = time.perf_counter() - start
+    pool.shutdown()
+    assert len({certificate.sha256 for certificate in rendered}) == count
+
+    print(f"{count} certificates, {len(template.render(fields_list[0]))} bytes each")
+    print(f"  full redraw       : {full:7.2f} ms/certificate")
+    print(f"  template replay   : {templated:7.2f} ms/certificate")
+    print(f"  pool batch ({pool.workers} workers, render + store): {batch:7.3f}s  {count / batch:8.0f} certificates/s")
+
+
+if __name__ == "__main__":
+    main()
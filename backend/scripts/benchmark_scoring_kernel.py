@@ -0,0 +1,137 @@
+"""
+Assessment scoring kernel benchmark
+Scores a synthetic portfolio with the vectorized ScoringKernel and with the per-row
+AssessmentScoringEngine formulas, and reports both timings and the largest difference
+
+Usage (from backend/): python scripts/benchmark_scoring_kernel.py [assessments]
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.iso_control import ResponseValue
+from app.services.assessment_scoring import AssessmentScoringEngine, _empty_totals
+from app.services.control_catalog import ControlCatalog, CatalogQuestion
+from app.services.scoring_kernel import ScoringKernel
+
+
+def catalog_with_ids() -> ControlCatalog:
+    """The framework catalog with the ids the database would assign"""
+    question_ids = iter(range(1, 10000))
+    controls = []
+    for control_id, control in enumerate(ControlCatalog.from_data().controls, start=1):
+        questions = [
+            CatalogQuestion(**dict(
+                {name: getattr(question, name) for name in CatalogQuestion.__slots__},
+                id=next(question_ids), control_id=control_id
+            ))
+            for question in control.questions
+        ]
+        controls.append(ControlCatalog._make_control(
+            control_id, control.control_number, control.title, control.description,
+            control.category, control.nist_function, control.weight, control.is_mandatory,
+            control.min_risk_template, questions
+        ))
+    return ControlCatalog(tuple(controls), ("benchmark", len(controls)))
+
+
+def portfolio(catalog: ControlCatalog, count: int):
+    rng = random.Random(7)
+    values = list(ResponseValue)
+    control_rows, responses = [], []
+    for assessment_id in range(1, count + 1):
+        for control in catalog.applicable_controls(rng.choice(["low", "medium", "high"])):
+            control_rows.append((assessment_id, control.id))
+            for question in control.questions:
+                if rng.random() < 0.9:
+                    responses.append((assessment_id, question.id, rng.choice(values), rng.random() < 0.5))
+    return control_rows, responses
+
+
+def score_per_row(catalog: ControlCatalog, control_rows, responses):
+    """What AssessmentScoringEngine.recalculate_assessment does, one assessment row at a time"""
+    engine = AssessmentScoringEngine(db=None)
+    sums = {}
+    for assessment_id, question_id, value, has_evidence in responses:
+        question = catalog.question(question_id)
+        entry = sums.setdefault((assessment_id, question.control_id), [0.0, 0.0, 0, 0])
+        entry[3] += 1
+        score = engine.question_score(value, question.requires_evidence, has_evidence)
+        if score is not None:
+            entry[0] += score * question.weight
+            entry[1] += question.weight
+            entry[2] += 1
+
+    compliance, totals = [], {}
+    for assessment_id, control_id in control_rows:
+        control = catalog.control(control_id)
+        weighted, weight, answered, count = sums.get((assessment_id, control_id), [0.0, 0.0, 0, 0])
+        row = SimpleNamespace(
+            score_weighted_sum=weighted, score_weight_total=weight, answered_questions=answered,
+            response_count=count, compliance_score=0.0, risk_score=0.0, status="not_started"
+        )
+        if count:
+            engine._refresh_control_scores(row, control)
+        compliance.append(row.compliance_score)
+        engine._shift_control(
+            totals.setdefault(assessment_id, _empty_totals()), control,
+            engine._control_snapshot(row), sign=1, count=1
+        )
+    overall = {assessment_id: engine.assessment_scores(t) for assessment_id, t in totals.items()}
+    return np.array(compliance), overall
+
+
+def score_kernel(catalog: ControlCatalog, control_rows, responses, count: int):
+    kernel = ScoringKernel(catalog)
+    result = kernel.score(
+        np.arange(1, count + 1, dtype=np.int64),
+        np.array([row[0] for row in responses], dtype=np.int64),
+        np.array([row[1] for row in responses], dtype=np.int64),
+        kernel.encode_responses([row[2] for row in responses]),
+        np.array([row[3] for row in responses], dtype=bool),
+        np.array([row[0] for row in control_rows], dtype=np.int64),
+        np.array([row[1] for row in control_rows], dtype=np.int64)
+    )
+    overall = {
+        assessment_id: AssessmentScoringEngine.assessment_scores(totals)
+        for assessment_id, totals in zip(result["assessment_ids"].tolist(), kernel.totals(result))
+    }
+    return result["compliance"], overall
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    catalog = catalog_with_ids()
+    control_rows, responses = portfolio(catalog, count)
+
+    start = time.perf_counter()
+    row_compliance, row_overall = score_per_row(catalog, control_rows, responses)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    kernel_compliance, kernel_overall = score_kernel(catalog, control_rows, responses, count)
+    vectorized = time.perf_counter() - start
+
+    max_diff = float(np.abs(row_compliance - kernel_compliance).max())
+    for assessment_id, scores in row_overall.items():
+        for field, value in scores.items():
+            if isinstance(value, float):
+                max_diff = max(max_diff, abs(value - kernel_overall[assessment_id][field]))
+
+    print(f"{count} assessments, {len(control_rows)} control rows, {len(responses)} responses")
+    print(f"  per-row formulas : {per_row:8.3f}s")
+    print(f"  numpy kernel     : {vectorized:8.3f}s  ({per_row / vectorized:.1f}x)")
+    print(f"  max difference   : {max_diff:.3g}")
+
+
+if __name__ == "__main__":
+    main()
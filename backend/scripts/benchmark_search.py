@@ -0,0 +1,104 @@
+"""
+Admin search benchmark
+Times user search over a synthetic table with the LIKE fallback and with the search indexes
+(FTS5 trigram on SQLite, pg_trgm on PostgreSQL), exact and fuzzy, and reports how many rows match
+
+Usage (from backend/): python scripts/benchmark_search.py [rows] [database_url]
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.organization import Organization
+from app.models.user import User, UserRole
+from app.services import search_service
+from app.services.search_service import SearchService, create_search_indexes
+
+FIRST_NAMES = ["James", "Maria", "Wei", "Aisha", "Carlos", "Priya", "Olga", "Kenji", "Fatima", "Liam",
+               "Sofia", "Mateo", "Ananya", "Noah", "Yuki", "Amara", "Lucas", "Elena", "Omar", "Ingrid"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Silva", "Sharma", "Ivanova", "Tanaka", "Haddad", "Murphy",
+              "Rossi", "Fernandez", "Iyer", "Johnson", "Sato", "Mensah", "Martin", "Petrova", "Farouk", "Larsen"]
+COMPANIES = ["Acme Analytics", "Northwind AI", "Globex Robotics", "Initech Labs", "Umbrella Health",
+             "Stark Systems", "Wayne Logistics", "Hooli Cloud", "Vandelay Imports", "Soylent Foods"]
+
+# (term, fuzzy) pairs: substring, prefix, and one-character typos
+QUERIES = [
+    ("garcia", False), ("priya", False), ("northwind", False), ("maria.s", False),
+    ("garcai", True), ("northwnd", True), ("tanka", True), ("ivanova", True)
+]
+REPEATS = 5
+
+
+def seed(engine, rows: int):
+    for table in (User.__table__, Organization.__table__):
+        table.drop(engine, checkfirst=True)
+        table.create(engine)
+    rng = random.Random(11)
+    batch = []
+    for user_id in range(1, rows + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        batch.append({
+            "id": user_id,
+            "email": f"{first}.{last}{user_id}@example.com".lower(),
+            "hashed_password": "x",
+            "name": f"{first} {last}",
+            "organization": f"{rng.choice(COMPANIES)} {user_id % 97}",
+            "role": UserRole.CLIENT.name,
+            "is_active": True
+        })
+        if len(batch) == 10000:
+            with engine.begin() as conn:
+                conn.execute(insert(User.__table__), batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(User.__table__), batch)
+
+
+def run(session_factory, label: str):
+    print(f"  {label}")
+    for term, fuzzy in QUERIES:
+        db = session_factory()
+        service = SearchService(db)
+        try:
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                query, rank = service.filter(db.query(User.id), "users", term, fuzzy=fuzzy)
+                matches = query.count()
+                query.order_by(rank.desc(), User.id).limit(50).all()
+            elapsed = (time.perf_counter() - start) / REPEATS
+        finally:
+            db.close()
+        print(f"    {term!r:12} fuzzy={str(fuzzy):5}  {elapsed * 1000:8.1f} ms  {matches:7} matches")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if len(sys.argv) > 2:
+        url = sys.argv[2]
+    else:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search_bench.db')}"
+    engine = create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {})
+    session_factory = sessionmaker(bind=engine)
+
+    seed(engine, rows)
+    print(f"{rows} users, {url}")
+
+    search_service._backends.clear()
+    run(session_factory, "LIKE fallback (no search indexes)")
+
+    create_search_indexes(engine)
+    run(session_factory, "search indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Evidence storage garbage collection
+Deletes stored evidence content no evidence file has referenced for the grace period, then sweeps
+objects without an evidence_blobs row (uploads rolled back after their content was stored, previews
+of deleted content, abandoned temp files). Run hourly or daily from cron.
+
+Usage (from backend/): python scripts/collect_evidence_garbage.py [--skip-orphans]
+
+Developed by: Qryti Dev Team
+"""
+
+import argparse
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.evidence_storage import EvidenceStorageService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete unreferenced evidence content")
+    parser.add_argument("--skip-orphans", action="store_true",
+                        help="only collect released content; skip the storage listing")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        service = EvidenceStorageService(db)
+        collected = service.collect_garbage()
+        print(f"{len(collected)} unreferenced evidence blobs deleted")
+        if not args.skip_orphans:
+            swept = service.sweep_orphans()
+            print(f"{len(swept)} orphaned evidence objects deleted")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
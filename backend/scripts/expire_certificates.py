@@ -0,0 +1,29 @@
+"""
+Certificate expiry sweep
+Marks active certificates past their expiry date as expired in one bulk UPDATE. Run daily from cron;
+verification already reports lapsed certificates as expired between runs.
+
+Usage (from backend/): python scripts/expire_certificates.py
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.certificate_service import expire_certificates
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        expired = expire_certificates(db)
+        db.commit()
+        print(f"{expired} certificates expired")
+    finally:
+        db.close()
@@ -0,0 +1,162 @@
+"""
+Hot query plan check
+Runs EXPLAIN on the hot filter queries and asserts each one is served by its index
+
+Usage (from backend/): python scripts/explain_hot_queries.py
+
+Developed by: Qryti Dev Team
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime
+from sqlalchemy import case, func, select, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine
+from app.core.database_setup import DatabaseSetup
+from app.models.requirement import RequirementAssessment
+from app.models.ai_model import AIModel, ModelStatus
+from app.models.project import Project
+from app.models.assessment import Score
+from app.models.evidence import Evidence
+from app.models.iso_control import QuestionResponse, AssessmentResponse
+from app.models.audit_log import AuditLog
+from app.models.certificate import Certificate
+
+
+def hot_queries():
+    """(name, statement, acceptable indexes) for each query the index plan targets"""
+    requirement_assessments = RequirementAssessment.__table__
+    ai_models = AIModel.__table__
+    projects = Project.__table__
+    scores = Score.__table__
+    question_responses = QuestionResponse.__table__
+    assessment_responses = AssessmentResponse.__table__
+    evidence = Evidence.__table__
+    audit_logs = AuditLog.__table__
+    certificates = Certificate.__table__
+
+    return [
+        (
+            "gap analysis assessments",
+            select(requirement_assessments).where(
+                requirement_assessments.c.organization_id == 1,
+                requirement_assessments.c.ai_model_id == 1
+            ),
+            "ix_requirement_assessments_org_model"
+        ),
+        (
+            "organization model inventory",
+            select(ai_models).where(
+                ai_models.c.organization_id == 1,
+                ai_models.c.status == ModelStatus.PRODUCTION
+            ),
+            "ix_ai_models_org_status"
+        ),
+        (
+            "active project for client",
+            select(projects).where(projects.c.client_id == 1, projects.c.status == 'active'),
+            "ix_projects_client_status"
+        ),
+        (
+            "certificate eligible projects",
+            select(projects).where(
+                projects.c.latest_compliance_score >= 80, projects.c.status == 'active'
+            ).order_by(projects.c.latest_compliance_score.desc()),
+            "ix_projects_latest_compliance_score"
+        ),
+        (
+            "latest project score",
+            select(scores).where(scores.c.project_id == 1).order_by(scores.c.calculated_at.desc()).limit(1),
+            "ix_scores_project_calculated"
+        ),
+        (
+            "question response upsert lookup",
+            select(question_responses).where(
+                question_responses.c.assessment_id == 1, question_responses.c.question_id == 1
+            ),
+            "unique_assessment_question_response"
+        ),
+        (
+            "control response upsert lookup",
+            select(assessment_responses).where(
+                assessment_responses.c.assessment_id == 1, assessment_responses.c.control_id == 1
+            ),
+            "unique_assessment_control_response"
+        ),
+        (
+            "evidence review queue",
+            select(evidence).where(
+                evidence.c.is_validated == False, evidence.c.is_active == True, evidence.c.reviewed_at.is_(None)
+            ).order_by(evidence.c.upload_date, evidence.c.id).limit(50),
+            ("ix_evidence_pending_review", "ix_evidence_validated_active")
+        ),
+        (
+            "evidence review statistics",
+            select(
+                func.count(),
+                func.sum(case((evidence.c.is_validated == False, 1), else_=0))
+            ).where(evidence.c.is_active == True),
+            "ix_evidence_validated_active"
+        ),
+        (
+            "organization audit trail",
+            select(audit_logs).where(audit_logs.c.organization_id == 1).order_by(
+                audit_logs.c.timestamp.desc()
+            ).limit(100),
+            "ix_audit_logs_org_timestamp"
+        ),
+        (
+            "certificate verification",
+            select(certificates).where(certificates.c.certificate_number == "QRYTI-ISO_42001_COMPLIANCE-0"),
+            "ix_certificates_certificate_number"
+        ),
+        (
+            "certificate expiry sweep",
+            select(certificates.c.id).where(
+                certificates.c.status == "active", certificates.c.expiry_date <= datetime(2000, 1, 1)
+            ),
+            ("ix_certificates_expiry_date", "ix_certificates_project_status")
+        )
+    ]
+
+
+def explain(conn, statement) -> str:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "postgresql":
+        rows = conn.execute(text(f"EXPLAIN {sql}")).fetchall()
+        return "\n".join(row[0] for row in rows)
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def check_hot_queries() -> bool:
+    """Print each plan and report whether it uses the expected index"""
+    DatabaseSetup().create_indexes()
+
+    ok = True
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # Small development tables would otherwise be seq-scanned regardless of indexes
+            conn.execute(text("SET enable_seqscan = off"))
+
+        for name, statement, index_names in hot_queries():
+            if isinstance(index_names, str):
+                index_names = (index_names,)
+            plan = explain(conn, statement)
+            used = any(index_name in plan for index_name in index_names)
+            ok = ok and used
+            print(f"{'✅' if used else '❌'} {name}: expected {' or '.join(index_names)}")
+            print("    " + plan.replace("\n", "\n    "))
+        conn.rollback()
+
+    return ok
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not check_hot_queries():
+        sys.exit(1)
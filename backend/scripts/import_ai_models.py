@@ -0,0 +1,50 @@
+"""
+AI model inventory import
+Registers the AI models listed in a CSV or JSONL file for an organization, a chunk per transaction;
+rows that fail validation are listed and skipped
+
+Usage (from backend/): python scripts/import_ai_models.py FILE --organization-id ID --user-id ID [--format csv|jsonl]
+
+Developed by: Qryti Dev Team
+"""
+
+import argparse
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.ai_model_import import AIModelImportService, IMPORT_CHUNK_SIZE, import_format
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import AI models from CSV or JSONL")
+    parser.add_argument("file")
+    parser.add_argument("--organization-id", type=int, required=True)
+    parser.add_argument("--user-id", type=int, required=True, help="recorded as the models' creator")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fmt = import_format(args.file, args.format)
+    db = SessionLocal()
+    try:
+        with open(args.file, "rb") as source:
+            report = AIModelImportService(db).import_models(
+                source, fmt, args.organization_id, args.user_id, chunk_size=args.chunk_size
+            )
+    finally:
+        db.close()
+
+    for error in report["errors"]:
+        print(f"  row {error['row']}: {'; '.join(error['errors'])}")
+    if report["errors_truncated"]:
+        print("  (further errors not listed)")
+    print(f"{report['imported']} of {report['rows_read']} rows imported, {report['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+AI model risk re-scoring
+Re-scores the risk of every AI model in the inventory with the current risk factor tables
+(app/services/risk_scoring.py), writing back only models whose scores changed, in one transaction
+
+Usage (from backend/): python scripts/rescore_ai_risk.py [--organization-id ID] [--chunk-size N]
+
+Developed by: Qryti Dev Team
+"""
+
+import argparse
+import os
+import sys
+import logging
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.ai_inventory_service import AIInventoryService, RESCORE_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score AI model risk")
+    parser.add_argument("--organization-id", type=int, help="only this organization's models")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+
+    def report(scanned: int, updated: int):
+        print(f"  {scanned} models scanned, {updated} updated ({time.perf_counter() - start:.1f}s)", flush=True)
+
+    db = SessionLocal()
+    try:
+        result = AIInventoryService(db).rescore_risk(args.organization_id, args.chunk_size, progress=report)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    print(f"{result['models_updated']} of {result['models_scanned']} models re-scored "
+          f"across {result['organizations_affected']} organizations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Portfolio-wide assessment re-scoring
+Recomputes control and assessment scores for every ISO 42001 assessment with the vectorized
+scoring kernel, e.g. after CATEGORY_WEIGHTS or NIST_FUNCTION_WEIGHTS change.
+With --drifted, only assessments whose running totals no longer match a recomputation are
+re-scored (run it from cron to repair drift).
+
+Usage (from backend/): python scripts/rescore_assessments.py [--assessment-id ID ...] [--batch-size N] [--drifted]
+
+Developed by: Qryti Dev Team
+"""
+
+import argparse
+import os
+import sys
+import logging
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.assessment_scoring import AssessmentScoringEngine, RESCORE_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score ISO 42001 assessments")
+    parser.add_argument("--assessment-id", type=int, action="append", dest="assessment_ids",
+                        help="only this assessment (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE)
+    parser.add_argument("--drifted", action="store_true",
+                        help="only assessments whose running totals fail the consistency check")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        engine = AssessmentScoringEngine(db)
+        if args.drifted:
+            rescored = len(engine.repair_drift(args.assessment_ids, args.batch_size))
+        else:
+            rescored = engine.rescore_assessments(args.assessment_ids, args.batch_size)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    print(f"{rescored} assessments re-scored in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
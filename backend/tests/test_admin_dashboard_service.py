@@ -0,0 +1,69 @@
+"""
+Admin dashboard client progress
+The /admin/clients/progress listing pages through 1k clients in one statement per page
+"""
+
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.database import query_budget
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.admin_dashboard_service import AdminDashboardService
+
+# Admin client progress load: 1k clients with 5 projects each
+PROGRESS_CLIENTS = 1000
+PROGRESS_PROJECTS_PER_CLIENT = 5
+PROGRESS_PAGE_SIZE = 500
+PROGRESS_TIME_LIMIT = 5.0  # seconds to walk every page; generous for slow CI machines
+
+
+@pytest.fixture
+def client_portfolio(db):
+    db.execute(insert(User.__table__), [{
+        "id": 1,
+        "email": "admin@example.com",
+        "hashed_password": "x",
+        "name": "Admin",
+        "role": UserRole.ADMIN.name,
+        "is_active": True
+    }] + [{
+        "id": client_id,
+        "email": f"client{client_id}@example.com",
+        "hashed_password": "x",
+        "name": f"Client {client_id}",
+        "organization": f"Organization {client_id % 50}",
+        "role": UserRole.CLIENT.name,
+        "is_active": True
+    } for client_id in range(2, PROGRESS_CLIENTS + 2)])
+    db.execute(insert(Project.__table__), [{
+        "client_id": client_id,
+        "created_by": 1,
+        "project_name": f"Project {client_id}-{index}",
+        "risk_template": ["low", "medium", "high"][index % 3],
+        "latest_compliance_score": (client_id * 7 + index) % 100,
+        "assessment_count": 10,
+        "answered_assessment_count": index * 2
+    } for client_id in range(2, PROGRESS_CLIENTS + 2) for index in range(PROGRESS_PROJECTS_PER_CLIENT)])
+    db.commit()
+    return PROGRESS_CLIENTS * PROGRESS_PROJECTS_PER_CLIENT
+
+
+def test_clients_progress_pages_in_one_statement(db, engine, client_portfolio):
+    service = AdminDashboardService(db)
+    rows, after = [], {}
+    start = time.perf_counter()
+    while True:
+        with query_budget(1, bind=engine):
+            page = service.get_clients_progress(limit=PROGRESS_PAGE_SIZE, **after)
+        if not page:
+            break
+        rows.extend(page)
+        after = {"after_client_id": page[-1]["client_id"], "after_project_id": page[-1]["project_id"]}
+    elapsed = time.perf_counter() - start
+
+    assert len(rows) == client_portfolio
+    assert len({row["project_id"] for row in rows}) == client_portfolio
+    assert elapsed < PROGRESS_TIME_LIMIT
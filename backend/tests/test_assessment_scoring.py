@@ -0,0 +1,78 @@
+"""
+ISO 42001 assessment scoring
+Answers update the stored assessment scores; drifted running totals are found and rebuilt
+"""
+
+import pytest
+from sqlalchemy import update
+
+from app.models.assessment import Assessment, Question
+from app.models.iso_control import AssessmentResponse
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.assessment_scoring import AssessmentScoringEngine
+from app.services.iso_assessment_service import ISOAssessmentService
+
+
+@pytest.fixture
+def assessment_id(db):
+    service = ISOAssessmentService(db)
+    service.initialize_controls_database()
+
+    client = User(email="client@example.com", name="Client", role=UserRole.CLIENT, hashed_password="x")
+    db.add(client)
+    db.flush()
+    project = Project(client_id=client.id, project_name="Scoring", created_by=client.id)
+    question = Question(control_id="5.1", question_text="Is there an AI policy?")
+    db.add_all([project, question])
+    db.flush()
+    assessment = Assessment(project_id=project.id, control_id="5.1", question_id=question.id, assessed_by=client.id)
+    db.add(assessment)
+    db.flush()
+    for control in service.catalog.applicable_controls("high"):
+        db.add(AssessmentResponse(assessment_id=assessment.id, control_id=control.id))
+    db.flush()
+    service.scoring.rebuild_totals(assessment.id)
+    db.commit()
+    return assessment.id
+
+
+def _questions(service, count):
+    return [
+        question
+        for control in service.catalog.applicable_controls("high")
+        for question in control.questions
+    ][:count]
+
+
+def test_answers_store_assessment_scores(db, assessment_id):
+    service = ISOAssessmentService(db)
+    for question in _questions(service, 3):
+        service.submit_question_response(assessment_id, question.id, {"response_value": "yes"})
+
+    db.expire_all()
+    assessment = db.get(Assessment, assessment_id)
+    assert assessment.overall_compliance_score > 0
+    assert assessment.status == "in_progress"
+    assert assessment.completion_percentage > 0
+    assert service.scoring.check_consistency(assessment_id) == []
+
+
+def test_drifted_totals_are_rebuilt(db, assessment_id):
+    service = ISOAssessmentService(db)
+    for question in _questions(service, 4):
+        service.submit_question_response(assessment_id, question.id, {"response_value": "partial"})
+
+    # A lost delta: the stored sums no longer match the answers
+    db.execute(update(AssessmentResponse.__table__).where(
+        AssessmentResponse.__table__.c.assessment_id == assessment_id
+    ).values(score_weighted_sum=0.0))
+    db.commit()
+
+    engine = AssessmentScoringEngine(db)
+    assert engine.drifted_assessments() == [assessment_id]
+    assert engine.repair_drift() == [assessment_id]
+    db.commit()
+
+    assert engine.check_consistency(assessment_id) == []
+    assert engine.drifted_assessments() == []
@@ -0,0 +1,48 @@
+"""
+Audit retention
+Dropping expired months also deletes the audit_blobs only they referenced, once past the grace period
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core import audit as audit_module
+from app.core.audit import AuditWriter, _insert_blobs, audit
+from app.core.config import settings
+from app.core.storage import LocalStorage
+from app.models.audit_log import AuditBlob, AuditLog
+from app.services.audit_log_service import BLOB_GRACE_PERIOD, purge_expired_audit_logs, purge_unreferenced_blobs
+
+
+def _sha256(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _past_grace():
+    return datetime.now(timezone.utc) + BLOB_GRACE_PERIOD + timedelta(minutes=1)
+
+
+def test_dropped_month_takes_its_blobs(db, engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_module, "_writer", AuditWriter(bind=engine))
+    kept = "k" * settings.AUDIT_BLOB_MIN_LENGTH
+    expired = "x" * settings.AUDIT_BLOB_MIN_LENGTH
+    audit(1, "UPDATE", "ai_model", entity_id=1, old_values={"description": kept}, new_values={"description": "short"})
+    audit(1, "UPDATE", "ai_model", entity_id=2, old_values={"description": expired}, new_values={"description": "short"})
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE audit_logs SET timestamp = '2010-01-15 00:00:00' WHERE entity_id = 2"))
+
+    purged = purge_expired_audit_logs(engine, storage=LocalStorage(str(tmp_path)), now=_past_grace())
+
+    assert [partition["partition"] for partition in purged] == ["audit_logs_2010_01"]
+    assert [blob.hash for blob in db.query(AuditBlob)] == [_sha256(kept)]
+    assert db.query(AuditLog).one().to_dict(include_sensitive=True)["old_values"] == {"description": kept}
+
+
+def test_recently_referenced_blobs_are_kept(engine):
+    with engine.begin() as conn:
+        _insert_blobs(conn, {_sha256(value): value for value in ("a", "b", "c")})
+
+    assert purge_unreferenced_blobs(engine) == 0
+    assert purge_unreferenced_blobs(engine, now=_past_grace(), batch_size=1) == 3
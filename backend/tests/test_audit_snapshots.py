@@ -0,0 +1,57 @@
+"""
+Audit records store new_values as a patch against old_values
+Reads rebuild the full old/new snapshots; long text values are stored once in audit_blobs
+"""
+
+from app.core import audit as audit_module
+from app.core.audit import AuditWriter, audit
+from app.core.config import settings
+from app.models.audit_log import PATCH_KEY, REMOVED, AuditBlob, AuditLog
+from app.services.audit_log_service import AuditLogService
+
+
+def test_patches_round_trip_to_full_snapshots(db, engine, monkeypatch):
+    monkeypatch.setattr(audit_module, "_writer", AuditWriter(bind=engine))
+    description = "d" * settings.AUDIT_BLOB_MIN_LENGTH
+    before = {"name": "Model", "status": "draft", "description": description, "owner": "ops"}
+    after = {"name": "Model", "status": "approved", "description": description, "version": 2}
+
+    for _ in range(2):
+        audit(1, "UPDATE", "ai_model", entity_id=7, old_values=before, new_values=after)
+
+    logs = db.query(AuditLog).order_by(AuditLog.id).all()
+    assert len(logs) == 2
+    for log in logs:
+        assert log.new_values == {PATCH_KEY: {"status": "approved", "version": 2, "owner": REMOVED}}
+        assert log.old_values["description"] != description  # stored as a blob reference
+        data = log.to_dict(include_sensitive=True)
+        assert data["old_values"] == before
+        assert data["new_values"] == after
+
+    assert db.query(AuditBlob).count() == 1
+    for row in AuditLogService(db).query_logs(organization_id=1):
+        assert (row["old_values"], row["new_values"]) == (before, after)
+
+
+def test_final_retry_drops_only_the_bad_record(db, engine, monkeypatch):
+    monkeypatch.setattr(audit_module.time, "sleep", lambda seconds: None)
+    writer = AuditWriter(bind=engine)
+    good = AuditLog.log_values(1, "UPDATE", "ai_model", entity_id=1)
+    bad = AuditLog.log_values(1, None, "ai_model", entity_id=2)  # action is NOT NULL
+
+    writer._write([good, bad, dict(good, entity_id=3)])
+
+    assert writer.written == 2
+    assert [log.entity_id for log in db.query(AuditLog).order_by(AuditLog.id)] == [1, 3]
+
+
+def test_full_snapshots_written_before_patches_still_read(db):
+    before = {"status": "draft", "owner": "ops"}
+    after = {"status": "approved"}
+    log = AuditLog(organization_id=1, action="UPDATE", entity_type="ai_model", old_values=before, new_values=after)
+    db.add(log)
+    db.commit()
+
+    data = log.to_dict(include_sensitive=True)
+    assert (data["old_values"], data["new_values"]) == (before, after)
+    assert AuditLogService(db).query_logs()[0]["new_values"] == after
@@ -0,0 +1,121 @@
+"""
+Schema upgrades for existing databases
+Columns added to existing model tables are created by setup, before the indexes that use them
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database_setup import ADDED_COLUMNS, DatabaseSetup
+
+# evidence as created before the review queue columns existed
+EVIDENCE_BEFORE_REVIEW = """
+CREATE TABLE evidence (
+    id INTEGER NOT NULL PRIMARY KEY,
+    assessment_stage_id INTEGER NOT NULL,
+    control_id INTEGER,
+    uploaded_by INTEGER NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    original_file_name VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_type VARCHAR(100) NOT NULL,
+    file_hash VARCHAR(64),
+    description TEXT,
+    quality_rating VARCHAR(50),
+    tags VARCHAR(500),
+    is_active BOOLEAN NOT NULL,
+    is_validated BOOLEAN NOT NULL,
+    validation_notes TEXT,
+    upload_date DATETIME DEFAULT (CURRENT_TIMESTAMP),
+    updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+    file_metadata JSON
+)
+"""
+
+# projects as created before the denormalized scorecard columns existed
+PROJECTS_BEFORE_SCORECARD = """
+CREATE TABLE projects (
+    id INTEGER NOT NULL PRIMARY KEY,
+    client_id INTEGER NOT NULL,
+    project_name VARCHAR(255) NOT NULL,
+    ai_system_name VARCHAR(255),
+    risk_template VARCHAR(50),
+    start_date DATE,
+    target_completion_date DATE,
+    status VARCHAR(50),
+    description TEXT,
+    created_by INTEGER NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+@pytest.fixture
+def setup():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(EVIDENCE_BEFORE_REVIEW))
+        conn.execute(text(PROJECTS_BEFORE_SCORECARD))
+        conn.execute(text("INSERT INTO projects (id, client_id, project_name, created_by) VALUES (1, 2, 'P', 1)"))
+        conn.execute(text(
+            "INSERT INTO evidence (id, assessment_stage_id, uploaded_by, file_name, original_file_name, "
+            "file_path, file_size, file_type, is_active, is_validated) "
+            "VALUES (1, 1, 1, 'a.pdf', 'a.pdf', 'blobs/a', 1, 'application/pdf', 1, 0)"
+        ))
+    setup = DatabaseSetup()
+    setup.engine = engine
+    yield setup
+    engine.dispose()
+
+
+def test_missing_columns_are_added_before_indexes(setup):
+    assert setup.add_missing_columns()
+    setup.create_indexes()
+
+    inspector = inspect(setup.engine)
+    columns = {column["name"] for column in inspector.get_columns("evidence")}
+    assert set(ADDED_COLUMNS["evidence"]) <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("evidence")}
+    assert {"ix_evidence_pending_review", "ix_evidence_validated_active"} <= indexes
+
+    with setup.engine.connect() as conn:
+        assert conn.execute(text("SELECT reviewed_at, claimed_by FROM evidence")).all() == [(None, None)]
+
+    # Running setup again is a no-op
+    assert setup.add_missing_columns()
+
+
+def test_not_null_columns_get_their_default(setup):
+    assert setup.add_missing_columns()
+
+    with setup.engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT latest_compliance_score, assessment_count, answered_assessment_count FROM projects"
+        )).one()
+    assert tuple(row) == (None, 0, 0)
+
+
+def test_audit_organization_becomes_nullable_with_rows_and_indexes_kept(setup):
+    with setup.engine.begin() as conn:
+        for name in ("audit_logs", "audit_logs_2024_01"):
+            conn.execute(text(
+                f"CREATE TABLE {name} (id INTEGER NOT NULL PRIMARY KEY, organization_id INTEGER NOT NULL, "
+                "action VARCHAR(100) NOT NULL, entity_type VARCHAR(50) NOT NULL, \"timestamp\" DATETIME)"
+            ))
+            conn.execute(text(f"CREATE INDEX ix_{name}_action ON {name} (action)"))
+            conn.execute(text(f"INSERT INTO {name} (id, organization_id, action, entity_type) VALUES (1, 1, 'LOGIN', 'user')"))
+
+    assert setup.relax_columns()
+
+    inspector = inspect(setup.engine)
+    for name in ("audit_logs", "audit_logs_2024_01"):
+        nullable = {column["name"]: column["nullable"] for column in inspector.get_columns(name)}
+        assert nullable["organization_id"] and not nullable["action"]
+        assert [index["name"] for index in inspector.get_indexes(name)] == [f"ix_{name}_action"]
+    with setup.engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO audit_logs (id, organization_id, action, entity_type) VALUES (2, NULL, 'LOGIN_FAILED', 'user')"
+        ))
+        assert conn.execute(text("SELECT count(*) FROM audit_logs")).scalar() == 2
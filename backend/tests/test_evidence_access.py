@@ -0,0 +1,65 @@
+"""
+Tenant checks on the evidence file routes
+Clients only reach assessments and evidence of their own projects; admins reach every tenant
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.api_v1.endpoints.evidence import _accessible_evidence
+from app.core.deps import require_assessment_access
+from app.models.assessment import Assessment
+from app.models.evidence import Evidence
+from app.models.project import Project
+from app.models.stage import AssessmentStage, Stage
+from app.models.user import User, UserRole
+
+
+def _user(db, email, role=UserRole.CLIENT):
+    user = User(email=email, name=email.split("@")[0], role=role, hashed_password="x")
+    db.add(user)
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def tenants(db):
+    admin = _user(db, "admin@example.com", UserRole.ADMIN)
+    owner = _user(db, "owner@example.com")
+    other = _user(db, "other@example.com")
+
+    project = Project(client_id=owner.id, project_name="Owner project", created_by=admin.id, status="active")
+    db.add(project)
+    db.flush()
+    assessment = Assessment(project_id=project.id, control_id="5.1", question_id=1, assessed_by=owner.id)
+    stage = Stage(name="Context", order_index=1)
+    db.add_all([assessment, stage])
+    db.flush()
+    assessment_stage = AssessmentStage(assessment_id=assessment.id, stage_id=stage.id)
+    db.add(assessment_stage)
+    db.flush()
+    evidence = Evidence(
+        assessment_stage_id=assessment_stage.id, uploaded_by=owner.id,
+        file_name="policy.pdf", original_file_name="policy.pdf", file_path="blobs/policy",
+        file_size=1024, file_type="application/pdf"
+    )
+    db.add(evidence)
+    db.commit()
+    return {"admin": admin, "owner": owner, "other": other, "assessment": assessment, "evidence": evidence}
+
+
+@pytest.mark.parametrize("caller", ["owner", "admin"])
+def test_assessment_access_allowed(db, tenants, caller):
+    assessment_id = tenants["assessment"].id
+    assert require_assessment_access(assessment_id, db, tenants[caller]) == assessment_id
+    assert _accessible_evidence(db, tenants[caller], tenants["evidence"].id).id == tenants["evidence"].id
+
+
+def test_other_tenant_gets_404(db, tenants):
+    with pytest.raises(HTTPException) as assessment_error:
+        require_assessment_access(tenants["assessment"].id, db, tenants["other"])
+    with pytest.raises(HTTPException) as evidence_error:
+        _accessible_evidence(db, tenants["other"], tenants["evidence"].id)
+
+    assert assessment_error.value.status_code == 404
+    assert evidence_error.value.status_code == 404
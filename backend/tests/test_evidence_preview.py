@@ -0,0 +1,59 @@
+"""
+Evidence preview rendering
+A render that fails is recorded, so polling gets a 404 instead of waiting forever
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.storage import LocalStorage
+from app.services import evidence_preview
+from app.services.evidence_preview import (
+    EvidencePreviewService, PreviewFailed, build_preview, preview_failure_key, preview_key, source_failure_key
+)
+from app.services.evidence_storage import blob_key
+
+CORRUPT_SHA256 = "ef" * 32
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "STORAGE_TYPE", "local")
+    return LocalStorage(str(tmp_path))
+
+
+def test_failed_render_is_recorded_and_not_queued_again(storage):
+    source = storage.path(blob_key(CORRUPT_SHA256))
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_bytes(b"not an image")
+
+    result = build_preview(blob_key(CORRUPT_SHA256), "image/png", CORRUPT_SHA256)
+
+    assert result.key is None
+    assert storage.exists(preview_failure_key(CORRUPT_SHA256))
+    assert not storage.exists(preview_key(CORRUPT_SHA256))
+
+    evidence = SimpleNamespace(id=1, file_hash=CORRUPT_SHA256, file_path=blob_key(CORRUPT_SHA256), file_type="image/png")
+    with pytest.raises(PreviewFailed):
+        EvidencePreviewService(db=None, storage=storage).evidence_preview(evidence)
+
+
+def test_render_failing_before_hashing_is_recorded_by_storage_key(storage, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(evidence_preview, "get_preview_pool", lambda: SimpleNamespace(
+        submit=lambda *args, on_done: submitted.append(on_done)
+    ))
+    evidence = SimpleNamespace(id=1, file_hash=None, file_path="uploads/missing.png", file_type="image/png")
+    service = EvidencePreviewService(db=None, storage=storage)
+
+    assert service.evidence_preview(evidence) is None
+    # The worker raised (here: the file is gone), so the pool reports no result
+    submitted.pop()(None)
+
+    assert storage.exists(source_failure_key("uploads/missing.png"))
+    with pytest.raises(PreviewFailed):
+        service.evidence_preview(evidence)
+    assert not submitted
@@ -0,0 +1,63 @@
+"""
+Batch evidence review
+Approving evidence flags its assessment as having evidence; the ISO 42001 scores are left as they are
+"""
+
+import pytest
+
+from app.models.assessment import Assessment, Question
+from app.models.evidence import Evidence
+from app.models.project import Project
+from app.models.stage import AssessmentStage, Stage
+from app.models.user import User, UserRole
+from app.services.evidence_review_service import EvidenceNotFound, EvidenceReviewService
+
+
+@pytest.fixture
+def evidence_ids(db):
+    client = User(email="client@example.com", name="Client", role=UserRole.CLIENT, hashed_password="x")
+    admin = User(email="admin@example.com", name="Admin", role=UserRole.ADMIN, hashed_password="x")
+    stage = Stage(name="Context", order_index=1)
+    db.add_all([client, admin, stage])
+    db.flush()
+    project = Project(client_id=client.id, project_name="Review", created_by=client.id)
+    question = Question(control_id="5.1", question_text="Is there an AI policy?")
+    db.add_all([project, question])
+    db.flush()
+    assessment = Assessment(project_id=project.id, control_id="5.1", question_id=question.id,
+                            assessed_by=client.id, response="yes", overall_compliance_score=40.0)
+    db.add(assessment)
+    db.flush()
+    assessment_stage = AssessmentStage(assessment_id=assessment.id, stage_id=stage.id)
+    db.add(assessment_stage)
+    db.flush()
+    evidence = [
+        Evidence(assessment_stage_id=assessment_stage.id, uploaded_by=client.id, file_name=f"e{index}.pdf",
+                 original_file_name=f"e{index}.pdf", file_path=f"blobs/{index}", file_size=1,
+                 file_type="application/pdf")
+        for index in range(2)
+    ]
+    db.add_all(evidence)
+    db.commit()
+    return [item.id for item in evidence]
+
+
+def test_approval_sets_evidence_provided_without_rescoring(db, evidence_ids):
+    result = EvidenceReviewService(db).review_batch([
+        {"evidence_id": evidence_ids[0], "approved": True, "notes": "ok"},
+        {"evidence_id": evidence_ids[1], "approved": False, "notes": "blurry"},
+    ], reviewer_id=1)
+    db.commit()
+
+    assert result == {"reviewed": 2, "approved": 1, "rejected": 1, "assessments_updated": 1}
+    assessment = db.query(Assessment).one()
+    assert assessment.evidence_provided and assessment.score == 100
+    assert assessment.overall_compliance_score == 40.0
+    assert [(item.is_validated, item.reviewed_by) for item in db.query(Evidence).order_by(Evidence.id)] == [
+        (True, 1), (False, 1)
+    ]
+
+
+def test_unknown_evidence_is_rejected(db, evidence_ids):
+    with pytest.raises(EvidenceNotFound):
+        EvidenceReviewService(db).review_batch([{"evidence_id": 999, "approved": True}], reviewer_id=1)
@@ -0,0 +1,75 @@
+"""
+Evidence content reference counting and garbage collection
+Released content and orphaned objects are only deleted after the grace period
+"""
+
+import io
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.storage import LocalStorage
+from app.models.evidence_blob import EvidenceBlob
+from app.services.evidence_storage import EvidenceStorageService, GARBAGE_GRACE_PERIOD, blob_key
+
+ORPHAN_SHA256 = "ab" * 32
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return LocalStorage(str(tmp_path))
+
+
+def _age(db, storage, sha256):
+    """Move a blob's last reference and file time past the grace period"""
+    past = datetime.now(timezone.utc) - GARBAGE_GRACE_PERIOD * 2
+    db.execute(update(EvidenceBlob.__table__).where(
+        EvidenceBlob.__table__.c.sha256 == sha256
+    ).values(last_referenced_at=past))
+    db.commit()
+    os.utime(storage.path(blob_key(sha256)), (past.timestamp(), past.timestamp()))
+
+
+def test_released_content_is_collected_after_grace_period(db, storage):
+    service = EvidenceStorageService(db, storage)
+    stored = service.store(io.BytesIO(b"policy"))
+    assert service.store(io.BytesIO(b"policy")).deduplicated
+    db.commit()
+
+    service.release(stored.sha256)
+    db.commit()
+    assert service.collect_garbage() == []  # still referenced once
+
+    service.release(stored.sha256)
+    db.commit()
+    assert service.collect_garbage() == []  # released just now: inside the grace period
+
+    _age(db, storage, stored.sha256)
+    assert service.collect_garbage() == [stored.storage_key]
+    assert not storage.exists(stored.storage_key)
+    assert db.get(EvidenceBlob, stored.sha256) is None
+
+
+def test_sweep_removes_only_old_objects_without_a_row(db, storage):
+    service = EvidenceStorageService(db, storage)
+    kept = service.store(io.BytesIO(b"referenced"))
+    db.commit()
+    _age(db, storage, kept.sha256)
+
+    orphan = storage.path(blob_key(ORPHAN_SHA256))
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(b"rolled back upload")
+    fresh = storage.path(blob_key("cd" * 32))
+    fresh.parent.mkdir(parents=True, exist_ok=True)
+    fresh.write_bytes(b"upload still committing")
+    old = time.time() - GARBAGE_GRACE_PERIOD.total_seconds() * 2
+    os.utime(orphan, (old, old))
+
+    assert service.sweep_orphans() == [blob_key(ORPHAN_SHA256)]
+    assert storage.exists(kept.storage_key)
+    assert fresh.exists()
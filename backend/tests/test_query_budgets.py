@@ -0,0 +1,106 @@
+"""
+SQL statement budgets for the assessment read pages
+Each page must issue a fixed number of statements however many controls, answers and evidence files exist
+"""
+
+import itertools
+
+import pytest
+
+from app.core.database import query_budget
+from app.models.assessment import Assessment, Question
+from app.models.iso_control import AssessmentResponse, EvidenceFile, QuestionResponse, RiskTemplate
+from app.models.project import Project
+from app.models.user import User, UserRole
+from app.services.iso_assessment_service import ISOAssessmentService, QUERY_BUDGETS
+
+RESPONSE_CYCLE = ["yes", "no", "partial", "yes", "not_applicable"]
+
+
+@pytest.fixture
+def assessment_id(db):
+    service = ISOAssessmentService(db)
+    service.initialize_controls_database()
+
+    # Rows are built against the models directly; create_assessment still sets fields Assessment does not have
+    client = User(email="client@example.com", name="Client", role=UserRole.CLIENT, hashed_password="x")
+    db.add(client)
+    db.flush()
+    project = Project(client_id=client.id, project_name="Query budget project", created_by=client.id)
+    question = Question(control_id="5.1", question_text="Is there an AI policy?")
+    db.add_all([project, question])
+    db.flush()
+    assessment = Assessment(
+        project_id=project.id,
+        control_id="5.1",
+        question_id=question.id,
+        assessed_by=client.id,
+        assessment_name="Query budget assessment",
+        risk_template=RiskTemplate.HIGH,
+        ai_system_name="Budget model"
+    )
+    db.add(assessment)
+    db.flush()
+    for control in service.catalog.applicable_controls("high"):
+        db.add(AssessmentResponse(assessment_id=assessment.id, control_id=control.id))
+    db.flush()
+    service.scoring.rebuild_totals(assessment.id)
+    db.commit()
+
+    questions = [
+        question
+        for control in service.catalog.applicable_controls("high")
+        for question in control.questions
+    ]
+    service.submit_question_responses(assessment.id, [
+        {"question_id": question.id, "response_value": value}
+        for question, value in zip(questions, itertools.cycle(RESPONSE_CYCLE))
+    ])
+
+    # Evidence on every other answered question, two files each
+    for index, question_response in enumerate(db.query(QuestionResponse).order_by(QuestionResponse.id)):
+        if index % 2:
+            continue
+        for version in (1, 2):
+            db.add(EvidenceFile(
+                question_response_id=question_response.id,
+                filename=f"evidence-{question_response.id}-{version}.pdf",
+                original_filename=f"evidence-{question_response.id}-{version}.pdf",
+                file_path=f"blobs/{question_response.id}/{version}",
+                file_size=1024,
+                file_type="application/pdf",
+                version=version
+            ))
+    db.commit()
+
+    # Measure cold reads, not the identity map
+    db.expire_all()
+    return assessment.id
+
+
+def test_assessment_overview_within_budget(db, engine, assessment_id):
+    service = ISOAssessmentService(db)
+    with query_budget(QUERY_BUDGETS["assessment_overview"], bind=engine):
+        overview = service.get_assessment_overview(assessment_id)
+
+    assert overview["total_controls"] == len(service.catalog.applicable_controls("high"))
+
+
+def test_control_questionnaire_within_budget(db, engine, assessment_id):
+    service = ISOAssessmentService(db)
+    control = max(service.catalog.applicable_controls("high"), key=lambda control: len(control.questions))
+    with query_budget(QUERY_BUDGETS["control_questionnaire"], bind=engine):
+        questionnaire = service.get_control_questionnaire(assessment_id, control.control_number)
+
+    assert len(questionnaire["questions"]) == len(control.questions)
+    assert any(question["response"]["evidence_files"] == 2 for question in questionnaire["questions"])
+
+
+def test_gap_analysis_within_budget(db, engine, assessment_id):
+    service = ISOAssessmentService(db)
+    with query_budget(QUERY_BUDGETS["gap_analysis"], bind=engine):
+        gap_analysis = service.get_gap_analysis(assessment_id)
+
+    assert gap_analysis["assessment_summary"]["total_gaps"] > 0
+    assert any(gap["gap_details"] for gap in gap_analysis["gaps"])
+
@@ -0,0 +1,147 @@
+"""
+Parity between the vectorized ScoringKernel and the per-row AssessmentScoringEngine formulas
+"""
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.models.iso_control import ResponseValue
+from app.services.assessment_scoring import AssessmentScoringEngine, _empty_totals
+from app.services.control_catalog import ControlCatalog, CatalogQuestion
+from app.services.scoring_kernel import ScoringKernel, STATUS_NAMES
+
+ASSESSMENTS = 200
+RESPONSE_VALUES = list(ResponseValue) + [None]
+
+
+def catalog_with_ids() -> ControlCatalog:
+    """The framework catalog with the ids the database would assign"""
+    question_ids = iter(range(1, 10000))
+    controls = []
+    for control_id, control in enumerate(ControlCatalog.from_data().controls, start=1):
+        questions = [
+            CatalogQuestion(**dict(
+                {name: getattr(question, name) for name in CatalogQuestion.__slots__},
+                id=next(question_ids), control_id=control_id
+            ))
+            for question in control.questions
+        ]
+        controls.append(ControlCatalog._make_control(
+            control_id, control.control_number, control.title, control.description,
+            control.category, control.nist_function, control.weight, control.is_mandatory,
+            control.min_risk_template, questions
+        ))
+    return ControlCatalog(tuple(controls), ("test", len(controls)))
+
+
+def portfolio(catalog: ControlCatalog, seed: int = 42):
+    """Random assessments: control rows per template, answers (some missing) with random evidence"""
+    rng = random.Random(seed)
+    control_rows, responses = [], []
+    for assessment_id in range(1, ASSESSMENTS + 1):
+        template = rng.choice(["low", "medium", "high"])
+        for control in catalog.applicable_controls(template):
+            control_rows.append((assessment_id, control.id))
+            for question in control.questions:
+                value = rng.choice(RESPONSE_VALUES)
+                if value is not None:
+                    responses.append((assessment_id, question.id, value, rng.random() < 0.5))
+    return control_rows, responses
+
+
+def reference_scores(catalog: ControlCatalog, control_rows, responses):
+    """Score every assessment one row at a time with the AssessmentScoringEngine formulas"""
+    engine = AssessmentScoringEngine(db=None)
+    sums = {}
+    for assessment_id, question_id, value, has_evidence in responses:
+        question = catalog.question(question_id)
+        entry = sums.setdefault((assessment_id, question.control_id), [0.0, 0.0, 0, 0])
+        entry[3] += 1
+        score = engine.question_score(value, question.requires_evidence, has_evidence)
+        if score is not None:
+            entry[0] += score * question.weight
+            entry[1] += question.weight
+            entry[2] += 1
+
+    rows, totals = [], {}
+    for assessment_id, control_id in control_rows:
+        control = catalog.control(control_id)
+        weighted, weight, answered, count = sums.get((assessment_id, control_id), [0.0, 0.0, 0, 0])
+        row = SimpleNamespace(
+            score_weighted_sum=weighted, score_weight_total=weight,
+            answered_questions=answered, response_count=count,
+            compliance_score=0.0, completion_percentage=0.0, risk_score=0.0, status="not_started"
+        )
+        if count:
+            engine._refresh_control_scores(row, control)
+        rows.append(row)
+        engine._shift_control(
+            totals.setdefault(assessment_id, _empty_totals()), control,
+            engine._control_snapshot(row), sign=1, count=1
+        )
+    return rows, totals
+
+
+def kernel_scores(catalog: ControlCatalog, control_rows, responses):
+    kernel = ScoringKernel(catalog)
+    result = kernel.score(
+        np.arange(1, ASSESSMENTS + 1, dtype=np.int64),
+        np.array([row[0] for row in responses], dtype=np.int64),
+        np.array([row[1] for row in responses], dtype=np.int64),
+        kernel.encode_responses([row[2] for row in responses]),
+        np.array([row[3] for row in responses], dtype=bool),
+        np.array([row[0] for row in control_rows], dtype=np.int64),
+        np.array([row[1] for row in control_rows], dtype=np.int64)
+    )
+    return result, dict(zip(result["assessment_ids"].tolist(), kernel.totals(result)))
+
+
+@pytest.fixture(scope="module")
+def scored():
+    catalog = catalog_with_ids()
+    control_rows, responses = portfolio(catalog)
+    return reference_scores(catalog, control_rows, responses), kernel_scores(catalog, control_rows, responses)
+
+
+def test_control_rows_match(scored):
+    (rows, _), (result, _) = scored
+    assert result["rows"].all()
+
+    columns = {
+        "weighted_sum": "score_weighted_sum",
+        "weight_total": "score_weight_total",
+        "answered": "answered_questions",
+        "responses": "response_count",
+        "compliance": "compliance_score",
+        "completion": "completion_percentage",
+        "risk": "risk_score"
+    }
+    for key, attribute in columns.items():
+        expected = np.array([getattr(row, attribute) for row in rows], dtype=np.float64)
+        assert np.abs(result[key] - expected).max() < 1e-9, key
+
+    assert [STATUS_NAMES[status] for status in result["status"]] == [row.status for row in rows]
+
+
+def test_assessment_totals_match(scored):
+    (_, expected_totals), (_, totals) = scored
+    assert set(totals) == set(expected_totals)
+
+    for assessment_id, expected in expected_totals.items():
+        actual = totals[assessment_id]
+        assert set(actual["category"]) == set(expected["category"])
+        assert set(actual["nist"]) == set(expected["nist"])
+
+        for scope, key in [("overall", None)] + [("category", key) for key in expected["category"]] + \
+                [("nist", key) for key in expected["nist"]]:
+            expected_bucket = expected[scope] if key is None else expected[scope][key]
+            actual_bucket = actual[scope] if key is None else actual[scope][key]
+            for field, value in expected_bucket.items():
+                assert actual_bucket[field] == pytest.approx(value, abs=1e-9), (assessment_id, scope, key, field)
+
+        expected_scores = AssessmentScoringEngine.assessment_scores(expected)
+        actual_scores = AssessmentScoringEngine.assessment_scores(actual)
+        assert actual_scores == pytest.approx(expected_scores, abs=1e-9)